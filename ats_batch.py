@@ -0,0 +1,155 @@
+"""
+Batch ATS scoring
+Scores many resumes at once with the rules of ATSScorer, for rescoring a whole candidate pool when
+the keyword lists change. Resumes are turned into columnar features a chunk at a time: section
+and contact flags, word-count checks and a keyword containment matrix. The four sub-scores and
+the weighted total are then array expressions over those columns, and keyword similarities to a
+job description come from one sparse product per chunk. The scores equal those of
+ATSScorer.calculate_score for every resume.
+"""
+
+import logging
+import os
+from bisect import bisect_right
+from typing import Dict, List, NamedTuple
+
+import numpy as np
+
+from ats_score import ATSScorer, METRICS_PATTERN, resume_to_text
+from jd_profile import get_jd_profile
+from models import ResumeData
+
+logger = logging.getLogger(__name__)
+
+# Resumes featurized at a time; bounds the memory of the joined texts and feature arrays.
+ATS_BATCH_CHUNK = int(os.getenv("ATS_BATCH_CHUNK", "2048"))
+
+
+def containment_matrix(texts: List[str], phrases: List[str]) -> np.ndarray:
+    """
+    Find which texts contain which phrases.
+    The texts are joined into one string and each phrase is searched with str.find, skipping to the
+    next text after a hit, so the scanning runs in C and Python only steps once per (text, phrase) hit.
+    Args:
+        texts (List[str]): Texts to search; a phrase never matches across two texts.
+        phrases (List[str]): Phrases to find.
+    Returns:
+        np.ndarray: Boolean matrix, one row per text and one column per phrase.
+    """
+    contains = np.zeros((len(texts), len(phrases)), dtype=bool)
+    if not texts:
+        return contains
+    starts = []
+    position = 0
+    for text in texts:
+        starts.append(position)
+        position += len(text) + 1
+    joined = "\0".join(texts)
+    last = len(texts) - 1
+    for column, phrase in enumerate(phrases):
+        position = joined.find(phrase)
+        while position >= 0:
+            row = bisect_right(starts, position) - 1
+            contains[row, column] = True
+            if row == last:
+                break
+            position = joined.find(phrase, starts[row + 1])
+    return contains
+
+
+class BatchScores(NamedTuple):
+    """Scores of a batch of resumes, one array element per resume."""
+    keyword: np.ndarray
+    format: np.ndarray
+    content: np.ndarray
+    skills: np.ndarray
+    overall: np.ndarray
+
+
+class BatchATSScorer:
+    """Vectorized counterpart of ATSScorer.calculate_score for many resumes and one job description."""
+    def __init__(self, ats_scorer: ATSScorer, chunk_size: int = ATS_BATCH_CHUNK):
+        self.ats_scorer = ats_scorer
+        self.chunk_size = max(chunk_size, 1)
+        keywords = ats_scorer.ats_keywords
+        # Every distinct phrase is searched once; each list then counts its phrases by column
+        self.phrases: List[str] = list(dict.fromkeys(phrase for phrases in keywords.values() for phrase in phrases))
+        column = {phrase: i for i, phrase in enumerate(self.phrases)}
+        self.columns: Dict[str, np.ndarray] = {
+            category: np.array([column[phrase] for phrase in phrases], dtype=np.int64)
+            for category, phrases in keywords.items()
+        }
+        self.total_keywords = sum(len(phrases) for phrases in keywords.values())
+        self.technical_skills: List[str] = keywords['technical_skills']
+
+    def score(self, resumes: List[ResumeData], job_description: str = "") -> BatchScores:
+        """
+        Score resumes against a job description.
+        Args:
+            resumes (List[ResumeData]): Resumes to score.
+            job_description (str): Optional job description, as for ATSScorer.calculate_score.
+        Returns:
+            BatchScores: Sub-scores and overall score of every resume, in input order.
+        """
+        profile = get_jd_profile(job_description) if job_description.strip() else None
+        chunks = [self._score_chunk(resumes[start:start + self.chunk_size], profile)
+                  for start in range(0, len(resumes), self.chunk_size)]
+        if not chunks:
+            return BatchScores(*(np.zeros(0, dtype=np.int64) for _ in BatchScores._fields))
+        return BatchScores(*(np.concatenate(arrays) for arrays in zip(*chunks)))
+
+    def _score_chunk(self, resumes: List[ResumeData], profile) -> BatchScores:
+        n = len(resumes)
+        texts = [resume_to_text(resume) for resume in resumes]
+        contains = containment_matrix([text.lower() for text in texts], self.phrases)
+
+        # Structural features
+        has_experience = np.array([bool(resume.experience) for resume in resumes])
+        has_education = np.array([bool(resume.education) for resume in resumes])
+        has_skills = np.array([bool(resume.skills) for resume in resumes])
+        has_summary = np.array([bool(resume.summary) for resume in resumes])
+        has_phone = np.array([bool(resume.personalInfo.phone) for resume in resumes])
+        has_address = np.array([bool(resume.personalInfo.address) for resume in resumes])
+        brief_description = np.array([
+            any(not exp.description or len(exp.description.split()) < 10 for exp in resume.experience)
+            for resume in resumes
+        ])
+        brief_summary = np.array([
+            bool(resume.summary) and len(resume.summary.split()) < 20 for resume in resumes
+        ])
+        has_metrics = np.array([bool(METRICS_PATTERN.search(text)) for text in texts])
+
+        # Technical skills: listed skills containing a technical keyword, counted per resume
+        owners = np.repeat(np.arange(n), [len(resume.skills) for resume in resumes])
+        technical = np.zeros(n, dtype=np.int64)
+        if len(owners):
+            skills = [skill.lower() for resume in resumes for skill in resume.skills]
+            is_technical = containment_matrix(skills, self.technical_skills).any(axis=1)
+            technical = np.bincount(owners, weights=is_technical, minlength=n).astype(np.int64)
+
+        format_score = np.maximum(
+            100 - 20 * ~has_experience - 15 * ~has_education - 15 * ~has_skills - 10 * ~has_summary
+            - 5 * ~has_phone - 5 * ~has_address, 0
+        )
+        action_verbs = contains[:, self.columns['action_verbs']].sum(axis=1)
+        content_score = np.maximum(
+            100 - 10 * brief_description - 15 * ~has_metrics - 10 * (action_verbs < 3) - 5 * brief_summary, 0
+        )
+        soft_skills = contains[:, self.columns['soft_skills']].sum(axis=1)
+        skills_score = np.where(
+            has_skills,
+            np.minimum(70 + np.select([technical >= 5, technical >= 3], [20, 10], 0) + 10 * (soft_skills >= 3), 100),
+            30
+        )
+        keyword_score = self._keyword_scores(texts, contains, profile)
+        overall = (keyword_score * 0.3 + format_score * 0.25 + content_score * 0.25 + skills_score * 0.2).astype(np.int64)
+        return BatchScores(keyword_score, format_score, content_score, skills_score, overall)
+
+    def _keyword_scores(self, texts: List[str], contains: np.ndarray, profile) -> np.ndarray:
+        if profile is None:
+            found = sum(contains[:, columns].sum(axis=1) for columns in self.columns.values())
+            return (found / self.total_keywords * 100).astype(np.int64)
+        # Same transform as the per-resume path, one sparse product for the whole chunk
+        vectors = profile.tfidf_model.transform(texts)
+        similarities = np.asarray((vectors @ profile.vector.T).todense()).ravel()
+        return np.maximum((similarities * 100).astype(np.int64), 50)
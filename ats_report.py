@@ -0,0 +1,113 @@
+"""
+ATS report
+Builds the full /ats-score response: the scorer's score and suggestions plus missing skills,
+format issues, keyword density and recommendations. Shared by the API and the job workers.
+"""
+
+import logging
+import re
+from typing import Any, Dict
+
+from jd_profile import get_jd_profile
+from models import ResumeData
+
+logger = logging.getLogger(__name__)
+
+
+async def build_ats_report(ats_scorer, resume_data: ResumeData, job_description: str) -> Dict[str, Any]:
+    """
+    Calculate the ATS report of a resume against a job description.
+    Args:
+        ats_scorer (ATSScorer): Scorer computing the overall score and suggestions.
+        resume_data (ResumeData): Resume to score.
+        job_description (str): Job description text, may be empty.
+    Returns:
+        Dict[str, Any]: ATS compatibility score with feedback and suggestions.
+    """
+    ats_result = await ats_scorer.calculate_score(resume_data, job_description)
+    # The scorer has just cached the job description's profile
+    profile = get_jd_profile(job_description) if job_description.strip() else None
+
+    # Extract missing skills from job description
+    missing_skills = []
+    if profile is not None:
+        taxonomy = profile.taxonomy
+        job_skills = profile.skills
+
+        # Compare with the listed resume skills and the skills mentioned in the summary and experience
+        resume_skills = {taxonomy.normalize_skill(skill).lower() for skill in resume_data.skills}
+        resume_text = "\n".join([resume_data.summary or ""] + [exp.description or "" for exp in resume_data.experience])
+        resume_skills.update(match.name.lower() for match in taxonomy.find_skills(resume_text))
+        missing_skills = [skill for skill in job_skills if skill.lower() not in resume_skills][:10]  # Limit to 10 skills
+
+    # Format issues
+    format_issues = []
+    if not resume_data.summary or len(resume_data.summary) < 50:
+        format_issues.append("Professional summary is too short or missing")
+    if len(resume_data.skills) < 5:
+        format_issues.append("Not enough skills listed (aim for 8-12 relevant skills)")
+    if not resume_data.experience or len(resume_data.experience) == 0:
+        format_issues.append("Work experience section is missing")
+    for exp in resume_data.experience:
+        if not exp.description or len(exp.description) < 50:
+            format_issues.append("Some job descriptions are too brief")
+            break
+
+    # Calculate keyword density
+    keyword_density = {}
+    if profile is not None:
+        # Get resume text
+        resume_text = ""
+        if resume_data.summary:
+            resume_text += resume_data.summary + " "
+        for skill in resume_data.skills:
+            resume_text += skill + " "
+        for exp in resume_data.experience:
+            if exp.description:
+                resume_text += exp.description + " "
+
+        # Density of the job description's top keywords
+        keyword_density = profile.keyword_density(resume_text)
+
+    # Generate recommendations
+    recommendations = {
+        "skills": [],
+        "experience": [],
+        "education": [],
+        "formatting": []
+    }
+
+    # Skills recommendations
+    if missing_skills:
+        recommendations["skills"].append(f"Add these missing skills that appear in the job description: {', '.join(missing_skills[:5])}")
+    if len(resume_data.skills) < 8:
+        recommendations["skills"].append("Expand your skills section to include 8-12 relevant technical and soft skills")
+
+    # Experience recommendations
+    has_metrics = False
+    for exp in resume_data.experience:
+        if exp.description and re.search(r'\d+%|\$\d+|\d+\+|increased|decreased|improved|reduced', exp.description, re.IGNORECASE):
+            has_metrics = True
+            break
+
+    if not has_metrics:
+        recommendations["experience"].append("Add quantifiable achievements with metrics (%, $, numbers) to your experience")
+
+    recommendations["experience"].append("Start each bullet point with strong action verbs (e.g., Implemented, Developed, Led)")
+
+    # Formatting recommendations
+    recommendations["formatting"].append("Use consistent date formats throughout your resume")
+    recommendations["formatting"].append("Ensure proper spacing and alignment for better readability")
+    recommendations["formatting"].append("Use a clean, ATS-friendly template without tables or complex formatting")
+
+    response = {
+        "atsScore": ats_result.score,
+        "missingSkills": missing_skills,
+        "suggestions": ats_result.suggestions,
+        "formatIssues": format_issues,
+        "matchPercentage": ats_result.score,
+        "keywordDensity": keyword_density,
+        "recommendations": recommendations
+    }
+
+    return response
@@ -4,27 +4,123 @@ Uses TF-IDF and keyword analysis to calculate resume compatibility scores
 """
 
 import logging
+from functools import cached_property
 from typing import List, Dict, Optional
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
 import re
+from jd_profile import JobDescriptionProfile, get_jd_profile
 from models import ResumeData, ATSScore, ATSFeedback
+from tfidf_model import TfidfModel, get_tfidf_model
 
 logger = logging.getLogger(__name__)
 
+WORD_PATTERN = re.compile(r'\b\w+\b')
+METRICS_PATTERN = re.compile(r'\d+%|\$\d+|\d+\+|increased|decreased|improved|reduced', re.IGNORECASE)
+
+
+def resume_to_text(resume_data: ResumeData) -> str:
+    """
+    Convert structured resume data to plain text for analysis.
+    The structured fields are extracted from the raw text, so only the ones it does not already
+    contain (e.g. normalized skill names) are added to it.
+    Args:
+        resume_data (ResumeData): Resume data.
+    Returns:
+        str: Text of all resume fields, each appearing once.
+    """
+    text_parts = []
+    if resume_data.personalInfo:
+        text_parts.append(resume_data.personalInfo.fullName)
+        text_parts.append(resume_data.personalInfo.email)
+    if resume_data.summary:
+        text_parts.append(resume_data.summary)
+    if resume_data.skills:
+        text_parts.extend(resume_data.skills)
+    for exp in resume_data.experience:
+        text_parts.extend([exp.company, exp.position, exp.description])
+        if exp.achievements:
+            text_parts.extend(exp.achievements)
+    for edu in resume_data.education:
+        text_parts.extend([edu.institution, edu.degree, edu.field])
+    text_parts = [part for part in text_parts if part]
+    if resume_data.rawText:
+        raw_lower = resume_data.rawText.lower()
+        text_parts = [part for part in text_parts if part.lower() not in raw_lower]
+        text_parts.append(resume_data.rawText)
+    return ' '.join(text_parts)
+
+
+class AnalyzedResume:
+    """
+    Normalized forms of one resume, built once per scoring request and shared by every sub-scorer:
+    the text, its lowercase form, its tokens, and memoized phrase lookups.
+    """
+    def __init__(self, resume_data: ResumeData):
+        self.resume = resume_data
+        self.text = resume_to_text(resume_data)
+        self.lower = self.text.lower()
+        self.skills_lower = [skill.lower() for skill in resume_data.skills]
+        self._contains: Dict[str, bool] = {}
+        self._vector = None
+        self._vector_model: Optional[TfidfModel] = None
+
+    @cached_property
+    def tokens(self) -> List[str]:
+        """Lowercase word tokens in text order."""
+        return WORD_PATTERN.findall(self.lower)
+
+    @cached_property
+    def token_set(self) -> set:
+        """Distinct lowercase word tokens."""
+        return set(self.tokens)
+
+    @cached_property
+    def has_metrics(self) -> bool:
+        """Whether the resume quantifies achievements (percentages, amounts, increases)."""
+        return bool(METRICS_PATTERN.search(self.text))
+
+    def tfidf_vector(self, tfidf_model: TfidfModel):
+        """
+        TF-IDF vector of the text, computed once per model.
+        Args:
+            tfidf_model (TfidfModel): Model to transform the text with.
+        Returns:
+            scipy.sparse.csr_matrix: L2-normalized 1 x n_features vector.
+        """
+        if self._vector_model is not tfidf_model:
+            self._vector = tfidf_model.transform([self.text])
+            self._vector_model = tfidf_model
+        return self._vector
+
+    def contains(self, phrase: str) -> bool:
+        """
+        Check whether a lowercase phrase occurs anywhere in the text.
+        Args:
+            phrase (str): Lowercase phrase.
+        Returns:
+            bool: True if the phrase is a substring of the lowercase text.
+        """
+        found = self._contains.get(phrase)
+        if found is None:
+            found = self._contains[phrase] = phrase in self.lower
+        return found
+
+    def count_contained(self, phrases: List[str]) -> int:
+        """
+        Count the lowercase phrases that occur in the text.
+        Args:
+            phrases (List[str]): Lowercase phrases.
+        Returns:
+            int: Number of phrases found.
+        """
+        return sum(1 for phrase in phrases if self.contains(phrase))
+
 class ATSScorer:
     """
     ATS compatibility scorer using TF-IDF and keyword analysis.
     Provides methods to calculate overall ATS score, keyword optimization, format, content, and skills matching.
     """
     def __init__(self):
-        self.vectorizer = TfidfVectorizer(
-            stop_words='english',
-            max_features=1000,
-            ngram_range=(1, 2),
-            lowercase=True
-        )
-        # Common ATS-friendly keywords by category
+        # Common ATS-friendly keywords by category, lowercase as they are matched against the lowercase text
         self.ats_keywords = {
             'technical_skills': [
                 'python', 'java', 'javascript', 'react', 'angular', 'node.js', 'sql', 'mongodb',
@@ -49,6 +145,11 @@ class ATSScorer:
             'work history', 'employment', 'qualifications', 'achievements'
         ]
 
+    @property
+    def tfidf_model(self) -> TfidfModel:
+        """Corpus-fitted TF-IDF model; scikit-learn is imported when the first text is transformed."""
+        return get_tfidf_model()
+
     async def calculate_score(self, resume_data: ResumeData, job_description: str = "") -> ATSScore:
         """
         Calculate ATS compatibility score for a resume.
@@ -60,83 +161,157 @@ class ATSScorer:
         """
         try:
             logger.info("Calculating ATS compatibility score")
-            resume_text = await self._resume_to_text(resume_data)
-            keyword_score = await self._calculate_keyword_score(resume_text, job_description)
-            format_score = await self._calculate_format_score(resume_data)
-            content_score = await self._calculate_content_score(resume_data)
-            skills_score = await self._calculate_skills_score(resume_data, job_description)
-            overall_score = int(
-                keyword_score['score'] * 0.3 +
-                format_score['score'] * 0.25 +
-                content_score['score'] * 0.25 +
-                skills_score['score'] * 0.2
-            )
-            feedback = [
-                ATSFeedback(category="Keyword Optimization", **{k: keyword_score[k] for k in ('score','message','severity')}),
-                ATSFeedback(category="Format Compatibility", **{k: format_score[k] for k in ('score','message','severity')}),
-                ATSFeedback(category="Content Structure", **{k: content_score[k] for k in ('score','message','severity')}),
-                ATSFeedback(category="Skills Matching", **{k: skills_score[k] for k in ('score','message','severity')})
-            ]
-            suggestions = await self._generate_suggestions(
-                resume_data, job_description, overall_score, 
-                [keyword_score, format_score, content_score, skills_score]
+            analyzed = self.analyze(resume_data)
+            profile = get_jd_profile(job_description) if job_description.strip() else None
+            keyword_score = await self._calculate_keyword_score(analyzed, profile)
+            format_score = await self._calculate_format_score(analyzed)
+            content_score = await self._calculate_content_score(analyzed)
+            skills_score = await self._calculate_skills_score(analyzed, job_description)
+            ats_score = await self._combine_scores(
+                resume_data, job_description, keyword_score, format_score, content_score, skills_score
             )
-            logger.info(f"ATS score calculated: {overall_score}")
-            return ATSScore(score=overall_score, feedback=feedback, suggestions=suggestions)
+            logger.info(f"ATS score calculated: {ats_score.score}")
+            return ats_score
         except Exception as e:
             logger.error(f"Error calculating ATS score: {str(e)}")
             raise
 
-    async def _resume_to_text(self, resume_data: ResumeData) -> str:
+    async def calculate_scores(self, resume_data: ResumeData, job_descriptions: List[str]) -> List[ATSScore]:
         """
-        Convert structured resume data to plain text for analysis.
+        Calculate the ATS compatibility score of one resume against many job descriptions.
+        The resume is analyzed and vectorized once, the resume-only sub-scores are computed once, and
+        the similarities to all job descriptions come from one sparse matrix product.
+        Args:
+            resume_data (ResumeData): Structured resume data.
+            job_descriptions (List[str]): Job descriptions to compare with; empty ones get the generic score.
+        Returns:
+            List[ATSScore]: One score per job description, in the same order.
+        """
+        try:
+            logger.info(f"Calculating ATS compatibility scores against {len(job_descriptions)} job descriptions")
+            analyzed = self.analyze(resume_data)
+            profiles = [get_jd_profile(jd) if jd.strip() else None for jd in job_descriptions]
+            similarities = self._similarities(analyzed, profiles)
+            format_score = await self._calculate_format_score(analyzed)
+            content_score = await self._calculate_content_score(analyzed)
+            skills_score = await self._calculate_skills_score(analyzed, "")
+            generic_keyword_score = None
+            scores = []
+            for job_description, profile, similarity in zip(job_descriptions, profiles, similarities):
+                if profile is None:
+                    if generic_keyword_score is None:
+                        generic_keyword_score = await self._calculate_keyword_score(analyzed, None)
+                    keyword_score = generic_keyword_score
+                else:
+                    keyword_score = await self._calculate_keyword_score(analyzed, profile, similarity)
+                scores.append(await self._combine_scores(
+                    resume_data, job_description, keyword_score, format_score, content_score, skills_score
+                ))
+            logger.info(f"ATS scores calculated: {[score.score for score in scores]}")
+            return scores
+        except Exception as e:
+            logger.error(f"Error calculating ATS scores: {str(e)}")
+            raise
+
+    def _similarities(self, analyzed: AnalyzedResume,
+                      profiles: List[Optional[JobDescriptionProfile]]) -> List[Optional[float]]:
+        """
+        Cosine similarities of a resume to many job descriptions.
+        Args:
+            analyzed (AnalyzedResume): Analyzed resume.
+            profiles (List[Optional[JobDescriptionProfile]]): Job description profiles, None for empty ones.
+        Returns:
+            List[Optional[float]]: Similarity per profile; None for empty job descriptions, or if the
+            product failed, so the keyword score falls back to word matching.
+        """
+        from scipy.sparse import vstack
+        similarities: List[Optional[float]] = [None] * len(profiles)
+        # Profiles built before and after a model reload are multiplied with the matching resume vector
+        by_model: Dict[int, List[int]] = {}
+        for i, profile in enumerate(profiles):
+            if profile is not None:
+                by_model.setdefault(id(profile.tfidf_model), []).append(i)
+        for indices in by_model.values():
+            try:
+                tfidf_model = profiles[indices[0]].tfidf_model
+                matrix = vstack([profiles[i].vector for i in indices], format='csr')
+                products = (matrix @ analyzed.tfidf_vector(tfidf_model).T).toarray().ravel()
+            except Exception as e:
+                logger.error(f"Error calculating keyword similarities: {str(e)}")
+                continue
+            for i, similarity in zip(indices, products):
+                similarities[i] = float(similarity)
+        return similarities
+
+    async def _combine_scores(self, resume_data: ResumeData, job_description: str, keyword_score: Dict,
+                              format_score: Dict, content_score: Dict, skills_score: Dict) -> ATSScore:
+        """
+        Weigh the sub-scores into the overall score and add feedback and suggestions.
         Args:
             resume_data (ResumeData): Resume data.
+            job_description (str): Job description text.
+            keyword_score (Dict): Keyword optimization sub-score.
+            format_score (Dict): Format compatibility sub-score.
+            content_score (Dict): Content structure sub-score.
+            skills_score (Dict): Skills matching sub-score.
         Returns:
-            str: Concatenated text from all resume fields.
+            ATSScore: Overall score with feedback and suggestions.
         """
-        text_parts = []
-        if resume_data.personalInfo:
-            text_parts.append(resume_data.personalInfo.fullName)
-            text_parts.append(resume_data.personalInfo.email)
-        if resume_data.summary:
-            text_parts.append(resume_data.summary)
-        if resume_data.skills:
-            text_parts.extend(resume_data.skills)
-        for exp in resume_data.experience:
-            text_parts.extend([exp.company, exp.position, exp.description])
-            if exp.achievements:
-                text_parts.extend(exp.achievements)
-        for edu in resume_data.education:
-            text_parts.extend([edu.institution, edu.degree, edu.field])
-        if resume_data.rawText:
-            text_parts.append(resume_data.rawText)
-        return ' '.join(filter(None, text_parts))
+        overall_score = int(
+            keyword_score['score'] * 0.3 +
+            format_score['score'] * 0.25 +
+            content_score['score'] * 0.25 +
+            skills_score['score'] * 0.2
+        )
+        feedback = [
+            ATSFeedback(category="Keyword Optimization", **{k: keyword_score[k] for k in ('score','message','severity')}),
+            ATSFeedback(category="Format Compatibility", **{k: format_score[k] for k in ('score','message','severity')}),
+            ATSFeedback(category="Content Structure", **{k: content_score[k] for k in ('score','message','severity')}),
+            ATSFeedback(category="Skills Matching", **{k: skills_score[k] for k in ('score','message','severity')})
+        ]
+        suggestions = await self._generate_suggestions(
+            resume_data, job_description, overall_score, 
+            [keyword_score, format_score, content_score, skills_score]
+        )
+        return ATSScore(score=overall_score, feedback=feedback, suggestions=suggestions)
 
-    async def _calculate_keyword_score(self, resume_text: str, job_description: str) -> Dict:
+    def analyze(self, resume_data: ResumeData) -> AnalyzedResume:
+        """
+        Build the analyzed form of a resume read by the sub-scorers.
+        Args:
+            resume_data (ResumeData): Resume data.
+        Returns:
+            AnalyzedResume: Text, tokens and lookups computed once for the request.
+        """
+        return AnalyzedResume(resume_data)
+
+    async def _calculate_keyword_score(self, analyzed: AnalyzedResume, profile: Optional[JobDescriptionProfile],
+                                       similarity: Optional[float] = None) -> Dict:
         """
         Calculate keyword optimization score using TF-IDF or fallback to keyword matching.
         Args:
-            resume_text (str): Resume text.
-            job_description (str): Job description text.
+            analyzed (AnalyzedResume): Analyzed resume.
+            profile (Optional[JobDescriptionProfile]): Cached job description analysis, None without one.
+            similarity (Optional[float]): TF-IDF similarity already computed for a batch of job descriptions.
         Returns:
             dict: Score, message, and severity.
         """
         try:
-            if not job_description.strip():
-                score = await self._analyze_generic_keywords(resume_text)
+            if profile is None:
+                score = await self._analyze_generic_keywords(analyzed)
                 return {
                     'score': score,
                     'message': f"Resume contains {score}% of common industry keywords. Consider adding more relevant technical and soft skills.",
                     'severity': 'medium' if score < 70 else 'low'
                 }
-            documents = [resume_text.lower(), job_description.lower()]
             try:
-                tfidf_matrix = self.vectorizer.fit_transform(documents)
-                similarity = cosine_similarity(tfidf_matrix[0:1], tfidf_matrix[1:2])[0][0]
+                if similarity is None:
+                    # Only the resume is transformed; the job description vector comes with its cached profile
+                    resume_vector = analyzed.tfidf_vector(profile.tfidf_model)
+                    similarity = float(resume_vector.multiply(profile.vector).sum())
                 score = int(similarity * 100)
             except Exception:
-                score = await self._simple_keyword_match(resume_text, job_description)
+                score = await self._simple_keyword_match(analyzed, profile)
             return {
                 'score': max(score, 50),
                 'message': f"Resume matches {score}% of job description keywords. {'Good alignment' if score >= 70 else 'Consider adding more relevant keywords'}.",
@@ -150,50 +325,46 @@ class ATSScorer:
                 'severity': 'medium'
             }
 
-    async def _analyze_generic_keywords(self, resume_text: str) -> int:
+    async def _analyze_generic_keywords(self, analyzed: AnalyzedResume) -> int:
         """
         Analyze resume against generic industry keywords.
         Args:
-            resume_text (str): Resume text.
+            analyzed (AnalyzedResume): Analyzed resume.
         Returns:
             int: Percentage of keywords found.
         """
-        resume_lower = resume_text.lower()
         total_keywords = 0
         found_keywords = 0
         for keywords in self.ats_keywords.values():
             total_keywords += len(keywords)
-            for keyword in keywords:
-                if keyword.lower() in resume_lower:
-                    found_keywords += 1
+            found_keywords += analyzed.count_contained(keywords)
         return int((found_keywords / total_keywords) * 100) if total_keywords > 0 else 50
 
-    async def _simple_keyword_match(self, resume_text: str, job_description: str) -> int:
+    async def _simple_keyword_match(self, analyzed: AnalyzedResume, profile: JobDescriptionProfile) -> int:
         """
         Simple keyword matching fallback.
         Args:
-            resume_text (str): Resume text.
-            job_description (str): Job description text.
+            analyzed (AnalyzedResume): Analyzed resume.
+            profile (JobDescriptionProfile): Cached job description analysis.
         Returns:
             int: Percentage of job keywords found in resume.
         """
-        resume_words = set(re.findall(r'\b\w+\b', resume_text.lower()))
-        job_words = set(re.findall(r'\b\w+\b', job_description.lower()))
-        stop_words = {'the', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for', 'of', 'with', 'by', 'is', 'are', 'was', 'were'}
-        job_words = job_words - stop_words
+        resume_words = analyzed.token_set
+        job_words = profile.words
         if not job_words:
             return 50
         matches = len(resume_words.intersection(job_words))
         return int((matches / len(job_words)) * 100)
 
-    async def _calculate_format_score(self, resume_data: ResumeData) -> Dict:
+    async def _calculate_format_score(self, analyzed: AnalyzedResume) -> Dict:
         """
         Calculate format compatibility score based on presence of standard sections and contact info.
         Args:
-            resume_data (ResumeData): Resume data.
+            analyzed (AnalyzedResume): Analyzed resume.
         Returns:
             dict: Score, message, and severity.
         """
+        resume_data = analyzed.resume
         score = 100
         issues = []
         has_experience = len(resume_data.experience) > 0
@@ -227,14 +398,15 @@ class ATSScorer:
             'severity': severity
         }
 
-    async def _calculate_content_score(self, resume_data: ResumeData) -> Dict:
+    async def _calculate_content_score(self, analyzed: AnalyzedResume) -> Dict:
         """
         Calculate content structure and quality score.
         Args:
-            resume_data (ResumeData): Resume data.
+            analyzed (AnalyzedResume): Analyzed resume.
         Returns:
             dict: Score, message, and severity.
         """
+        resume_data = analyzed.resume
         score = 100
         issues = []
         if resume_data.experience:
@@ -243,17 +415,10 @@ class ATSScorer:
                     score -= 10
                     issues.append("brief job descriptions")
                     break
-        has_numbers = False
-        all_text = await self._resume_to_text(resume_data)
-        if re.search(r'\d+%|\$\d+|\d+\+|increased|decreased|improved|reduced', all_text, re.IGNORECASE):
-            has_numbers = True
-        if not has_numbers:
+        if not analyzed.has_metrics:
             score -= 15
             issues.append("lack of quantifiable achievements")
-        action_verb_count = 0
-        for verb in self.ats_keywords['action_verbs']:
-            if verb.lower() in all_text.lower():
-                action_verb_count += 1
+        action_verb_count = analyzed.count_contained(self.ats_keywords['action_verbs'])
         if action_verb_count < 3:
             score -= 10
             issues.append("limited use of action verbs")
@@ -268,15 +433,16 @@ class ATSScorer:
             'severity': severity
         }
 
-    async def _calculate_skills_score(self, resume_data: ResumeData, job_description: str) -> Dict:
+    async def _calculate_skills_score(self, analyzed: AnalyzedResume, job_description: str) -> Dict:
         """
         Calculate skills matching score.
         Args:
-            resume_data (ResumeData): Resume data.
+            analyzed (AnalyzedResume): Analyzed resume.
             job_description (str): Job description text.
         Returns:
             dict: Score, message, and severity.
         """
+        resume_data = analyzed.resume
         if not resume_data.skills:
             return {
                 'score': 30,
@@ -285,18 +451,14 @@ class ATSScorer:
             }
         score = 70  # Base score for having skills
         tech_skills_found = 0
-        for skill in resume_data.skills:
-            if any(tech_skill.lower() in skill.lower() for tech_skill in self.ats_keywords['technical_skills']):
+        for skill in analyzed.skills_lower:
+            if any(tech_skill in skill for tech_skill in self.ats_keywords['technical_skills']):
                 tech_skills_found += 1
         if tech_skills_found >= 5:
             score += 20
         elif tech_skills_found >= 3:
             score += 10
-        soft_skills_found = 0
-        all_text = await self._resume_to_text(resume_data)
-        for soft_skill in self.ats_keywords['soft_skills']:
-            if soft_skill.lower() in all_text.lower():
-                soft_skills_found += 1
+        soft_skills_found = analyzed.count_contained(self.ats_keywords['soft_skills'])
         if soft_skills_found >= 3:
             score += 10
         message = f"Skills section includes {len(resume_data.skills)} skills. {'Good technical coverage' if tech_skills_found >= 3 else 'Consider adding more technical skills'}."
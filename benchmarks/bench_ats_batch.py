@@ -0,0 +1,108 @@
+"""
+Benchmark for batch ATS scoring.
+Scores N synthetic resumes with `BatchATSScorer` and with `ATSScorer.calculate_score` one resume at
+a time, checks that every sub-score and overall score is identical, and reports the throughput of
+both paths. The per-resume path is timed on the first --sample resumes and extrapolated to N.
+
+Usage: python benchmarks/bench_ats_batch.py [--resumes N] [--sample N] [--job-description]
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ats_batch import BatchATSScorer  # noqa: E402
+from ats_score import ATSScorer  # noqa: E402
+from models import Education, Experience, PersonalInfo, ResumeData  # noqa: E402
+
+WORDS = (
+    "built designed led managed improved reduced increased delivered developed team platform services "
+    "customers pipeline migration latency reporting budget stakeholders analysis dashboards onboarding "
+    "leadership communication collaboration problem solving python java react sql aws docker kubernetes "
+    "git typescript django flask redis agile scrum certified pmp 30% $2M 200+"
+).split()
+SKILLS = [
+    "Python", "Java", "React", "SQL", "AWS", "Docker", "Kubernetes", "Git", "TypeScript", "Django",
+    "Excel", "Salesforce", "Leadership", "Communication", "Project Management", "Node.js", "Figma",
+]
+JOB_DESCRIPTION = (
+    "We are hiring a backend engineer with Python, SQL, AWS and Docker experience, strong communication "
+    "and leadership, who has improved latency and delivered platform migrations."
+)
+
+
+def synthetic_resume(rng: random.Random) -> ResumeData:
+    """A resume with a random mix of sections, lengths and keywords."""
+    def sentence(low: int, high: int) -> str:
+        return " ".join(rng.choice(WORDS) for _ in range(rng.randint(low, high)))
+    experience = [
+        Experience(company=f"Company {i}", position="Engineer", startDate="Jan 2019", endDate="Dec 2020",
+                   description=sentence(3, 40))
+        for i in range(rng.randint(0, 3))
+    ]
+    education = [
+        Education(institution="State University", degree="BSc", field="Computer Science", endDate="2016")
+        for _ in range(rng.randint(0, 1))
+    ]
+    return ResumeData(
+        personalInfo=PersonalInfo(
+            fullName="Jane Doe", email="jane@example.com",
+            phone="(555) 123-4567" if rng.random() < 0.8 else None,
+            address="Springfield, IL 62704" if rng.random() < 0.5 else None,
+        ),
+        summary=sentence(5, 40) if rng.random() < 0.7 else None,
+        experience=experience,
+        education=education,
+        skills=rng.sample(SKILLS, rng.randint(0, 10)),
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--resumes", type=int, default=100000)
+    parser.add_argument("--sample", type=int, default=5000)
+    parser.add_argument("--job-description", action="store_true", help="score against a job description")
+    args = parser.parse_args()
+    job_description = JOB_DESCRIPTION if args.job_description else ""
+
+    rng = random.Random(0)
+    started = time.perf_counter()
+    resumes = [synthetic_resume(rng) for _ in range(args.resumes)]
+    print(f"built {len(resumes)} resumes in {time.perf_counter() - started:.1f} s")
+
+    ats_scorer = ATSScorer()
+    batch_scorer = BatchATSScorer(ats_scorer)
+    batch_scorer.score(resumes[:100], job_description)  # load scikit-learn and the job description profile
+    started = time.perf_counter()
+    scores = batch_scorer.score(resumes, job_description)
+    batch_time = time.perf_counter() - started
+
+    sample = resumes[:min(args.sample, len(resumes))]
+
+    async def score_one_by_one():
+        return [await ats_scorer.calculate_score(resume, job_description) for resume in sample]
+
+    started = time.perf_counter()
+    expected = asyncio.run(score_one_by_one())
+    single_time = (time.perf_counter() - started) / len(sample) * len(resumes)
+
+    for i, result in enumerate(expected):
+        actual = (scores.keyword[i], scores.format[i], scores.content[i], scores.skills[i], scores.overall[i])
+        assert actual == tuple(f.score for f in result.feedback) + (result.score,), (i, actual, result)
+    print(f"identical scores on {len(sample)} resumes")
+    print(
+        f"resumes={len(resumes)} batch={batch_time:.2f} s ({len(resumes) / batch_time:,.0f}/s) "
+        f"per-resume={single_time:.2f} s ({len(resumes) / single_time:,.0f}/s, extrapolated) "
+        f"speedup={single_time / batch_time:.1f}x"
+    )
+
+
+if __name__ == "__main__":
+    import logging
+    logging.disable(logging.WARNING)
+    main()
@@ -0,0 +1,106 @@
+"""
+Micro-benchmark for contact information extraction.
+Compares the legacy extraction (separate full-text searches for email, phone and LinkedIn, then a
+keyword loop over the lines for the address) with the single-pass `scan_contacts`, on resumes
+concatenated to increasing sizes. The legacy path stops at the first match of each field, so it is
+also timed collecting every candidate the same way ("legacy-all"), which is the work the single
+pass does.
+
+Usage: python benchmarks/bench_contacts.py [copies ...]
+"""
+
+import os
+import re
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from contacts import scan_contacts  # noqa: E402
+
+EMAIL_PATTERN = re.compile(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b')
+PHONE_PATTERN = re.compile(r'(\+?\d{1,2}[-.\s]?)?(\(?\d{3}\)?[-.\s]?)?\d{3}[-.\s]?\d{4}')
+LINKEDIN_PATTERN = re.compile(r'linkedin\.com/in/[\w-]+', re.IGNORECASE)
+URL_PATTERN = re.compile(r'http[s]?://(?:[a-zA-Z]|[0-9]|[$-_@.&+]|[!*\$\$,]|(?:%[0-9a-fA-F][0-9a-fA-F]))+')
+ADDRESS_KEYWORDS = ['street', 'st', 'avenue', 'ave', 'road', 'rd', 'city', 'state']
+
+
+def legacy_contacts(text: str) -> dict:
+    """Contact extraction as it was before the single-pass scanner."""
+    lines = text.splitlines()
+    email_match = EMAIL_PATTERN.search(text)
+    phone_match = PHONE_PATTERN.search(text)
+    linkedin_match = LINKEDIN_PATTERN.search(text)
+    for line in lines[:5]:
+        line = line.strip()
+        if line and not EMAIL_PATTERN.search(line) and not PHONE_PATTERN.search(line):
+            break
+    address = None
+    for line in lines:
+        line_lower = line.lower()
+        if any(keyword in line_lower for keyword in ADDRESS_KEYWORDS) and len(line.split()) > 2:
+            address = line.strip()
+            break
+    return {
+        "email": email_match.group() if email_match else "",
+        "phone": phone_match.group() if phone_match else None,
+        "linkedin": f"https://{linkedin_match.group()}" if linkedin_match else None,
+        "address": address,
+    }
+
+
+def legacy_all_contacts(text: str) -> dict:
+    """The legacy patterns collecting every match: one pass per pattern and a loop over all lines."""
+    return {
+        "email": [m.group() for m in EMAIL_PATTERN.finditer(text)],
+        "phone": [m.group() for m in PHONE_PATTERN.finditer(text)],
+        "linkedin": [m.group() for m in LINKEDIN_PATTERN.finditer(text)],
+        "website": [m.group() for m in URL_PATTERN.finditer(text)],
+        "address": [
+            line.strip() for line in text.splitlines()
+            if any(keyword in line.lower() for keyword in ADDRESS_KEYWORDS) and len(line.split()) > 2
+        ],
+    }
+
+
+PAGE = """Jane Doe
+jane.doe@example.com | (555) 123-4567 | linkedin.com/in/janedoe | https://janedoe.dev
+742 Evergreen Terrace, Springfield, IL 62704
+Summary
+Backend engineer with eight years of experience building distributed systems.
+Experience
+Senior Software Engineer - Acme Corp, Jan 2020 - Present
+Designed and shipped a streaming ingestion platform handling 2M events per second.
+Led a team of five engineers and reduced infrastructure cost by 30%.
+Software Engineer - Globex, Jun 2016 - Dec 2019
+Built internal tooling in Python and Go used by 200+ developers.
+Education
+State University, Computer Science, Bachelor of Science 2012 - 2016
+Skills
+Python, Go, Kubernetes, PostgreSQL, Kafka, AWS, Terraform
+References
+John Smith, Engineering Manager, john.smith@acme.example, +1 555 987 6543
+"""
+
+
+def main(copies_list):
+    for copies in copies_list:
+        text = '\n'.join(PAGE for _ in range(copies))
+        legacy = legacy_contacts(text)
+        info = scan_contacts(text)
+        assert info.value("email") == legacy["email"]
+        assert info.value("linkedin") == legacy["linkedin"]
+        number = max(1, 200 // copies)
+        legacy_time = min(timeit.repeat(lambda: legacy_contacts(text), number=number, repeat=5)) / number
+        legacy_all_time = min(timeit.repeat(lambda: legacy_all_contacts(text), number=number, repeat=5)) / number
+        scan_time = min(timeit.repeat(lambda: scan_contacts(text), number=number, repeat=5)) / number
+        found = sum(len(candidates) for candidates in info.candidates.values())
+        print(
+            f"copies={copies:5d} chars={len(text):8d} candidates={found:6d} "
+            f"legacy={legacy_time * 1000:8.3f} ms legacy-all={legacy_all_time * 1000:8.3f} ms "
+            f"single-pass={scan_time * 1000:8.3f} ms speedup-vs-all={legacy_all_time / scan_time:5.2f}x"
+        )
+
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]] or [1, 10, 100, 1000])
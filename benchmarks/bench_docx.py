@@ -0,0 +1,82 @@
+"""
+Benchmark of DOCX text extraction.
+Compares the former temp-file + docx2txt path with the in-memory streaming reader on synthetic
+resumes containing headers, footers, paragraphs, tabs, line breaks and tables, and checks that
+both produce the same text.
+
+Usage: python benchmarks/bench_docx.py [paragraphs ...]
+"""
+
+import io
+import os
+import sys
+import tempfile
+import timeit
+import zipfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from docx_reader import read_docx_text  # noqa: E402
+
+W = 'xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main"'
+
+
+def paragraph(text: str) -> str:
+    return f'<w:p><w:pPr><w:tabs><w:tab w:val="left" w:pos="720"/></w:tabs></w:pPr><w:r><w:t>{text}</w:t></w:r></w:p>'
+
+
+def build_docx(paragraphs: int) -> bytes:
+    body = []
+    for i in range(paragraphs):
+        body.append(paragraph(f"Senior Engineer {i} - Acme Corp"))
+        body.append(
+            f'<w:p><w:r><w:t xml:space="preserve">Led migration of service {i} </w:t><w:tab/>'
+            f'<w:t>2019</w:t><w:br/><w:t>Reduced latency by 30%</w:t></w:r></w:p>'
+        )
+        if i % 10 == 0:
+            cells = ''.join(f'<w:tc>{paragraph(skill)}</w:tc>' for skill in ('Python', 'Go', 'SQL'))
+            body.append(f'<w:tbl><w:tr>{cells}</w:tr></w:tbl>')
+    document = f'<?xml version="1.0" encoding="UTF-8"?><w:document {W}><w:body>{"".join(body)}</w:body></w:document>'
+    header = f'<w:hdr {W}>{paragraph("Jane Doe - jane@example.com")}</w:hdr>'
+    footer = f'<w:ftr {W}>{paragraph("Page 1")}</w:ftr>'
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, 'w', zipfile.ZIP_DEFLATED) as zipf:
+        zipf.writestr('[Content_Types].xml', '<Types/>')
+        zipf.writestr('word/document.xml', document)
+        zipf.writestr('word/header1.xml', header)
+        zipf.writestr('word/footer1.xml', footer)
+    return buffer.getvalue()
+
+
+def legacy_extract(content: bytes) -> str:
+    import docx2txt
+    with tempfile.NamedTemporaryFile(delete=False, suffix='.docx') as temp_file:
+        temp_file.write(content)
+        temp_file_path = temp_file.name
+    try:
+        return docx2txt.process(temp_file_path)
+    finally:
+        os.unlink(temp_file_path)
+
+
+def main(sizes):
+    try:
+        import docx2txt  # noqa: F401
+        has_docx2txt = True
+    except ImportError:
+        has_docx2txt = False
+        print("docx2txt is not installed; timing the streaming reader only")
+    for paragraphs in sizes:
+        content = build_docx(paragraphs)
+        number = max(1, 2000 // paragraphs)
+        streaming = min(timeit.repeat(lambda: read_docx_text(content), number=number, repeat=5)) / number
+        line = f"paragraphs={paragraphs:5d} size={len(content) / 1024:7.1f}KB streaming={streaming * 1000:8.3f} ms"
+        if has_docx2txt:
+            assert read_docx_text(content) == legacy_extract(content)
+            legacy = min(timeit.repeat(lambda: legacy_extract(content), number=number, repeat=5)) / number
+            line += f" docx2txt={legacy * 1000:8.3f} ms speedup={legacy / streaming:5.2f}x"
+        print(line)
+
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]] or [20, 200, 2000])
@@ -0,0 +1,98 @@
+"""
+Micro-benchmark for resume section classification.
+Compares the legacy per-stage `classify_resume_sections` (run once by each of the experience,
+education and skills stages) with a single `ParsedDocument` built once per upload.
+
+Usage: python benchmarks/bench_sections.py [pages ...]
+"""
+
+import os
+import re
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from document import ParsedDocument  # noqa: E402
+
+
+def legacy_classify_resume_sections(text: str) -> dict:
+    """Section classifier as it was before the shared section index."""
+    section_headers = {
+        'experience': [r'experience', r'employment', r'work history', r'professional experience'],
+        'education': [r'education', r'academic background', r'qualifications'],
+        'skills': [r'skills', r'technical skills', r'core competencies'],
+        'projects': [r'projects', r'project experience'],
+        'summary': [r'summary', r'objective', r'profile', r'about', r'overview'],
+    }
+    section_map = {}
+    current_section = 'other'
+    section_map[current_section] = []
+    for line in text.splitlines():
+        line_stripped = line.strip().lower()
+        found_section = False
+        for section, patterns in section_headers.items():
+            for pat in patterns:
+                if re.fullmatch(rf'.*{pat}.*', line_stripped):
+                    current_section = section
+                    if current_section not in section_map:
+                        section_map[current_section] = []
+                    found_section = True
+                    break
+            if found_section:
+                break
+        section_map.setdefault(current_section, []).append(line)
+    return section_map
+
+
+PAGE = """Jane Doe
+jane.doe@example.com | (555) 123-4567 | linkedin.com/in/janedoe
+Summary
+Backend engineer with eight years of experience building distributed systems.
+Experience
+Senior Software Engineer - Acme Corp, Jan 2020 - Present
+Designed and shipped a streaming ingestion platform handling 2M events per second.
+Led a team of five engineers and reduced infrastructure cost by 30%.
+Software Engineer - Globex, Jun 2016 - Dec 2019
+Built internal tooling in Python and Go used by 200+ developers.
+Education
+State University, Computer Science, Bachelor of Science 2016
+Skills
+Python, Go, Kubernetes, PostgreSQL, Kafka, AWS, Terraform
+Projects
+Open source contributor to several observability libraries.
+"""
+
+
+def build_resume(pages: int) -> str:
+    return '\n'.join(PAGE for _ in range(pages))
+
+
+def legacy_pipeline(text: str) -> None:
+    # The experience, education and skills stages each classified the full text.
+    for section in ('experience', 'education', 'skills'):
+        legacy_classify_resume_sections(text).get(section, [])
+
+
+def shared_pipeline(text: str) -> None:
+    document = ParsedDocument(text)
+    for section in ('experience', 'education', 'skills'):
+        document.section_lines(section)
+
+
+def main(pages_list):
+    for pages in pages_list:
+        text = build_resume(pages)
+        document = ParsedDocument(text)
+        assert document.sections.to_dict(document.lines) == legacy_classify_resume_sections(text)
+        number = max(1, 200 // pages)
+        legacy = min(timeit.repeat(lambda: legacy_pipeline(text), number=number, repeat=5)) / number
+        shared = min(timeit.repeat(lambda: shared_pipeline(text), number=number, repeat=5)) / number
+        print(
+            f"pages={pages:3d} lines={len(document.lines):5d} "
+            f"legacy={legacy * 1000:8.3f} ms shared={shared * 1000:8.3f} ms speedup={legacy / shared:5.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]] or [1, 5, 20, 50])
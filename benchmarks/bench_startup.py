@@ -0,0 +1,79 @@
+"""
+Benchmark of service startup.
+Measures, in fresh interpreter processes:
+- the time to import main and which heavy dependencies that import pulls in;
+- the time until /health answers and until /ready reports ready;
+- the latency of the first and second /extract requests, with and without WARMUP.
+
+Usage: python benchmarks/bench_startup.py
+"""
+
+import json
+import os
+import re
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+HEAVY_MODULES = ("spacy", "sklearn", "langchain_google_genai", "langchain", "pdfplumber", "pytesseract")
+
+
+def measure_import() -> None:
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import main"],
+        cwd=ROOT, capture_output=True, text=True
+    )
+    cumulative = {}
+    for line in result.stderr.splitlines():
+        match = re.match(r"import time:\s+\d+ \|\s+(\d+) \|(\s*)(\S+)", line)
+        if match and match.group(3) not in cumulative:
+            cumulative[match.group(3)] = int(match.group(1)) / 1000
+    print(f"import main: {cumulative.get('main', float('nan')):8.1f} ms")
+    for module in HEAVY_MODULES:
+        loaded = f"{cumulative[module]:8.1f} ms" if module in cumulative else "not imported"
+        print(f"  {module:24s} {loaded}")
+
+
+def child() -> None:
+    started = time.perf_counter()
+    import main
+    from fastapi.testclient import TestClient
+    from warmup import build_sample_pdf, SAMPLE_RESUME_TEXT
+    timings = {"import": (time.perf_counter() - started) * 1000}
+    with TestClient(main.app, raise_server_exceptions=False) as client:
+        client.get("/health")
+        timings["health"] = (time.perf_counter() - started) * 1000
+        while client.get("/ready").status_code != 200:
+            time.sleep(0.05)
+        timings["ready"] = (time.perf_counter() - started) * 1000
+        for name, text in (("first_extract", SAMPLE_RESUME_TEXT), ("second_extract", SAMPLE_RESUME_TEXT + "\nGo")):
+            request_started = time.perf_counter()
+            client.post("/extract", files={"file": ("resume.pdf", build_sample_pdf(text), "application/pdf")})
+            timings[name] = (time.perf_counter() - request_started) * 1000
+    print(json.dumps(timings))
+
+
+def measure_requests() -> None:
+    for warmup in ("false", "true"):
+        env = dict(os.environ, WARMUP=warmup)
+        result = subprocess.run(
+            [sys.executable, os.path.abspath(__file__), "--child"],
+            cwd=ROOT, env=env, capture_output=True, text=True
+        )
+        timings = json.loads(result.stdout.strip().splitlines()[-1])
+        print(
+            f"WARMUP={warmup:5s} import={timings['import']:7.0f} ms health={timings['health']:7.0f} ms "
+            f"ready={timings['ready']:7.0f} ms first /extract={timings['first_extract']:7.0f} ms "
+            f"second /extract={timings['second_extract']:7.0f} ms"
+        )
+
+
+if __name__ == "__main__":
+    if "--child" in sys.argv:
+        child()
+    else:
+        measure_import()
+        measure_requests()
@@ -0,0 +1,64 @@
+"""
+Benchmark of Python heap usage while receiving concurrent uploads.
+Compares reading each upload fully into memory (the former `await file.read()`) with
+streaming it through `uploads.spool_upload`, which keeps at most the spool threshold in memory.
+Memory held natively by the PDF parsers is not traced and is the same for both paths.
+
+Usage: python benchmarks/bench_upload_memory.py [concurrency] [size_mb]
+"""
+
+import asyncio
+import os
+import sys
+import tempfile
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import uploads  # noqa: E402
+
+
+class FakeUpload:
+    """Minimal stand-in for UploadFile backed by a spooled temporary file, as Starlette does."""
+    def __init__(self, filename: str, size: int):
+        self.filename = filename
+        self.file = tempfile.SpooledTemporaryFile(max_size=1024 * 1024)
+        self.file.write(b'PK\x03\x04' + os.urandom(size - 4))
+        self.file.seek(0)
+
+    async def read(self, size: int = -1) -> bytes:
+        return self.file.read(size)
+
+
+async def read_all(upload: FakeUpload):
+    return await upload.read()
+
+
+async def spool(upload: FakeUpload):
+    return await uploads.spool_upload(upload, 'docx', max_bytes=1 << 40)
+
+
+async def measure(receive, concurrency: int, size: int) -> int:
+    files = [FakeUpload(f"resume{i}.docx", size) for i in range(concurrency)]
+    tracemalloc.start()
+    results = await asyncio.gather(*(receive(f) for f in files))
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    for result in results:
+        if isinstance(result, uploads.SpooledUpload):
+            result.close()
+    return peak
+
+
+def main(concurrency: int, size_mb: float):
+    size = int(size_mb * 1024 * 1024)
+    legacy = asyncio.run(measure(read_all, concurrency, size))
+    spooled = asyncio.run(measure(spool, concurrency, size))
+    print(f"concurrency={concurrency} size={size_mb}MB")
+    print(f"read-all peak heap: {legacy / 1e6:8.1f} MB")
+    print(f"spooled peak heap:  {spooled / 1e6:8.1f} MB")
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    main(int(args[0]) if args else 8, float(args[1]) if len(args) > 1 else 5)
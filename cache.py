@@ -0,0 +1,237 @@
+"""
+Two-tier result cache
+In-memory LRU tier bounded by size, backed by an optional SQLite tier with size-based eviction.
+Entries are namespaced and versioned so a logic change invalidates everything cached before it.
+"""
+
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class LRUCache:
+    """
+    In-memory least-recently-used cache bounded by the total size of its values in bytes.
+    """
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self.size_bytes = 0
+        self._entries: 'OrderedDict[str, bytes]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str) -> Optional[bytes]:
+        """
+        Get a value and mark it as most recently used.
+        Args:
+            key (str): Cache key.
+        Returns:
+            Optional[bytes]: Cached value or None.
+        """
+        with self._lock:
+            value = self._entries.get(key)
+            if value is not None:
+                self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: bytes) -> None:
+        """
+        Store a value, evicting least recently used entries beyond the size bound.
+        Args:
+            key (str): Cache key.
+            value (bytes): Value to store.
+        """
+        if len(value) > self.max_bytes:
+            return
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self.size_bytes -= len(previous)
+            self._entries[key] = value
+            self.size_bytes += len(value)
+            while self.size_bytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self.size_bytes -= len(evicted)
+
+
+class SqliteCache:
+    """
+    On-disk cache tier in a SQLite file, evicting least recently accessed entries beyond a size bound.
+    Safe to share between threads and between processes using the same file.
+    """
+    def __init__(self, path: str, max_bytes: int):
+        self.path = path
+        self.max_bytes = max_bytes
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self._pid = None
+        conn = self._conn
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS cache_entries ("
+            "namespace TEXT NOT NULL, version TEXT NOT NULL, key TEXT NOT NULL, "
+            "value BLOB NOT NULL, size INTEGER NOT NULL, accessed REAL NOT NULL, "
+            "PRIMARY KEY (namespace, key))"
+        )
+        conn.execute("CREATE INDEX IF NOT EXISTS cache_entries_accessed ON cache_entries (accessed)")
+
+    @property
+    def _conn(self) -> sqlite3.Connection:
+        """Connection of the current process; a connection inherited through fork is never reused."""
+        if self._pid != os.getpid():
+            self._connection = sqlite3.connect(self.path, timeout=30, check_same_thread=False, isolation_level=None)
+            self._pid = os.getpid()
+        return self._connection
+
+    def purge_stale(self, namespace: str, version: str) -> int:
+        """
+        Delete entries of a namespace written by another version.
+        Args:
+            namespace (str): Cache namespace.
+            version (str): Current version.
+        Returns:
+            int: Number of deleted entries.
+        """
+        with self._lock:
+            cursor = self._conn.execute(
+                "DELETE FROM cache_entries WHERE namespace = ? AND version != ?", (namespace, version)
+            )
+            return cursor.rowcount
+
+    def get(self, namespace: str, version: str, key: str) -> Optional[bytes]:
+        """
+        Get a value and refresh its access time.
+        Args:
+            namespace (str): Cache namespace.
+            version (str): Current version; entries of other versions are ignored.
+            key (str): Cache key.
+        Returns:
+            Optional[bytes]: Cached value or None.
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value FROM cache_entries WHERE namespace = ? AND key = ? AND version = ?",
+                (namespace, key, version)
+            ).fetchone()
+            if row is None:
+                return None
+            self._conn.execute(
+                "UPDATE cache_entries SET accessed = ? WHERE namespace = ? AND key = ?",
+                (time.time(), namespace, key)
+            )
+            return bytes(row[0])
+
+    def set(self, namespace: str, version: str, key: str, value: bytes) -> None:
+        """
+        Store a value, evicting least recently accessed entries beyond the size bound.
+        Args:
+            namespace (str): Cache namespace.
+            version (str): Current version.
+            key (str): Cache key.
+            value (bytes): Value to store.
+        """
+        if len(value) > self.max_bytes:
+            return
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO cache_entries (namespace, version, key, value, size, accessed) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (namespace, version, key, sqlite3.Binary(value), len(value), time.time())
+            )
+            total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM cache_entries").fetchone()[0]
+            while total > self.max_bytes:
+                row = self._conn.execute(
+                    "SELECT namespace, key, size FROM cache_entries ORDER BY accessed LIMIT 1"
+                ).fetchone()
+                if row is None:
+                    break
+                self._conn.execute("DELETE FROM cache_entries WHERE namespace = ? AND key = ?", row[:2])
+                total -= row[2]
+
+    def size_bytes(self) -> int:
+        """Total size of all stored values in bytes."""
+        with self._lock:
+            return self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM cache_entries").fetchone()[0]
+
+
+class TieredCache:
+    """
+    Versioned cache with an in-memory LRU tier and an optional SQLite tier.
+    Values are bytes; callers serialize their own results. Hits are promoted to the memory tier.
+    """
+    def __init__(self, namespace: str, version: str, memory_bytes: int,
+                 disk_path: Optional[str] = None, disk_bytes: int = 0):
+        self.namespace = namespace
+        self.version = version
+        self.memory = LRUCache(memory_bytes)
+        self.disk: Optional[SqliteCache] = None
+        if disk_path and disk_bytes > 0:
+            self.disk = SqliteCache(disk_path, disk_bytes)
+            purged = self.disk.purge_stale(namespace, version)
+            if purged:
+                logger.info(f"Purged {purged} stale '{namespace}' cache entries")
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+    def get(self, key: str) -> Optional[bytes]:
+        """
+        Look up a value in the memory tier, then the disk tier.
+        Args:
+            key (str): Cache key.
+        Returns:
+            Optional[bytes]: Cached value or None.
+        """
+        value = self.memory.get(key)
+        if value is not None:
+            self.memory_hits += 1
+            return value
+        if self.disk is not None:
+            try:
+                value = self.disk.get(self.namespace, self.version, key)
+            except sqlite3.Error as e:
+                logger.warning(f"Disk cache read failed: {str(e)}")
+            if value is not None:
+                self.disk_hits += 1
+                self.memory.set(key, value)
+                return value
+        self.misses += 1
+        return None
+
+    def set(self, key: str, value: bytes) -> None:
+        """
+        Store a value in both tiers.
+        Args:
+            key (str): Cache key.
+            value (bytes): Value to store.
+        """
+        self.memory.set(key, value)
+        if self.disk is not None:
+            try:
+                self.disk.set(self.namespace, self.version, key, value)
+            except sqlite3.Error as e:
+                logger.warning(f"Disk cache write failed: {str(e)}")
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters and tier sizes."""
+        lookups = self.memory_hits + self.disk_hits + self.misses
+        return {
+            "version": self.version,
+            "memoryHits": self.memory_hits,
+            "diskHits": self.disk_hits,
+            "misses": self.misses,
+            "hitRate": round((self.memory_hits + self.disk_hits) / lookups, 3) if lookups else 0.0,
+            "memoryEntries": len(self.memory),
+            "memoryBytes": self.memory.size_bytes,
+            "diskBytes": self.disk.size_bytes() if self.disk is not None else 0,
+        }
@@ -0,0 +1,182 @@
+"""
+Single-pass contact information scanner.
+One compiled alternation of named groups finds every email address, phone number, LinkedIn profile,
+website and postal address in a resume in a single scan of the text. Addresses are matched by a
+zero-width lookahead at the start of each line or line segment, so the other fields on the same
+line are still found. Every candidate keeps its position and a confidence score. The candidate of
+each field that comes first (in the header before the rest of the text, then by line, then by
+confidence) fills the personal information, and the rest stay available to callers.
+"""
+
+import re
+from typing import Dict, List, NamedTuple, Optional
+
+CONTACT_FIELDS = ("email", "phone", "linkedin", "website", "address")
+
+_STREET_WORDS = (r"street|st|avenue|ave|road|rd|boulevard|blvd|lane|ln|drive|dr|way|court|ct|place|pl"
+                 r"|parkway|pkwy|highway|hwy|terrace|circle|square|suite|ste|apt|apartment")
+
+CONTACT_PATTERN = re.compile(
+    # No field starts inside a word; checking that first lets the scan skip most positions with one test
+    r"(?<![A-Za-z])(?:"
+    # Addresses: zero-width, at the start of a line or after a "|", "•" or tab separator
+    r"(?:^|(?<=[|•·\t]))(?=[^\S\n]*(?P<address>"
+    r"(?i:address)\s*:[^\n|•·\t]+"
+    rf"|\d{{1,6}}[^\S\n]+[^\n|•·\t@]*?\b(?i:{_STREET_WORDS})\b\.?[^\n|•·\t@]*"
+    r"|[A-Z][A-Za-z .'-]+,[^\S\n]*(?:[A-Z]{2}|[A-Z][a-z]+)[^\S\n]+\d{5}(?:-\d{4})?\b[^\n|•·\t@]*"
+    r"))"
+    r"|(?P<email>(?<![A-Za-z0-9._%+-])[A-Za-z0-9._%+-]+@[A-Za-z0-9-]+(?:\.[A-Za-z0-9-]+)*\.[A-Za-z]{2,})"
+    # Links: LinkedIn profiles are told apart from other websites after matching
+    r"|(?P<link>(?i:(?:https?://|www\.)[^\s<>()\"',;|•]+"
+    r"|(?:[a-z]{2}\.)?linkedin\.com/(?:in|pub)/[\w%-]+/?"
+    r"|(?:github\.com|gitlab\.com|bitbucket\.org|behance\.net|dribbble\.com)/[\w.-]+))"
+    r"|(?P<phone>(?<![\w+/.-])(?:\+\d{1,3}[^\S\n]?[.-]?[^\S\n]?)?(?:\(\d{1,4}\)[^\S\n]?[.-]?[^\S\n]?)?"
+    r"\d{2,5}(?:[^\S\n]?[.-]?[^\S\n]?\d{2,5}){1,3}(?![\w/]))"
+    r")",
+    re.MULTILINE,
+)
+
+_YEAR_GROUP = re.compile(r"(?:19|20)\d{2}")
+_DIGIT_GROUPS = re.compile(r"\d+")
+_LINKEDIN_PATH = re.compile(r"linkedin\.com/(?:in|pub)/[\w%-]+", re.IGNORECASE)
+_ZIP_CODE = re.compile(r"\b\d{5}(?:-\d{4})?\b")
+_STREET_NUMBER = re.compile(r"^\d{1,6}\s")
+
+# Contact details in the first lines of a resume are the candidate's own; later ones may be references'.
+HEADER_LINES = 10
+_OUTSIDE_HEADER_PENALTY = 0.85
+
+
+class ContactCandidate(NamedTuple):
+    """A contact field value found in a text."""
+    field: str
+    value: str
+    start: int
+    end: int
+    confidence: float
+    line: int = 0
+    in_header: bool = True
+
+
+class ContactInfo:
+    """All contact candidates of a text, grouped by field and ranked by position, then confidence."""
+    def __init__(self, candidates: List[ContactCandidate]):
+        self.candidates: Dict[str, List[ContactCandidate]] = {field: [] for field in CONTACT_FIELDS}
+        for candidate in candidates:
+            self.candidates[candidate.field].append(candidate)
+        for field_candidates in self.candidates.values():
+            # The candidate's own details come first in a resume; the format only breaks ties on a line
+            field_candidates.sort(key=lambda c: (not c.in_header, c.line, -c.confidence))
+
+    def best(self, field: str) -> Optional[ContactCandidate]:
+        """
+        Get the best ranked candidate of a field.
+        Args:
+            field (str): One of CONTACT_FIELDS.
+        Returns:
+            Optional[ContactCandidate]: First candidate, or None if the field was not found.
+        """
+        field_candidates = self.candidates.get(field)
+        return field_candidates[0] if field_candidates else None
+
+    def value(self, field: str) -> Optional[str]:
+        """
+        Get the value of the best ranked candidate of a field.
+        Args:
+            field (str): One of CONTACT_FIELDS.
+        Returns:
+            Optional[str]: Best value, or None if the field was not found.
+        """
+        candidate = self.best(field)
+        return candidate.value if candidate else None
+
+    def spans(self) -> List[tuple]:
+        """
+        Get the character spans of all candidates.
+        Returns:
+            List[tuple]: (start, end) of every candidate.
+        """
+        return [(c.start, c.end) for field_candidates in self.candidates.values() for c in field_candidates]
+
+
+def _phone_confidence(value: str) -> float:
+    """Score a phone number candidate; 0 rejects it."""
+    groups = _DIGIT_GROUPS.findall(value)
+    digits = sum(len(group) for group in groups)
+    if digits < 7 or digits > 15:
+        return 0.0
+    if not value.startswith(("+", "(")) and _YEAR_GROUP.fullmatch(groups[0]):
+        return 0.0  # a year range such as 2016-2020 or a date such as 2019-03-15
+    if value.startswith("+"):
+        return 0.95 if digits >= 10 else 0.6
+    if digits in (10, 11):
+        return 0.9
+    return 0.6 if digits < 10 else 0.5
+
+
+def _address_confidence(value: str) -> float:
+    """Score an address candidate by the parts it contains."""
+    if value.lower().startswith("address"):
+        return 0.9
+    has_number = bool(_STREET_NUMBER.match(value))
+    has_zip = bool(_ZIP_CODE.search(value))
+    if has_number and has_zip:
+        return 0.9
+    return 0.75 if has_number else 0.7
+
+
+def scan_contacts(text: str, header_lines: int = HEADER_LINES) -> ContactInfo:
+    """
+    Find all contact information in a text in one scan.
+    Args:
+        text (str): Resume text.
+        header_lines (int): Number of leading lines treated as the resume header.
+    Returns:
+        ContactInfo: Candidates of every field with positions and confidence.
+    """
+    header_end = len(text)
+    position = -1
+    for _ in range(header_lines):
+        position = text.find("\n", position + 1)
+        if position < 0:
+            break
+    else:
+        header_end = position
+
+    candidates = []
+    line, line_position = 0, 0
+    for match in CONTACT_PATTERN.finditer(text):
+        field = match.lastgroup
+        if field == "address":
+            start, end = match.span("address")
+            raw = match.group("address")
+            value = raw.strip()
+            start += len(raw) - len(raw.lstrip())
+            end = start + len(value)
+            if value.lower().startswith("address"):
+                value = value.split(":", 1)[1].strip()
+            confidence = _address_confidence(raw.strip())
+        else:
+            start, end = match.span()
+            value = match.group()
+            if field == "phone":
+                confidence = _phone_confidence(value)
+                if not confidence:
+                    continue
+            elif field == "link":
+                profile = _LINKEDIN_PATH.search(value)
+                if profile:
+                    field, value, confidence = "linkedin", f"https://{profile.group()}", 0.95
+                else:
+                    field, value, confidence = "website", value.rstrip("."), 0.8
+                    end = start + len(value)
+            else:
+                confidence = 0.95
+        in_header = start <= header_end
+        if not in_header:
+            confidence *= _OUTSIDE_HEADER_PENALTY
+        # Matches come in text order, so the line count only advances
+        line += text.count("\n", line_position, start)
+        line_position = start
+        candidates.append(ContactCandidate(field, value, start, end, round(confidence, 3), line, in_header))
+    return ContactInfo(candidates)
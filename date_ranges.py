@@ -0,0 +1,153 @@
+"""
+Rule-based date and date-range recognizer for experience and education entries.
+Finds dates such as "Jan 2020", "Sept. 2019", "03/2019", "2019-03", "Summer 2018" and "2017", and
+ranges between them such as "Jan 2020 – Present" or "03/2019-06/2021", with one compiled pattern
+and without the NER model. Dates are normalized to month ordinals (year * 12 + month - 1), so
+start and end dates written in different formats can be compared.
+"""
+
+import re
+from functools import lru_cache
+from typing import List, NamedTuple, Optional
+
+_MONTH = (r"(?:jan(?:uary)?|feb(?:ruary)?|mar(?:ch)?|apr(?:il)?|may|june?|july?|aug(?:ust)?"
+          r"|sep(?:t(?:ember)?)?|oct(?:ober)?|nov(?:ember)?|dec(?:ember)?)\.?")
+_SEASON = r"(?:spring|summer|fall|autumn|winter)"
+_YEAR = r"(?:19|20)\d{2}"
+_MONTH_NUMBER = r"(?:0?[1-9]|1[0-2])"
+_DAY_NUMBER = r"(?:0?[1-9]|[12]\d|3[01])"
+
+# Longer formats first, so "2019-03" is not read as the year 2019 followed by "-03".
+_DATE = (
+    rf"(?:(?:{_MONTH}|{_SEASON})\s*,?\s*(?:{_YEAR}|['’]\d{{2}})"
+    rf"|\d{{1,2}}[/.-]\d{{1,2}}[/.-]{_YEAR}"
+    rf"|{_MONTH_NUMBER}[/.-]{_YEAR}"
+    rf"|{_YEAR}[/.-]{_MONTH_NUMBER}(?:[/.-]{_DAY_NUMBER})?(?!\d)"
+    rf"|{_YEAR})"
+)
+# "date" alone covers "2019 to date", where the separator takes the "to"
+_PRESENT = r"(?:present|current(?:ly)?|now|today|ongoing|(?:to|till)\s+date|date)"
+_PRESENT_PATTERN = re.compile(rf"(?:{_PRESENT})\.?", re.IGNORECASE)
+_SEPARATOR = r"\s*(?:-{1,2}|–|—|‒|~|\bto\b|\buntil\b|\btill\b|\bthrough\b|\bthru\b)\s*"
+
+DATE_RANGE_PATTERN = re.compile(
+    rf"(?<![\w/.-])(?:"
+    # "Jan - Mar 2020": the start month shares the year of the end date
+    rf"(?P<start_month>{_MONTH}|{_SEASON}){_SEPARATOR}(?P<short_end>(?:{_MONTH}|{_SEASON})\s*,?\s*{_YEAR})"
+    rf"|(?P<start>{_DATE})(?:{_SEPARATOR}(?:(?P<end>{_DATE})|(?P<present>{_PRESENT})))?"
+    rf")(?![\w/])",
+    re.IGNORECASE,
+)
+
+# End date of every open-ended range, however it was written.
+PRESENT = "Present"
+
+_MONTH_NUMBERS = {
+    "jan": 1, "feb": 2, "mar": 3, "apr": 4, "may": 5, "jun": 6,
+    "jul": 7, "aug": 8, "sep": 9, "oct": 10, "nov": 11, "dec": 12,
+}
+# Academic terms; winter is the term at the start of the year.
+_SEASON_MONTHS = {"spring": 3, "summer": 6, "fall": 9, "autumn": 9, "winter": 1}
+
+_MONTH_YEAR = re.compile(rf"({_MONTH}|{_SEASON})\s*,?\s*({_YEAR}|['’]\d{{2}})", re.IGNORECASE)
+_NUMERIC_DATE = re.compile(rf"(\d{{1,2}})[/.-](\d{{1,2}})[/.-]({_YEAR})")
+_NUMERIC_MONTH_YEAR = re.compile(rf"(\d{{1,2}})[/.-]({_YEAR})")
+_YEAR_MONTH = re.compile(rf"({_YEAR})[/.-](\d{{1,2}})(?:[/.-]\d{{1,2}})?")
+_YEAR_ONLY = re.compile(_YEAR)
+
+
+class DateRange(NamedTuple):
+    """A date or date range found in a line of text."""
+    start: str
+    end: str
+    current: bool
+    start_ordinal: Optional[int]
+    end_ordinal: Optional[int]
+    span_start: int
+    span_end: int
+
+
+def _month_number(name: str) -> int:
+    name = name.lower().rstrip(".")
+    return _SEASON_MONTHS.get(name) or _MONTH_NUMBERS[name[:3]]
+
+
+def _year(text: str) -> int:
+    if text[0] in "'’":
+        # Two-digit years: '98 is 1998, '19 is 2019
+        short = int(text[1:])
+        return 1900 + short if short >= 50 else 2000 + short
+    return int(text)
+
+
+@lru_cache(maxsize=4096)
+def month_ordinal(text: str, end: bool = False) -> Optional[int]:
+    """
+    Convert a date to a month ordinal (year * 12 + month - 1).
+    A year alone means January as a start date and December as an end date.
+    Args:
+        text (str): Date in one of the recognized formats.
+        end (bool): Whether the date ends a range.
+    Returns:
+        Optional[int]: Month ordinal, or None if the text is not a recognized date or is "Present".
+    """
+    text = text.strip().rstrip(".,")
+    match = _MONTH_YEAR.fullmatch(text)
+    if match:
+        return _year(match.group(2)) * 12 + _month_number(match.group(1)) - 1
+    match = _NUMERIC_DATE.fullmatch(text)
+    if match:
+        first, second, year = int(match.group(1)), int(match.group(2)), int(match.group(3))
+        # Month first unless that is impossible (day/month/year)
+        month = first if first <= 12 else second
+        return year * 12 + month - 1 if 1 <= month <= 12 else None
+    match = _NUMERIC_MONTH_YEAR.fullmatch(text)
+    if match:
+        month = int(match.group(1))
+        return int(match.group(2)) * 12 + month - 1 if 1 <= month <= 12 else None
+    match = _YEAR_MONTH.fullmatch(text)
+    if match:
+        month = int(match.group(2))
+        return int(match.group(1)) * 12 + month - 1 if 1 <= month <= 12 else None
+    if _YEAR_ONLY.fullmatch(text):
+        return int(text) * 12 + (11 if end else 0)
+    return None
+
+
+def is_present(text: str) -> bool:
+    """
+    Check whether an end date means the range is still open ("Present", "current", "to date", ...).
+    Args:
+        text (str): End date as written.
+    Returns:
+        bool: True for an open-ended end date.
+    """
+    return _PRESENT_PATTERN.fullmatch(text.strip()) is not None
+
+
+def find_date_ranges(text: str) -> List[DateRange]:
+    """
+    Find dates and date ranges in a line of text. A single date has an empty end, an open-ended
+    range ends in "Present", and the start of "Jan - Mar 2020" takes the year of its end.
+    Ranges whose end is before their start are ignored.
+    Args:
+        text (str): Line of resume text.
+    Returns:
+        List[DateRange]: Ranges in text order.
+    """
+    ranges = []
+    for match in DATE_RANGE_PATTERN.finditer(text):
+        if match.group("start_month"):
+            end = match.group("short_end")
+            start = f"{match.group('start_month')} {_YEAR_ONLY.search(end).group()}"
+            ranges.append(DateRange(start, end, False, month_ordinal(start),
+                                    month_ordinal(end, end=True), match.start(), match.end()))
+            continue
+        start, end, present = match.group("start"), match.group("end"), match.group("present")
+        start_ordinal = month_ordinal(start)
+        end_ordinal = month_ordinal(end, end=True) if end else None
+        if start_ordinal is not None and end_ordinal is not None and end_ordinal < start_ordinal:
+            continue
+        ranges.append(DateRange(start, end or (PRESENT if present else ""), bool(present), start_ordinal,
+                                end_ordinal, match.start(), match.end()))
+    return ranges
@@ -0,0 +1,186 @@
+"""
+Parsed resume document shared by all extraction stages.
+Splits the raw text into lines once, indexes resume sections with a single precompiled header matcher,
+and holds the named entities found by the single NER pass over the document.
+"""
+
+import re
+from bisect import bisect_left
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+# Section header keywords, in priority order: when a line matches headers of
+# several sections, the first section listed here wins.
+SECTION_HEADERS: Dict[str, List[str]] = {
+    'experience': [r'experience', r'employment', r'work history', r'professional experience'],
+    'education': [r'education', r'academic background', r'qualifications'],
+    'skills': [r'skills', r'technical skills', r'core competencies'],
+    'projects': [r'projects', r'project experience'],
+    'summary': [r'summary', r'objective', r'profile', r'about', r'overview'],
+}
+
+DEFAULT_SECTION = 'other'
+
+
+class Entity(NamedTuple):
+    """Named entity located by character offsets in the document text."""
+    start: int
+    end: int
+    label: str
+    text: str
+
+
+def compile_header_matcher(section_headers: Dict[str, List[str]]) -> re.Pattern:
+    """
+    Compile all section header patterns into one matcher.
+    Each section becomes a lookahead branch followed by an empty named group, so a single
+    `match` call at the start of a line returns the highest-priority section in `lastgroup`.
+    Args:
+        section_headers (Dict[str, List[str]]): Mapping of section name to header patterns.
+    Returns:
+        re.Pattern: Compiled matcher.
+    """
+    branches = [
+        rf"(?=.*(?:{'|'.join(patterns)}))(?P<{section}>)"
+        for section, patterns in section_headers.items()
+    ]
+    return re.compile('|'.join(branches))
+
+
+HEADER_MATCHER = compile_header_matcher(SECTION_HEADERS)
+
+
+def join_page_texts(page_texts: List[str]) -> str:
+    """
+    Join per-page texts into the document text, skipping pages without text.
+    Args:
+        page_texts (List[str]): Text of each page.
+    Returns:
+        str: Document text.
+    """
+    return '\n'.join(text for text in page_texts if text)
+
+
+class SectionIndex:
+    """
+    Line spans of each resume section.
+    A section that appears several times in a document keeps one (start, end) span per occurrence.
+    """
+    def __init__(self):
+        self.spans: Dict[str, List[Tuple[int, int]]] = {DEFAULT_SECTION: []}
+
+    @classmethod
+    def build(cls, lines: List[str], matcher: re.Pattern = HEADER_MATCHER) -> 'SectionIndex':
+        """
+        Classify lines into sections in a single pass.
+        Args:
+            lines (List[str]): Document lines.
+            matcher (re.Pattern): Compiled header matcher.
+        Returns:
+            SectionIndex: Index of line spans per section.
+        """
+        index = cls()
+        current_section = DEFAULT_SECTION
+        span_start = 0
+        for i, line in enumerate(lines):
+            match = matcher.match(line.strip().lower())
+            if match and match.lastgroup != current_section:
+                index._close_span(current_section, span_start, i)
+                current_section = match.lastgroup
+                span_start = i
+        index._close_span(current_section, span_start, len(lines))
+        return index
+
+    def _close_span(self, section: str, start: int, end: int) -> None:
+        spans = self.spans.setdefault(section, [])
+        if start < end:
+            spans.append((start, end))
+
+    def line_numbers(self, section: str) -> List[int]:
+        """
+        Get the line numbers belonging to a section.
+        Args:
+            section (str): Section name.
+        Returns:
+            List[int]: Line numbers in document order.
+        """
+        return [i for start, end in self.spans.get(section, []) for i in range(start, end)]
+
+    def to_dict(self, lines: List[str]) -> Dict[str, List[str]]:
+        """
+        Materialize the index as a mapping of section name to its lines.
+        Args:
+            lines (List[str]): Document lines the index was built from.
+        Returns:
+            Dict[str, List[str]]: Mapping of section name to list of lines in that section.
+        """
+        return {
+            section: [lines[i] for start, end in spans for i in range(start, end)]
+            for section, spans in self.spans.items()
+        }
+
+
+class ParsedDocument:
+    """
+    Resume text split into lines, with character offsets and a section index.
+    Built once per upload and read by every `_extract_*` stage of the extractor.
+    """
+    def __init__(self, text: str):
+        self.text = text
+        self.lines = text.splitlines()
+        self.line_offsets: List[int] = []
+        offset = 0
+        for piece in text.splitlines(keepends=True):
+            self.line_offsets.append(offset)
+            offset += len(piece)
+        self.sections = SectionIndex.build(self.lines)
+        self.entities: List[Entity] = []
+        self._entity_starts: List[int] = []
+
+    def set_entities(self, entities: List[Entity]) -> None:
+        """
+        Attach the entities of the document-level NER pass.
+        Args:
+            entities (List[Entity]): Entities found in `text`.
+        """
+        self.entities = sorted(entities, key=lambda ent: ent.start)
+        self._entity_starts = [ent.start for ent in self.entities]
+
+    def entities_in(self, start: int, end: int, label: Optional[str] = None) -> List[Entity]:
+        """
+        Get the entities contained in a character span.
+        Args:
+            start (int): Start character offset.
+            end (int): End character offset.
+            label (Optional[str]): Only return entities with this label.
+        Returns:
+            List[Entity]: Entities fully inside the span, in document order.
+        """
+        found = []
+        for i in range(bisect_left(self._entity_starts, start), len(self.entities)):
+            ent = self.entities[i]
+            if ent.start >= end:
+                break
+            if ent.end <= end and (label is None or ent.label == label):
+                found.append(ent)
+        return found
+
+    def section_lines(self, section: str) -> List[str]:
+        """
+        Get the lines of a section.
+        Args:
+            section (str): Section name.
+        Returns:
+            List[str]: Lines in that section, in document order.
+        """
+        return [self.lines[i] for i in self.sections.line_numbers(section)]
+
+    def line_span(self, line_number: int) -> Tuple[int, int]:
+        """
+        Get the character span of a line within the document text.
+        Args:
+            line_number (int): Line number.
+        Returns:
+            Tuple[int, int]: Start and end character offsets (end excludes the line break).
+        """
+        start = self.line_offsets[line_number]
+        return start, start + len(self.lines[line_number])
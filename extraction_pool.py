@@ -0,0 +1,358 @@
+"""
+Process pool for CPU-bound resume extraction and OCR.
+Keeps PyMuPDF, pdfplumber, docx2txt, spaCy and Tesseract work off the event loop thread,
+with per-job timeouts, per-worker memory limits and automatic replacement of crashed workers.
+"""
+
+import asyncio
+import logging
+import math
+import multiprocessing
+import os
+import resource
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Callable, List, Optional, Tuple
+
+from document import join_page_texts
+from uploads import DocumentSource, MAX_PDF_PAGES, open_pdf, spool_to_file
+
+logger = logging.getLogger(__name__)
+
+# Number of worker processes; 0 runs jobs in a thread of the API process instead.
+EXTRACTION_WORKERS = int(os.getenv("EXTRACTION_WORKERS", "2"))
+# Hard wall-clock limit for a single extraction or OCR job, in seconds.
+EXTRACTION_TIMEOUT = float(os.getenv("EXTRACTION_TIMEOUT", "60"))
+# Address-space limit per worker process in megabytes; 0 disables the limit.
+EXTRACTION_MEMORY_LIMIT_MB = int(os.getenv("EXTRACTION_MEMORY_LIMIT_MB", "2048"))
+# multiprocessing start method; empty uses the platform default (fork on Linux).
+EXTRACTION_START_METHOD = os.getenv("EXTRACTION_START_METHOD", "")
+# PDFs with at least this many pages have their pages extracted in parallel across workers.
+PDF_PARALLEL_MIN_PAGES = int(os.getenv("PDF_PARALLEL_MIN_PAGES", "6"))
+# Seconds shutdown() waits for worker processes to exit before terminating them.
+EXTRACTION_SHUTDOWN_TIMEOUT = float(os.getenv("EXTRACTION_SHUTDOWN_TIMEOUT", "10"))
+# Seconds between checks of a worker process that its parent (the web worker) is still alive.
+PARENT_CHECK_INTERVAL = 1.0
+
+
+class ExtractionTimeoutError(Exception):
+    """Raised when an extraction job exceeds its time limit and its worker was killed."""
+
+
+class ExtractionWorkerError(Exception):
+    """Raised when a worker process died while running a job."""
+
+
+_extractor = None
+
+
+def _watch_parent(parent_pid: int) -> None:
+    """Exit the worker process once its parent is gone, instead of living on as an orphan holding spaCy."""
+    while os.getppid() == parent_pid:
+        time.sleep(PARENT_CHECK_INTERVAL)
+    os._exit(1)
+
+
+def _init_worker(memory_limit_mb: int, parent_pid: int) -> None:
+    """
+    Initialize a worker process: apply the memory limit, watch the parent process and load spaCy
+    once (unless NER runs in the sidecar).
+    Args:
+        memory_limit_mb (int): Address-space limit in megabytes, 0 for none.
+        parent_pid (int): Pid of the process owning the pool; the worker exits when it dies.
+    """
+    threading.Thread(target=_watch_parent, args=(parent_pid,), name="parent-watchdog", daemon=True).start()
+    if memory_limit_mb > 0:
+        limit = memory_limit_mb * 1024 * 1024
+        resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+    _get_extractor()
+
+
+def _get_extractor():
+    global _extractor
+    if _extractor is None:
+        from extractor import ResumeExtractor, load_ner
+        from taxonomy import get_taxonomy
+        load_ner()
+        get_taxonomy()
+        _extractor = ResumeExtractor()
+    return _extractor
+
+
+def load_worker_models() -> int:
+    """
+    Pool job: make sure the worker has loaded spaCy, the skill taxonomy and the extractor.
+    Returns:
+        int: Worker process id.
+    """
+    _get_extractor()
+    return os.getpid()
+
+
+def extract_document(file_content, file_extension: str, filename: str):
+    """
+    Pool job: extract structured resume data from a PDF or DOCX file.
+    Args:
+        file_content (DocumentSource): File content as bytes, or the path of a spooled upload.
+        file_extension (str): File extension (pdf, docx).
+        filename (str): Original filename.
+    Returns:
+        ResumeData: Structured resume data.
+    """
+    return _get_extractor().extract(file_content, file_extension, filename)
+
+
+def count_pdf_pages(file_content) -> int:
+    """
+    Pool job: count the pages of a PDF.
+    Args:
+        file_content (DocumentSource): File content as bytes, or the path of a spooled upload.
+    Returns:
+        int: Number of pages.
+    """
+    with open_pdf(file_content) as doc:
+        return doc.page_count
+
+
+def extract_pdf_page_range(file_content, start: int, stop: int) -> List[str]:
+    """
+    Pool job: extract the text of PDF pages [start, stop).
+    Args:
+        file_content (DocumentSource): File content as bytes, or the path of a spooled upload.
+        start (int): First page number.
+        stop (int): Page number after the last page.
+    Returns:
+        List[str]: Text of each page in the range.
+    """
+    return _get_extractor().extract_pdf_pages(file_content, start, stop)
+
+
+def parse_document_text(raw_text: str):
+    """
+    Pool job: parse structured resume data from extracted text.
+    Args:
+        raw_text (str): Raw extracted text.
+    Returns:
+        ResumeData: Structured resume data.
+    """
+    return _get_extractor().parse_text(raw_text)
+
+
+def ocr_scan_document(file_content) -> Tuple[List[str], List[int]]:
+    """
+    Pool job: read the PDF text layer and find the pages that need OCR.
+    Args:
+        file_content (DocumentSource): File content as bytes, or the path of a spooled upload.
+    Returns:
+        Tuple[List[str], List[int]]: Text of each page, and the numbers of pages without text.
+    """
+    from ocr import scan_text_layer
+    return scan_text_layer(file_content)
+
+
+def ocr_page_batch(file_content, page_numbers: List[int]):
+    """
+    Pool job: render and recognize a batch of PDF pages.
+    Args:
+        file_content (DocumentSource): File content as bytes, or the path of a spooled upload.
+        page_numbers (List[int]): Pages to OCR.
+    Returns:
+        List[PageOcrResult]: OCR output and timings per page.
+    """
+    from ocr import ocr_pdf_pages
+    return ocr_pdf_pages(file_content, page_numbers)
+
+
+def ocr_image_document(file_content) -> str:
+    """
+    Pool job: recognize text in a single image file.
+    Args:
+        file_content (DocumentSource): File content as bytes, or the path of a spooled upload.
+    Returns:
+        str: Extracted text.
+    """
+    from ocr import ocr_image
+    return ocr_image(file_content)
+
+
+@asynccontextmanager
+async def shared_source(file_content: DocumentSource, file_extension: str) -> AsyncIterator[DocumentSource]:
+    """
+    Source to hand to several pool jobs: in-memory content is spooled to a temporary file once,
+    so each job receives a path instead of its own pickled copy of the file.
+    Args:
+        file_content (DocumentSource): File content as bytes, or the path of a spooled upload.
+        file_extension (str): File extension.
+    Yields:
+        DocumentSource: Path of the file, deleted on exit if it was created here.
+    """
+    if isinstance(file_content, str):
+        yield file_content
+        return
+    path = await asyncio.to_thread(spool_to_file, file_content, file_extension)
+    try:
+        yield path
+    finally:
+        os.unlink(path)
+
+
+class ExtractionPool:
+    """
+    Process pool running extraction jobs for the async API handlers.
+    A job that exceeds its timeout or crashes its worker causes the whole executor to be
+    replaced with fresh workers; jobs that were in flight on a replaced executor are retried once.
+    """
+    def __init__(self, workers: int = EXTRACTION_WORKERS, timeout: float = EXTRACTION_TIMEOUT,
+                 memory_limit_mb: int = EXTRACTION_MEMORY_LIMIT_MB, start_method: str = EXTRACTION_START_METHOD):
+        self.workers = workers
+        self.timeout = timeout
+        self.memory_limit_mb = memory_limit_mb
+        self.start_method = start_method or None
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+    def start(self) -> None:
+        """Create the worker processes if the pool is enabled."""
+        if self.workers > 0:
+            self._ensure_executor()
+            logger.info(f"Extraction pool started with {self.workers} workers")
+
+    def shutdown(self, timeout: float = EXTRACTION_SHUTDOWN_TIMEOUT) -> None:
+        """
+        Stop the worker processes, terminating those still running after the timeout.
+        Args:
+            timeout (float): Seconds to wait for workers to finish their current job and exit.
+        """
+        executor = self._executor
+        if executor is None:
+            return
+        self._executor = None
+        processes = list(getattr(executor, '_processes', {}).values())
+        executor.shutdown(wait=False, cancel_futures=True)
+        deadline = time.monotonic() + timeout
+        for process in processes:
+            process.join(max(deadline - time.monotonic(), 0))
+        for process in processes:
+            if process.is_alive():
+                logger.warning(f"Extraction worker {process.pid} did not exit in {timeout:.0f}s, terminating it")
+                process.terminate()
+                process.join(1)
+                if process.is_alive():
+                    process.kill()
+                    process.join()
+
+    def _ensure_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context(self.start_method),
+                initializer=_init_worker,
+                initargs=(self.memory_limit_mb, os.getpid()),
+            )
+        return self._executor
+
+    def _replace_executor(self, executor: ProcessPoolExecutor) -> None:
+        """Kill the workers of a timed-out or broken executor and start fresh ones."""
+        if executor is not self._executor:
+            return  # already replaced by another job
+        self._executor = None
+        for process in list(getattr(executor, '_processes', {}).values()):
+            if process.is_alive():
+                process.terminate()
+        executor.shutdown(wait=False, cancel_futures=True)
+        self._ensure_executor()
+        logger.warning("Extraction pool workers replaced")
+
+    async def run(self, fn: Callable[..., Any], *args: Any, timeout: Optional[float] = None) -> Any:
+        """
+        Run a job function in the pool and await its result.
+        Args:
+            fn (Callable): Module-level job function (e.g. extract_document).
+            *args: Picklable job arguments.
+            timeout (Optional[float]): Override of the pool timeout in seconds.
+        Returns:
+            Any: The job result.
+        """
+        timeout = timeout or self.timeout
+        if self.workers <= 0:
+            # Without worker processes a timed-out job cannot be killed, only abandoned.
+            try:
+                return await asyncio.wait_for(asyncio.to_thread(fn, *args), timeout)
+            except asyncio.TimeoutError:
+                raise ExtractionTimeoutError(f"Job exceeded {timeout:.0f}s")
+        for attempt in range(2):
+            executor = self._ensure_executor()
+            try:
+                future = executor.submit(fn, *args)
+                return await asyncio.wait_for(asyncio.wrap_future(future), timeout)
+            except asyncio.TimeoutError:
+                logger.error(f"Extraction job {fn.__name__} exceeded {timeout:.0f}s, killing workers")
+                self._replace_executor(executor)
+                raise ExtractionTimeoutError(f"Job exceeded {timeout:.0f}s")
+            except BrokenProcessPool:
+                logger.warning(f"Extraction worker died while running {fn.__name__}")
+                self._replace_executor(executor)
+                if attempt:
+                    raise ExtractionWorkerError("Extraction worker crashed")
+
+    async def load_models(self) -> None:
+        """Load spaCy and the extractor in every worker (or in-process without workers) ahead of the first request."""
+        await asyncio.gather(*(self.run(load_worker_models) for _ in range(max(self.workers, 1))))
+
+    async def extract(self, file_content, file_extension: str, filename: str,
+                      page_count: Optional[int] = None) -> Any:
+        """
+        Extract structured resume data, splitting long PDFs into page ranges run in parallel.
+        Args:
+            file_content (DocumentSource): File content as bytes, or the path of a spooled upload.
+            file_extension (str): File extension (pdf, docx).
+            filename (str): Original filename.
+            page_count (Optional[int]): Page count of a PDF if already known, e.g. from the upload checks;
+                otherwise it is read in a worker, never on the event loop.
+        Returns:
+            ResumeData: Structured resume data.
+        """
+        if file_extension != 'pdf' or self.workers <= 1:
+            page_count = 0
+        elif page_count is None:
+            try:
+                page_count = await self.run(count_pdf_pages, file_content)
+            except Exception:
+                page_count = 0  # let the single-job path report the failure
+        page_count = min(page_count, MAX_PDF_PAGES)
+        if page_count < PDF_PARALLEL_MIN_PAGES:
+            return await self.run(extract_document, file_content, file_extension, filename)
+        chunk_size = math.ceil(page_count / self.workers)
+        ranges = [(start, min(start + chunk_size, page_count)) for start in range(0, page_count, chunk_size)]
+        logger.info(f"Extracting {page_count} pages of {filename} in {len(ranges)} parallel jobs")
+        async with shared_source(file_content, file_extension) as source:
+            chunks = await asyncio.gather(*(
+                self.run(extract_pdf_page_range, source, start, stop) for start, stop in ranges
+            ))
+        raw_text = join_page_texts([text for chunk in chunks for text in chunk])
+        return await self.run(parse_document_text, raw_text)
+
+    async def ocr(self, file_content, file_extension: str) -> str:
+        """
+        Extract text using OCR on the pages that have no text layer, spread across the workers.
+        Args:
+            file_content (DocumentSource): File content as bytes, or the path of a spooled upload.
+            file_extension (str): File extension.
+        Returns:
+            str: Extracted text.
+        """
+        from ocr import log_page_timings, merge_page_texts
+        if file_extension != 'pdf':
+            return await self.run(ocr_image_document, file_content)
+        async with shared_source(file_content, file_extension) as source:
+            page_texts, ocr_pages = await self.run(ocr_scan_document, source)
+            batches = [ocr_pages[i::max(self.workers, 1)] for i in range(max(self.workers, 1))]
+            results = await asyncio.gather(*(
+                self.run(ocr_page_batch, source, batch) for batch in batches if batch
+            ))
+        page_results = [result for batch in results for result in batch]
+        log_page_timings(page_results)
+        logger.info(f"OCR ran on {len(ocr_pages)} of {len(page_texts)} pages")
+        return merge_page_texts(page_texts, page_results)
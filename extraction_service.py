@@ -0,0 +1,113 @@
+"""
+Resume extraction service
+Cached extraction with an OCR + LLM fallback on top of the extraction pool, shared by the API
+handlers and the job workers.
+"""
+
+import json
+import logging
+import os
+from typing import Any, Optional
+
+from fastapi.encoders import jsonable_encoder
+from starlette.concurrency import run_in_threadpool
+
+from cache import TieredCache
+from extraction_pool import ExtractionPool, ExtractionTimeoutError
+from extractor import EXTRACTOR_VERSION
+from llm_extractor import extract_structured_resume
+from tfidf_model import document_key, record_documents
+from uploads import DocumentSource
+
+logger = logging.getLogger(__name__)
+
+EXTRACTION_CACHE_MEMORY_MB = int(os.getenv("EXTRACTION_CACHE_MEMORY_MB", "64"))
+EXTRACTION_CACHE_PATH = os.getenv("EXTRACTION_CACHE_PATH", "")
+EXTRACTION_CACHE_DISK_MB = int(os.getenv("EXTRACTION_CACHE_DISK_MB", "512"))
+
+
+class OcrExtractionError(Exception):
+    """Raised when the OCR fallback could not extract a resume."""
+
+
+def create_extraction_cache() -> TieredCache:
+    """
+    Create the extraction result cache, keyed by the SHA-256 of the uploaded file.
+    Returns:
+        TieredCache: Cache of JSON-encoded extraction results.
+    """
+    return TieredCache(
+        namespace="extract",
+        version=EXTRACTOR_VERSION,
+        memory_bytes=EXTRACTION_CACHE_MEMORY_MB * 1024 * 1024,
+        disk_path=EXTRACTION_CACHE_PATH,
+        disk_bytes=EXTRACTION_CACHE_DISK_MB * 1024 * 1024,
+    )
+
+
+class ExtractionService:
+    """Extracts resumes through the pool, falling back to OCR, and caches the results."""
+    def __init__(self, pool: ExtractionPool, cache: TieredCache):
+        self.pool = pool
+        self.cache = cache
+
+    async def extract(self, source: DocumentSource, sha256: str, file_extension: str, filename: str,
+                      page_count: Optional[int] = None) -> Any:
+        """
+        Extract structured resume data, serving identical files from the cache.
+        Args:
+            source (DocumentSource): File content as bytes, or the path of a spooled upload.
+            sha256 (str): Hex digest of the file content.
+            file_extension (str): Validated file extension.
+            filename (str): Original filename.
+            page_count (Optional[int]): Page count of a PDF if already known.
+        Returns:
+            Any: Structured resume data (ResumeData, or a dict from the cache or the OCR fallback).
+        """
+        cached = self.cache.get(sha256)
+        if cached is not None:
+            logger.info(f"Serving cached extraction for {filename}")
+            return json.loads(cached)
+
+        try:
+            # Try normal extraction first
+            extracted_data = await self.pool.extract(source, file_extension, filename, page_count)
+            logger.info(f"Successfully extracted content from {filename}")
+        except ExtractionTimeoutError:
+            raise
+        except Exception as e:
+            logger.warning(f"Standard extraction failed: {str(e)}. Falling back to OCR...")
+            # Fall back to OCR if standard extraction fails
+            extracted_data = await self.ocr_extract(source, file_extension, filename)
+        if extracted_data:
+            self.cache.set(sha256, json.dumps(jsonable_encoder(extracted_data)).encode("utf-8"))
+            # New documents feed the TF-IDF document frequencies, keyed by their raw text so that
+            # storing the same resume later does not count it again
+            raw_text = (extracted_data.get("rawText") if isinstance(extracted_data, dict)
+                        else getattr(extracted_data, "rawText", None))
+            if raw_text:
+                await run_in_threadpool(record_documents, [(document_key(raw_text), raw_text)])
+        return extracted_data
+
+    async def ocr_extract(self, source: DocumentSource, file_extension: str, filename: str) -> dict:
+        """
+        Extract content from a resume using OCR and the LLM extractor.
+        Args:
+            source (DocumentSource): File content as bytes, or the path of a spooled upload.
+            file_extension (str): File extension.
+            filename (str): Original filename.
+        Returns:
+            dict: Structured resume data.
+        """
+        try:
+            logger.info(f"Using OCR extraction for {filename}")
+            # Only pages without a text layer are rendered and recognized
+            text_content = await self.pool.ocr(source, file_extension)
+
+            # Use LLM to extract structured data from OCR text
+            structured_data = await run_in_threadpool(extract_structured_resume, text_content)
+            logger.info(f"Successfully extracted content using OCR from {filename}")
+            return structured_data
+        except Exception as e:
+            logger.error(f"OCR extraction failed: {str(e)}")
+            raise OcrExtractionError(f"OCR extraction failed: {str(e)}")
@@ -1,23 +1,82 @@
 """
 Resume content extraction module
-Handles PDF and DOCX file parsing using pdfplumber and docx2txt, and uses spaCy for NER.
+Handles PDF and DOCX file parsing using PyMuPDF, pdfplumber and an in-memory DOCX reader, and uses spaCy for NER,
+either in process or through the shared NER sidecar (NER_BACKEND=sidecar).
 """
 
-import pdfplumber
-import docx2txt
+import os
 import re
 import logging
-from typing import Dict, List, Optional, Any
+from typing import Dict, Iterable, List, Optional, Any
 from io import BytesIO
-import tempfile
-import os
-import spacy
-import fitz  # PyMuPDF
 
 from models import ResumeData, PersonalInfo, Experience, Education
+from uploads import DocumentSource, MAX_PDF_PAGES, open_pdf
+from docx_reader import read_docx_text
+from document import ParsedDocument, Entity, join_page_texts
+from taxonomy import get_taxonomy
+from date_ranges import find_date_ranges
+from contacts import scan_contacts
 
 logger = logging.getLogger(__name__)
-nlp = spacy.load("en_core_web_sm")
+
+# Bump whenever extraction logic changes so cached results from older versions are discarded.
+EXTRACTOR_VERSION = "5"
+
+# Only the NER component (and the tok2vec layer it reads) is needed; the other
+# pipeline components are not loaded at all.
+NER_EXCLUDED_COMPONENTS = ["tagger", "parser", "attribute_ruler", "lemmatizer", "senter"]
+NER_BATCH_SIZE = 32
+SPACY_MODEL = "en_core_web_sm"
+# local: spaCy runs in every extraction process; sidecar: one shared ner_service.py process does NER.
+NER_BACKEND = os.getenv("NER_BACKEND", "local").lower()
+
+_nlp = None
+_ner_client = None
+
+def get_nlp():
+    """
+    Get the spaCy pipeline, loading it on first use.
+    spaCy and the model take seconds to load, so importing this module does not load them;
+    extraction workers and the warm-up step call this ahead of the first request.
+    Returns:
+        spacy.Language: The NER pipeline.
+    """
+    global _nlp
+    if _nlp is None:
+        import spacy
+        _nlp = spacy.load(SPACY_MODEL, exclude=NER_EXCLUDED_COMPONENTS)
+    return _nlp
+
+def _get_ner_client():
+    global _ner_client
+    if _ner_client is None:
+        from ner_service import NerClient
+        _ner_client = NerClient()
+    return _ner_client
+
+def load_ner() -> None:
+    """Load the in-process spaCy pipeline, unless NER is served by the sidecar."""
+    if NER_BACKEND != "sidecar":
+        get_nlp()
+
+def recognize_entities(texts: List[str]) -> List[List[Entity]]:
+    """
+    Recognize named entities in texts with the configured NER backend.
+    If the sidecar is unavailable, the in-process pipeline is loaded and used instead.
+    Args:
+        texts (List[str]): Texts to annotate.
+    Returns:
+        List[List[Entity]]: Entities of each text, in order.
+    """
+    if NER_BACKEND == "sidecar":
+        from ner_service import NerServiceError
+        try:
+            return _get_ner_client().recognize(texts)
+        except NerServiceError as e:
+            logger.warning(f"NER sidecar failed: {str(e)}. Using the in-process model.")
+    from ner_service import recognize_locally
+    return recognize_locally(texts)
 
 def classify_resume_sections(text: str) -> dict:
     """
@@ -27,95 +86,40 @@ def classify_resume_sections(text: str) -> dict:
     Returns:
         dict: Mapping of section name to list of lines in that section.
     """
-    import re
-    section_headers = {
-        'experience': [r'experience', r'employment', r'work history', r'professional experience'],
-        'education': [r'education', r'academic background', r'qualifications'],
-        'skills': [r'skills', r'technical skills', r'core competencies'],
-        'projects': [r'projects', r'project experience'],
-        'summary': [r'summary', r'objective', r'profile', r'about', r'overview'],
-    }
-    section_map = {}
-    current_section = 'other'
-    section_map[current_section] = []
-    for line in text.splitlines():
-        line_stripped = line.strip().lower()
-        found_section = False
-        for section, patterns in section_headers.items():
-            for pat in patterns:
-                if re.fullmatch(rf'.*{pat}.*', line_stripped):
-                    current_section = section
-                    if current_section not in section_map:
-                        section_map[current_section] = []
-                    found_section = True
-                    break
-            if found_section:
-                break
-        section_map.setdefault(current_section, []).append(line)
-    return section_map
+    document = ParsedDocument(text)
+    return document.sections.to_dict(document.lines)
 
 def normalize_skill(skill: str) -> str:
     """
-    Normalize a skill to a standard name using a simple mapping (O*NET/ESCO style).
+    Normalize a skill to its canonical name in the skill taxonomy (O*NET/ESCO style).
     Args:
         skill (str): The extracted skill.
     Returns:
         str: Normalized skill name.
     """
-    # Example mapping (expand as needed)
-    mapping = {
-        'js': 'JavaScript',
-        'py': 'Python',
-        'ml': 'Machine Learning',
-        'ai': 'Artificial Intelligence',
-        'db': 'Databases',
-        'sql': 'SQL',
-        'pm': 'Project Management',
-        'nlp': 'Natural Language Processing',
-        'aws': 'Amazon Web Services',
-        'gcp': 'Google Cloud Platform',
-        'ms office': 'Microsoft Office',
-    }
-    skill_lower = skill.strip().lower()
-    return mapping.get(skill_lower, skill.strip())
+    return get_taxonomy().normalize_skill(skill)
 
 def normalize_job_title(title: str) -> str:
     """
-    Normalize a job title to a standard name using a simple mapping (O*NET/ESCO style).
+    Normalize a job title to its canonical name in the title taxonomy (O*NET/ESCO style).
     Args:
         title (str): The extracted job title.
     Returns:
         str: Normalized job title.
     """
-    mapping = {
-        'dev': 'Developer',
-        'software engineer': 'Software Engineer',
-        'data scientist': 'Data Scientist',
-        'pm': 'Project Manager',
-        'qa': 'Quality Assurance Engineer',
-        'ba': 'Business Analyst',
-        'frontend': 'Frontend Developer',
-        'backend': 'Backend Developer',
-    }
-    title_lower = title.strip().lower()
-    return mapping.get(title_lower, title.strip())
+    return get_taxonomy().normalize_title(title)
 
 class ResumeExtractor:
     """
     Resume content extractor for PDF and DOCX files.
     Extracts structured data using regex and spaCy NER.
     """
-    def __init__(self):
-        self.email_pattern = re.compile(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b')
-        self.phone_pattern = re.compile(r'(\+?\d{1,2}[-.\s]?)?(\(?\d{3}\)?[-.\s]?)?\d{3}[-.\s]?\d{4}')
-        self.linkedin_pattern = re.compile(r'linkedin\.com/in/[\w-]+', re.IGNORECASE)
-        self.url_pattern = re.compile(r'http[s]?://(?:[a-zA-Z]|[0-9]|[$-_@.&+]|[!*\$\$,]|(?:%[0-9a-fA-F][0-9a-fA-F]))+')
-
-    async def extract_content(self, file_content: bytes, file_extension: str, filename: str) -> ResumeData:
+    def extract(self, file_content: DocumentSource, file_extension: str, filename: str) -> ResumeData:
         """
         Extract content from resume file (PDF or DOCX).
+        Runs synchronously; the API calls it through the extraction process pool.
         Args:
-            file_content (bytes): File content as bytes.
+            file_content (DocumentSource): File content as bytes, or the path of a spooled upload.
             file_extension (str): File extension (pdf, docx).
             filename (str): Original filename.
         Returns:
@@ -123,83 +127,121 @@ class ResumeExtractor:
         """
         try:
             if file_extension.lower() == 'pdf':
-                raw_text = await self._extract_from_pdf(file_content)
+                raw_text = self._extract_from_pdf(file_content)
             elif file_extension.lower() in ['docx', 'doc']:
-                raw_text = await self._extract_from_docx(file_content)
+                raw_text = self._extract_from_docx(file_content)
             else:
                 raise ValueError(f"Unsupported file type: {file_extension}")
-            structured_data = await self._parse_resume_content(raw_text)
-            structured_data.rawText = raw_text
-            return structured_data
+            return self.parse_text(raw_text)
         except Exception as e:
             logger.error(f"Error extracting content from {filename}: {str(e)}")
             raise
 
-    async def _extract_from_pdf(self, file_content: bytes) -> str:
+    def parse_text(self, raw_text: str) -> ResumeData:
+        """
+        Parse structured resume data from already extracted text.
+        Args:
+            raw_text (str): Raw extracted text.
+        Returns:
+            ResumeData: Structured resume data.
+        """
+        structured_data = self._parse_resume_content(raw_text)
+        structured_data.rawText = raw_text
+        return structured_data
+
+    async def extract_content(self, file_content: DocumentSource, file_extension: str, filename: str) -> ResumeData:
         """
-        Extract text from PDF file using PyMuPDF (fitz) as primary, fallback to pdfplumber.
+        Extract content from resume file (PDF or DOCX) in the calling thread.
         Args:
-            file_content (bytes): PDF file content.
+            file_content (DocumentSource): File content as bytes, or the path of a spooled upload.
+            file_extension (str): File extension (pdf, docx).
+            filename (str): Original filename.
+        Returns:
+            ResumeData: Structured resume data.
+        """
+        return self.extract(file_content, file_extension, filename)
+
+    def _extract_from_pdf(self, file_content: DocumentSource) -> str:
+        """
+        Extract text from PDF file using PyMuPDF (fitz) per page, with pdfplumber for pages fitz cannot read.
+        Args:
+            file_content (DocumentSource): PDF file content or path.
         Returns:
             str: Extracted text.
         """
-        # Try PyMuPDF (fitz) first
+        raw_text = join_page_texts(self.extract_pdf_pages(file_content))
+        logger.info(f"Extracted {len(raw_text)} characters from PDF")
+        return raw_text
+
+    def extract_pdf_pages(self, file_content: DocumentSource, start: int = 0,
+                          stop: int = MAX_PDF_PAGES) -> List[str]:
+        """
+        Extract the text of a range of PDF pages.
+        Pages beyond MAX_PDF_PAGES are never read. pdfplumber is only run on the pages where
+        PyMuPDF produced no text, or on the whole range if PyMuPDF cannot open the file.
+        Args:
+            file_content (DocumentSource): PDF file content or path.
+            start (int): First page number.
+            stop (int): Page number after the last page.
+        Returns:
+            List[str]: Text of each page in the range.
+        """
+        stop = min(stop, MAX_PDF_PAGES)
         try:
-            text_content = []
-            with fitz.open(stream=file_content, filetype="pdf") as doc:
-                for page in doc:
-                    page_text = page.get_text("text")
-                    if page_text:
-                        text_content.append(page_text)
-            raw_text = '\n'.join(text_content)
-            if raw_text.strip():
-                logger.info(f"Extracted {len(raw_text)} characters from PDF using PyMuPDF (fitz)")
-                return raw_text
-            else:
-                logger.warning("PyMuPDF returned empty text, falling back to pdfplumber")
+            with open_pdf(file_content) as doc:
+                if doc.page_count > MAX_PDF_PAGES and start == 0:
+                    logger.warning(f"PDF has {doc.page_count} pages, only the first {MAX_PDF_PAGES} are extracted")
+                stop = min(stop, doc.page_count)
+                page_texts = [doc.load_page(i).get_text("text") for i in range(start, stop)]
         except Exception as e:
             logger.warning(f"PyMuPDF failed: {str(e)}. Falling back to pdfplumber.")
-        # Fallback to pdfplumber
+            return self._extract_pages_with_pdfplumber(file_content, range(start, stop))
+        empty_pages = [start + i for i, text in enumerate(page_texts) if not text.strip()]
+        if empty_pages:
+            logger.warning(f"PyMuPDF returned no text for {len(empty_pages)} pages, trying pdfplumber on them")
+            recovered = self._extract_pages_with_pdfplumber(file_content, empty_pages)
+            for page_number, text in zip(empty_pages, recovered):
+                page_texts[page_number - start] = text
+        return page_texts
+
+    def _extract_pages_with_pdfplumber(self, file_content: DocumentSource, page_numbers: Iterable[int]) -> List[str]:
+        """
+        Extract the text of selected PDF pages using pdfplumber.
+        Args:
+            file_content (DocumentSource): PDF file content or path.
+            page_numbers (Iterable[int]): Page numbers to extract; numbers past the end are skipped.
+        Returns:
+            List[str]: Text of each existing page, empty for pages without text.
+        """
         try:
             import pdfplumber
-            text_content = []
-            from io import BytesIO
-            with pdfplumber.open(BytesIO(file_content)) as pdf:
-                for page in pdf.pages:
-                    page_text = page.extract_text()
-                    if page_text:
-                        text_content.append(page_text)
-            raw_text = '\n'.join(text_content)
-            logger.info(f"Extracted {len(raw_text)} characters from PDF using pdfplumber")
-            return raw_text
+            pdf_input = file_content if isinstance(file_content, str) else BytesIO(file_content)
+            with pdfplumber.open(pdf_input) as pdf:
+                return [
+                    pdf.pages[page_number].extract_text() or ''
+                    for page_number in page_numbers if page_number < len(pdf.pages)
+                ]
         except Exception as e:
             logger.error(f"Error extracting PDF content with pdfplumber: {str(e)}")
             raise ValueError(f"Failed to extract PDF content: {str(e)}")
 
-    async def _extract_from_docx(self, file_content: bytes) -> str:
+    def _extract_from_docx(self, file_content: DocumentSource) -> str:
         """
-        Extract text from DOCX file using docx2txt.
+        Extract text from DOCX file by streaming its XML parts in memory.
         Args:
-            file_content (bytes): DOCX file content.
+            file_content (DocumentSource): DOCX file content or path.
         Returns:
             str: Extracted text.
         """
         try:
-            with tempfile.NamedTemporaryFile(delete=False, suffix='.docx') as temp_file:
-                temp_file.write(file_content)
-                temp_file_path = temp_file.name
-            try:
-                raw_text = docx2txt.process(temp_file_path)
-                logger.info(f"Extracted {len(raw_text)} characters from DOCX")
-                return raw_text
-            finally:
-                if os.path.exists(temp_file_path):
-                    os.unlink(temp_file_path)
+            raw_text = read_docx_text(file_content)
+            logger.info(f"Extracted {len(raw_text)} characters from DOCX")
+            return raw_text
         except Exception as e:
             logger.error(f"Error extracting DOCX content: {str(e)}")
             raise ValueError(f"Failed to extract DOCX content: {str(e)}")
 
-    async def _parse_resume_content(self, raw_text: str) -> ResumeData:
+    def _parse_resume_content(self, raw_text: str) -> ResumeData:
         """
         Parse structured data from raw text.
         Args:
@@ -208,11 +250,13 @@ class ResumeExtractor:
             ResumeData: Structured resume data.
         """
         try:
-            personal_info = await self._extract_personal_info(raw_text)
-            summary = await self._extract_summary(raw_text)
-            skills = await self._extract_skills(raw_text)
-            experience = await self._extract_experience(raw_text)
-            education = await self._extract_education(raw_text)
+            document = ParsedDocument(raw_text)
+            self._annotate_entities([document])
+            personal_info = self._extract_personal_info(document)
+            summary = self._extract_summary(document)
+            skills = self._extract_skills(document)
+            experience = self._extract_experience(document)
+            education = self._extract_education(document)
             return ResumeData(
                 personalInfo=personal_info,
                 summary=summary,
@@ -232,59 +276,58 @@ class ResumeExtractor:
                 rawText=raw_text
             )
 
-    async def _extract_personal_info(self, text: str) -> PersonalInfo:
+    def _annotate_entities(self, documents: List[ParsedDocument]) -> None:
         """
-        Extract personal information from text using spaCy NER for name extraction.
+        Run NER once per document, batching all documents through one `nlp.pipe` call,
+        in process or in the sidecar.
         Args:
-            text (str): Resume text.
+            documents (List[ParsedDocument]): Documents to annotate in place.
+        """
+        entities = recognize_entities([document.text for document in documents])
+        for document, document_entities in zip(documents, entities):
+            document.set_entities(document_entities)
+
+    def _extract_personal_info(self, document: ParsedDocument) -> PersonalInfo:
+        """
+        Extract personal information using one scan for all contact fields and spaCy NER for the name.
+        Args:
+            document (ParsedDocument): Parsed resume document.
         Returns:
             PersonalInfo: Extracted personal information.
         """
-        lines = text.split('\n')
-        email_match = self.email_pattern.search(text)
-        email = email_match.group() if email_match else ""
-        phone_match = self.phone_pattern.search(text)
-        phone = phone_match.group() if phone_match else None
-        linkedin_match = self.linkedin_pattern.search(text)
-        linkedin = f"https://{linkedin_match.group()}" if linkedin_match else None
-        doc = nlp(text)
-        name = ""
-        for ent in doc.ents:
-            if ent.label_ == "PERSON":
-                name = ent.text
-                break
+        text = document.text
+        contacts = scan_contacts(text)
+        person_entities = document.entities_in(0, len(text), "PERSON")
+        name = person_entities[0].text if person_entities else ""
         if not name:
-            for line in lines[:5]:
+            contact_spans = contacts.spans()
+            for line_number, line in enumerate(document.lines[:5]):
+                line_start, line_end = document.line_span(line_number)
+                if any(start < line_end and end > line_start for start, end in contact_spans):
+                    continue
                 line = line.strip()
-                if line and not self.email_pattern.search(line) and not self.phone_pattern.search(line):
-                    words = line.split()
-                    if 2 <= len(words) <= 4 and all(word.replace('.', '').isalpha() for word in words):
-                        name = line
-                        break
-        address = None
-        address_keywords = ['street', 'st', 'avenue', 'ave', 'road', 'rd', 'city', 'state']
-        for line in lines:
-            line_lower = line.lower()
-            if any(keyword in line_lower for keyword in address_keywords) and len(line.split()) > 2:
-                address = line.strip()
-                break
+                words = line.split()
+                if 2 <= len(words) <= 4 and all(word.replace('.', '').isalpha() for word in words):
+                    name = line
+                    break
         return PersonalInfo(
             fullName=name,
-            email=email,
-            phone=phone,
-            address=address,
-            linkedIn=linkedin
+            email=contacts.value("email") or "",
+            phone=contacts.value("phone"),
+            address=contacts.value("address"),
+            linkedIn=contacts.value("linkedin"),
+            website=contacts.value("website")
         )
 
-    async def _extract_summary(self, text: str) -> Optional[str]:
+    def _extract_summary(self, document: ParsedDocument) -> Optional[str]:
         """
         Extract professional summary/objective section.
         Args:
-            text (str): Resume text.
+            document (ParsedDocument): Parsed resume document.
         Returns:
             Optional[str]: Extracted summary or None.
         """
-        lines = text.split('\n')
+        lines = document.lines
         summary_keywords = ['summary', 'objective', 'profile', 'about', 'overview']
         summary_start = -1
         for i, line in enumerate(lines):
@@ -304,40 +347,43 @@ class ResumeExtractor:
                 return ' '.join(summary_lines)
         return None
 
-    async def _extract_experience(self, text: str) -> List[Experience]:
+    def _extract_experience(self, document: ParsedDocument) -> List[Experience]:
         """
-        Extract work experience from text using section classification and spaCy NER. Normalize job titles.
+        Extract work experience from text using section classification, spaCy NER for companies and the
+        rule-based date-range recognizer for dates. Normalize job titles.
         Args:
-            text (str): Resume text.
+            document (ParsedDocument): Parsed resume document.
         Returns:
             List[Experience]: List of extracted experiences with normalized job titles.
         """
         experience = []
-        sections = classify_resume_sections(text)
-        lines = sections.get('experience', [])
-        if not lines:
+        line_numbers = document.sections.line_numbers('experience')
+        if not line_numbers:
             return experience
-        exp_start = 0
         current_exp = None
-        for i in range(exp_start, len(lines)):
-            line = lines[i].strip()
+        for line_number in line_numbers:
+            line = document.lines[line_number].strip()
             if not line:
                 continue
-            doc = nlp(line)
             company = None
-            start_date = ''
-            end_date = ''
-            for ent in doc.ents:
-                if ent.label_ == "ORG" and not company:
-                    company = ent.text
-                if ent.label_ == "DATE":
-                    if not start_date:
-                        start_date = ent.text
-                    elif not end_date:
-                        end_date = ent.text
+            date_ranges = find_date_ranges(line)
+            date_range = date_ranges[0] if date_ranges else None
+            text = line
+            for found in reversed(date_ranges):
+                text = text[:found.span_start] + text[found.span_end:]
+            text = text.strip(' \t|,;()[]–—-')
+            if date_range and not text and current_exp and not current_exp.startDate:
+                # A line holding only the dates of the entry above it
+                current_exp.startDate = date_range.start
+                current_exp.endDate = date_range.end
+                current_exp.current = date_range.current
+                continue
+            for ent in document.entities_in(*document.line_span(line_number), label="ORG"):
+                company = ent.text
+                break
             position = None
-            if '-' in line:
-                parts = [p.strip() for p in line.split('-')]
+            if '-' in text:
+                parts = [p.strip() for p in text.split('-')]
                 if len(parts) >= 2:
                     position = normalize_job_title(parts[0])
                     if not company:
@@ -348,9 +394,9 @@ class ResumeExtractor:
             current_exp = Experience(
                 company=company or '',
                 position=position or '',
-                startDate=start_date,
-                endDate=end_date,
-                current=False,
+                startDate=date_range.start if date_range else '',
+                endDate=date_range.end if date_range else '',
+                current=date_range.current if date_range else False,
                 description=description,
                 achievements=[]
             )
@@ -358,23 +404,32 @@ class ResumeExtractor:
             experience.append(current_exp)
         return experience
 
-    async def _extract_education(self, text: str) -> List[Education]:
+    def _extract_education(self, document: ParsedDocument) -> List[Education]:
         """
-        Extract education information from text using section classification.
+        Extract education information from text using section classification and the date-range recognizer.
         Args:
-            text (str): Resume text.
+            document (ParsedDocument): Parsed resume document.
         Returns:
             List[Education]: List of extracted education entries.
         """
         education = []
-        sections = classify_resume_sections(text)
-        lines = sections.get('education', [])
+        lines = document.section_lines('education')
         if not lines:
             return education
         for line in lines:
             line = line.strip()
             if not line:
                 continue
+            date_ranges = find_date_ranges(line)
+            date_range = date_ranges[0] if date_ranges else None
+            for found in reversed(date_ranges):
+                line = line[:found.span_start] + line[found.span_end:]
+            line = line.strip(' \t|,;()[]–—-')
+            if date_range and not line and education and not education[-1].endDate:
+                # A line holding only the dates of the entry above it
+                education[-1].startDate = date_range.start if date_range.end else None
+                education[-1].endDate = date_range.end or date_range.start
+                continue
             degree = None
             institution = None
             field = None
@@ -393,24 +448,22 @@ class ResumeExtractor:
                 institution=institution or '',
                 degree=degree or '',
                 field=field or '',
-                endDate='',
+                startDate=date_range.start if date_range and date_range.end else None,
+                endDate=(date_range.end or date_range.start) if date_range else '',
             ))
         return education
 
-    async def _extract_skills(self, text: str) -> List[str]:
+    def _extract_skills(self, document: ParsedDocument) -> List[str]:
         """
-        Extract skills from text using section classification and normalize them.
+        Extract skills listed in the skills section, followed by taxonomy skills mentioned anywhere
+        else in the resume, normalized and without duplicates.
         Args:
-            text (str): Resume text.
+            document (ParsedDocument): Parsed resume document.
         Returns:
             List[str]: List of normalized extracted skills.
         """
         skills = []
-        sections = classify_resume_sections(text)
-        lines = sections.get('skills', [])
-        if not lines:
-            return skills
-        for line in lines:
+        for line in document.section_lines('skills'):
             line = line.strip()
             if line and not line.lower().startswith(('experience', 'education', 'work', 'employment')):
                 line_skills = re.split(r'[,;•·\|\n]', line)
@@ -418,4 +471,11 @@ class ResumeExtractor:
                     skill = skill.strip()
                     if skill and len(skill) > 1:
                         skills.append(normalize_skill(skill))
-        return skills[:20]
+        skills.extend(match.name for match in get_taxonomy().find_skills(document.text))
+        seen = set()
+        unique_skills = []
+        for skill in skills:
+            if skill.lower() not in seen:
+                seen.add(skill.lower())
+                unique_skills.append(skill)
+        return unique_skills[:20]
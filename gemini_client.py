@@ -6,20 +6,13 @@ import logging
 import os
 from typing import Dict, List, Optional
 from dotenv import load_dotenv
-from langchain_google_genai import ChatGoogleGenerativeAI
-from langchain_core.output_parsers import StrOutputParser
+from llm import get_text_chain
 from models import ResumeData, EnhancedResume, PersonalInfo, Experience, Education
 
 logger = logging.getLogger(__name__)
 load_dotenv()
 
 GEMINI_API_KEY = os.getenv('GEMINI_API_KEY')
-llm = ChatGoogleGenerativeAI(
-    model="gemini-1.0-pro",
-    temperature=0.7,
-    google_api_key=GEMINI_API_KEY
-)
-output_parser = StrOutputParser()
 
 def generate_response(prompt: str) -> str:
     """
@@ -30,7 +23,7 @@ def generate_response(prompt: str) -> str:
         str: The response text from Gemini.
     """
     try:
-        chain = llm | output_parser
+        chain = get_text_chain(0.7)
         response = chain.invoke(prompt)
         return response.strip() if response else ""
     except Exception as e:
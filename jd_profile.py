@@ -0,0 +1,183 @@
+"""
+Job description profiles
+Everything the ATS scoring derives from a job description alone (taxonomy skills, top keywords,
+TF-IDF vector and word set) is computed once per distinct job description and kept in an LRU
+cache keyed by the SHA-256 of its text, since recruiters score many resumes against one posting.
+Profiles are rebuilt when the taxonomy they were computed with is reloaded. A reloaded TF-IDF model
+(e.g. after an online document-frequency merge) only replaces their vector.
+"""
+
+import copy
+import hashlib
+import os
+import re
+import threading
+from collections import Counter, OrderedDict
+from typing import Dict, List, Optional
+
+from taxonomy import Taxonomy, get_taxonomy
+from tfidf_model import TfidfModel, get_tfidf_model
+
+JD_PROFILE_CACHE_SIZE = int(os.getenv("JD_PROFILE_CACHE_SIZE", "512"))
+
+# Keywords reported in the keyword density of a resume.
+TOP_KEYWORDS = 20
+
+WORD_PATTERN = re.compile(r'\b\w+\b')
+# Words left out of the plain word overlap used when TF-IDF scoring fails.
+STOP_WORDS = {'the', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for', 'of', 'with', 'by', 'is', 'are', 'was', 'were'}
+
+_analyzer = None
+
+
+def keyword_analyzer():
+    """
+    Tokenizer of the keyword density: lowercase words of two or more characters, without English stop words.
+    Returns:
+        Callable[[str], List[str]]: Stateless analyzer, created on first use.
+    """
+    global _analyzer
+    if _analyzer is None:
+        from sklearn.feature_extraction.text import CountVectorizer
+        _analyzer = CountVectorizer(stop_words='english').build_analyzer()
+    return _analyzer
+
+
+def job_description_digest(job_description: str) -> str:
+    """
+    Cache key of a job description.
+    Args:
+        job_description (str): Job description text.
+    Returns:
+        str: Hex SHA-256 of the text.
+    """
+    return hashlib.sha256(job_description.encode("utf-8")).hexdigest()
+
+
+class JobDescriptionProfile:
+    """Analysis of one job description shared by every resume scored against it."""
+    def __init__(self, job_description: str, taxonomy: Taxonomy, tfidf_model: TfidfModel,
+                 digest: Optional[str] = None):
+        self.text = job_description
+        self.digest = digest or job_description_digest(job_description)
+        self.lower = job_description.lower()
+        self.taxonomy = taxonomy
+        self.tfidf_model = tfidf_model
+        # Taxonomy skills named anywhere in the job description, in order of first mention
+        self.skills: List[str] = list(dict.fromkeys(match.name for match in taxonomy.find_skills(job_description)))
+        self.keywords: List[str] = self._top_keywords(job_description)
+        # L2-normalized TF-IDF vector (1 x n_features sparse matrix)
+        self.vector = tfidf_model.transform([job_description])
+        # Distinct lowercase words without common stop words, for the plain word overlap
+        self.words = set(WORD_PATTERN.findall(self.lower)) - STOP_WORDS
+
+    def with_tfidf_model(self, tfidf_model: TfidfModel) -> "JobDescriptionProfile":
+        """
+        Copy of the profile with its vector recomputed by another TF-IDF model; the rest is reused.
+        Args:
+            tfidf_model (TfidfModel): New model.
+        Returns:
+            JobDescriptionProfile: New profile; this one is left unchanged for requests still using it.
+        """
+        profile = copy.copy(self)
+        profile.tfidf_model = tfidf_model
+        profile.vector = tfidf_model.transform([self.text])
+        return profile
+
+    @staticmethod
+    def _top_keywords(job_description: str) -> List[str]:
+        from sklearn.feature_extraction.text import CountVectorizer
+        vectorizer = CountVectorizer(stop_words='english', max_features=TOP_KEYWORDS)
+        try:
+            vectorizer.fit([job_description])
+        except ValueError:
+            return []  # only stop words
+        return list(vectorizer.get_feature_names_out())
+
+    def keyword_density(self, resume_text: str) -> Dict[str, float]:
+        """
+        Share of each top keyword among the top keyword occurrences in a resume.
+        Args:
+            resume_text (str): Resume text.
+        Returns:
+            Dict[str, float]: Percentage per keyword found in the resume, in keyword order.
+        """
+        keywords = set(self.keywords)
+        counts = Counter(word for word in keyword_analyzer()(resume_text) if word in keywords)
+        total_words = sum(counts.values())
+        if not total_words:
+            return {}
+        return {word: round(counts[word] / total_words * 100, 1) for word in self.keywords if counts[word]}
+
+
+class JobDescriptionProfileCache:
+    """Least-recently-used cache of job description profiles, bounded by count."""
+    def __init__(self, max_entries: int = JD_PROFILE_CACHE_SIZE):
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries: 'OrderedDict[str, JobDescriptionProfile]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, job_description: str) -> JobDescriptionProfile:
+        """
+        Get the profile of a job description, building it on a miss.
+        Args:
+            job_description (str): Job description text.
+        Returns:
+            JobDescriptionProfile: Profile computed with the current taxonomy and TF-IDF model.
+        """
+        digest = job_description_digest(job_description)
+        taxonomy, tfidf_model = get_taxonomy(), get_tfidf_model()
+        with self._lock:
+            profile = self._entries.get(digest)
+            if profile is not None and profile.taxonomy is taxonomy and profile.tfidf_model is tfidf_model:
+                self._entries.move_to_end(digest)
+                self.hits += 1
+                return profile
+            self.misses += 1
+        # Built outside the lock; two requests missing on the same posting at once both build it
+        if profile is not None and profile.taxonomy is taxonomy:
+            profile = profile.with_tfidf_model(tfidf_model)
+        else:
+            profile = JobDescriptionProfile(job_description, taxonomy, tfidf_model, digest)
+        with self._lock:
+            self._entries[digest] = profile
+            self._entries.move_to_end(digest)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return profile
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Cache counters.
+        Returns:
+            Dict[str, int]: Entries, hits and misses.
+        """
+        return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses}
+
+
+_profiles = JobDescriptionProfileCache()
+
+
+def get_jd_profile(job_description: str) -> JobDescriptionProfile:
+    """
+    Get the cached profile of a job description.
+    Args:
+        job_description (str): Job description text.
+    Returns:
+        JobDescriptionProfile: Shared profile.
+    """
+    return _profiles.get(job_description)
+
+
+def jd_profile_cache_stats() -> Dict[str, int]:
+    """
+    Counters of the shared profile cache.
+    Returns:
+        Dict[str, int]: Entries, hits and misses.
+    """
+    return _profiles.stats()
@@ -0,0 +1,202 @@
+"""
+Job worker
+Pulls extraction, ATS scoring and enhancement jobs from the job broker and runs them, so that long
+OCR and LLM work happens outside the web workers. Any number of workers can run, on this node or on
+others sharing the broker; each runs up to --concurrency jobs at a time and stops gracefully on
+SIGTERM, letting running jobs finish.
+
+Usage: python job_worker.py [--concurrency N] [--kinds extract,ats-score,enhance]
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import signal
+import socket
+import time
+import uuid
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from fastapi.encoders import jsonable_encoder
+from pydantic import ValidationError
+
+from jobs import JOB_KINDS, JOB_LEASE, Job, JobBroker, PermanentJobError, create_broker
+from tfidf_model import update_model
+
+logger = logging.getLogger("job_worker")
+
+JOB_WORKER_CONCURRENCY = int(os.getenv("JOB_WORKER_CONCURRENCY", "2"))
+# Seconds an idle slot waits before polling the broker again.
+JOB_POLL_INTERVAL = float(os.getenv("JOB_POLL_INTERVAL", "1"))
+# Seconds between purges of expired and old finished jobs.
+JOB_PURGE_INTERVAL = float(os.getenv("JOB_PURGE_INTERVAL", "300"))
+
+
+class JobWorker:
+    """Runs jobs claimed from the broker in a fixed number of concurrent slots."""
+    def __init__(self, broker: JobBroker, concurrency: int = JOB_WORKER_CONCURRENCY,
+                 kinds: Optional[List[str]] = None, lease: float = JOB_LEASE):
+        self.broker = broker
+        self.concurrency = max(concurrency, 1)
+        self.kinds = list(kinds or JOB_KINDS)
+        self.lease = lease
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self.handlers: Dict[str, Callable[[Job], Awaitable[Any]]] = {
+            "extract": self._run_extract,
+            "ats-score": self._run_ats_score,
+            "enhance": self._run_enhance,
+        }
+        self._stopping: Optional[asyncio.Event] = None
+        self.extraction_pool = None
+        self.extraction_service = None
+        self.ats_scorer = None
+
+    def _load_services(self) -> None:
+        """Create the services used by the job kinds this worker handles."""
+        if "extract" in self.kinds:
+            from extraction_pool import ExtractionPool
+            from extraction_service import ExtractionService, create_extraction_cache
+            self.extraction_pool = ExtractionPool()
+            self.extraction_pool.start()
+            self.extraction_service = ExtractionService(self.extraction_pool, create_extraction_cache())
+        if "ats-score" in self.kinds:
+            from ats_score import ATSScorer
+            self.ats_scorer = ATSScorer()
+
+    async def _run_extract(self, job: Job) -> Any:
+        from extraction_pool import ExtractionTimeoutError
+        payload = job.payload
+        try:
+            return await self.extraction_service.extract(
+                job.data, payload["sha256"], payload["fileExtension"], payload["filename"],
+                payload.get("pageCount")
+            )
+        except ExtractionTimeoutError as e:
+            # The same file would time out again
+            raise PermanentJobError(f"Resume could not be processed in time: {str(e)}")
+
+    async def _run_ats_score(self, job: Job) -> Any:
+        from ats_report import build_ats_report
+        from models import ResumeData
+        try:
+            resume_data = ResumeData(**job.payload["resume_data"])
+        except ValidationError as e:
+            raise PermanentJobError(f"Invalid resume data: {str(e)}")
+        return await build_ats_report(self.ats_scorer, resume_data, job.payload["job_description"])
+
+    async def _run_enhance(self, job: Job) -> Any:
+        from langchain_enhancer import enhance_text
+        return await asyncio.to_thread(enhance_text, job.payload["text"], job.payload["context"])
+
+    async def _keep_lease(self, job: Job, handler: asyncio.Task) -> None:
+        """Renew the lease of a running job until cancelled; cancel the job's handler if the lease is lost."""
+        while True:
+            await asyncio.sleep(self.lease / 3)
+            if not await asyncio.to_thread(self.broker.renew, job.id, self.worker_id, self.lease):
+                logger.warning(f"Lost the lease of job {job.id}, cancelling it")
+                handler.cancel()
+                return
+
+    async def _process(self, job: Job) -> None:
+        started = time.perf_counter()
+        logger.info(f"Running {job.kind} job {job.id} (attempt {job.attempts}/{job.max_attempts})")
+        handler = asyncio.create_task(self.handlers[job.kind](job))
+        lease = asyncio.create_task(self._keep_lease(job, handler))
+        try:
+            result = jsonable_encoder(await handler)
+        except asyncio.CancelledError:
+            if not lease.done():
+                raise  # the worker itself is being cancelled
+            # Another worker took the job over; work running in a thread is abandoned, not stopped
+            logger.warning(f"Job {job.id} abandoned after {(time.perf_counter() - started) * 1000:.0f} ms")
+        except PermanentJobError as e:
+            logger.error(f"Job {job.id} failed: {str(e)}")
+            await self._record_failure(job, str(e), False)
+        except Exception as e:
+            logger.error(f"Job {job.id} attempt {job.attempts} failed: {str(e)}")
+            await self._record_failure(job, str(e), True)
+        else:
+            if await asyncio.to_thread(self.broker.complete, job.id, self.worker_id, result):
+                logger.info(f"Job {job.id} succeeded in {(time.perf_counter() - started) * 1000:.0f} ms")
+            else:
+                logger.warning(f"Result of job {job.id} dropped: the worker no longer holds the job")
+        finally:
+            lease.cancel()
+
+    async def _record_failure(self, job: Job, error: str, retry: bool) -> None:
+        if not await asyncio.to_thread(self.broker.fail, job.id, self.worker_id, error, retry):
+            logger.warning(f"Failure of job {job.id} dropped: the worker no longer holds the job")
+
+    async def _slot(self) -> None:
+        """Claim and run jobs one at a time until the worker stops."""
+        while not self._stopping.is_set():
+            try:
+                job = await asyncio.to_thread(self.broker.claim, self.worker_id, self.kinds, self.lease)
+            except Exception as e:
+                logger.error(f"Claiming a job failed: {str(e)}")
+                job = None
+            if job is None:
+                try:
+                    await asyncio.wait_for(self._stopping.wait(), JOB_POLL_INTERVAL)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+            await self._process(job)
+
+    async def _purge(self) -> None:
+        """Periodically expire overdue jobs and delete old finished ones."""
+        while not self._stopping.is_set():
+            try:
+                purged = await asyncio.to_thread(self.broker.purge)
+                if purged:
+                    logger.info(f"Purged {purged} finished jobs")
+            except Exception as e:
+                logger.error(f"Purging jobs failed: {str(e)}")
+            try:
+                await asyncio.wait_for(self._stopping.wait(), JOB_PURGE_INTERVAL)
+            except asyncio.TimeoutError:
+                pass
+
+    def stop(self) -> None:
+        """Stop claiming jobs; running jobs finish first."""
+        logger.info("Stopping job worker after running jobs finish")
+        self._stopping.set()
+
+    async def run(self) -> None:
+        """Run the slots until SIGTERM or SIGINT."""
+        self._stopping = asyncio.Event()
+        loop = asyncio.get_running_loop()
+        for signum in (signal.SIGTERM, signal.SIGINT):
+            loop.add_signal_handler(signum, self.stop)
+        self._load_services()
+        if self.extraction_pool is not None:
+            await self.extraction_pool.load_models()
+        logger.info(f"Job worker {self.worker_id} running {self.concurrency} slots for {', '.join(self.kinds)}")
+        try:
+            await asyncio.gather(self._purge(), *(self._slot() for _ in range(self.concurrency)))
+        finally:
+            if self.extraction_pool is not None:
+                self.extraction_pool.shutdown()
+            await asyncio.to_thread(update_model)
+        logger.info("Job worker stopped")
+
+
+def main() -> None:
+    """Parse the command line and run a worker."""
+    parser = argparse.ArgumentParser(description="Run resume processing jobs from the job queue.")
+    parser.add_argument("--concurrency", type=int, default=JOB_WORKER_CONCURRENCY,
+                        help="jobs run at the same time (default: JOB_WORKER_CONCURRENCY)")
+    parser.add_argument("--kinds", default=",".join(JOB_KINDS),
+                        help="comma-separated job kinds to run (default: all)")
+    args = parser.parse_args()
+    kinds = [kind.strip() for kind in args.kinds.split(",") if kind.strip()]
+    unknown = set(kinds) - set(JOB_KINDS)
+    if unknown:
+        parser.error(f"unknown job kinds: {', '.join(sorted(unknown))}")
+    asyncio.run(JobWorker(create_broker(), args.concurrency, kinds).run())
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+    main()
@@ -0,0 +1,382 @@
+"""
+Durable job queue
+Long-running extraction, ATS scoring and enhancement requests are submitted as jobs, stored by a
+broker and pulled by separate worker processes (see job_worker.py). Clients poll a job by id for
+its status and result. Jobs are retried with exponential backoff, a job whose worker died is
+picked up again once its lease runs out, and queued jobs expire when no worker reaches them in time.
+
+Brokers implement JobBroker; SqliteBroker keeps the queue in a SQLite file, which suits a single
+node or workers sharing a local volume. Other brokers are added to BROKERS and selected with JOB_BROKER.
+"""
+
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from abc import ABC, abstractmethod
+from typing import Any, Callable, Dict, List, NamedTuple, Optional
+
+logger = logging.getLogger(__name__)
+
+JOB_BROKER = os.getenv("JOB_BROKER", "sqlite")
+JOB_DB_PATH = os.getenv("JOB_DB_PATH", "data/jobs.db")
+# Attempts per job, including the first one.
+JOB_MAX_ATTEMPTS = int(os.getenv("JOB_MAX_ATTEMPTS", "3"))
+# Delay before the first retry in seconds; doubled for every further retry.
+JOB_RETRY_DELAY = float(os.getenv("JOB_RETRY_DELAY", "5"))
+# Seconds a queued job may wait for a worker before it expires.
+JOB_TTL = float(os.getenv("JOB_TTL", "3600"))
+# Seconds a worker holds a claimed job without renewing it before another worker may take it over.
+JOB_LEASE = float(os.getenv("JOB_LEASE", "120"))
+# Seconds finished jobs and their results are kept for polling.
+JOB_RESULT_TTL = float(os.getenv("JOB_RESULT_TTL", "86400"))
+
+JOB_KINDS = ("extract", "ats-score", "enhance")
+
+QUEUED = "queued"
+RUNNING = "running"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+EXPIRED = "expired"
+
+
+class PermanentJobError(Exception):
+    """Raised by a job handler for failures that a retry cannot fix, e.g. invalid input."""
+
+
+class Job(NamedTuple):
+    """A queued, running or finished job."""
+    id: str
+    kind: str
+    status: str
+    payload: Dict[str, Any]
+    result: Any
+    error: Optional[str]
+    attempts: int
+    max_attempts: int
+    created: float
+    updated: float
+    data: Optional[bytes] = None
+
+    def to_response(self) -> Dict[str, Any]:
+        """
+        Describe the job for API clients.
+        Returns:
+            Dict[str, Any]: jobId, kind, status, attempts, timestamps and the result or error.
+        """
+        response = {
+            "jobId": self.id,
+            "kind": self.kind,
+            "status": self.status,
+            "attempts": self.attempts,
+            "createdAt": self.created,
+            "updatedAt": self.updated,
+        }
+        if self.status == SUCCEEDED:
+            response["result"] = self.result
+        if self.error:
+            response["error"] = self.error
+        return response
+
+
+class JobBroker(ABC):
+    """Abstract job queue shared by the API (submit, get) and the workers (claim, complete, fail)."""
+
+    @abstractmethod
+    def submit(self, kind: str, payload: Dict[str, Any], data: Optional[bytes] = None,
+               max_attempts: int = JOB_MAX_ATTEMPTS, ttl: float = JOB_TTL) -> Job:
+        """
+        Queue a job.
+        Args:
+            kind (str): Job kind, one of JOB_KINDS.
+            payload (Dict[str, Any]): JSON-serializable job arguments.
+            data (Optional[bytes]): Binary input, e.g. an uploaded file.
+            max_attempts (int): Attempts before the job fails.
+            ttl (float): Seconds the job may stay queued before it expires.
+        Returns:
+            Job: The queued job.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def get(self, job_id: str) -> Optional[Job]:
+        """
+        Look up a job without its binary input.
+        Args:
+            job_id (str): Job id.
+        Returns:
+            Optional[Job]: The job, or None if unknown or purged.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def claim(self, worker_id: str, kinds: List[str], lease: float = JOB_LEASE) -> Optional[Job]:
+        """
+        Take the oldest runnable job of the given kinds.
+        Args:
+            worker_id (str): Id of the claiming worker.
+            kinds (List[str]): Job kinds the worker handles.
+            lease (float): Seconds until the job may be taken over unless renewed.
+        Returns:
+            Optional[Job]: The claimed job with its binary input, or None if nothing is runnable.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def renew(self, job_id: str, worker_id: str, lease: float = JOB_LEASE) -> bool:
+        """
+        Extend the lease of a running job.
+        Args:
+            job_id (str): Job id.
+            worker_id (str): Id of the worker holding the job.
+            lease (float): Seconds from now until the job may be taken over.
+        Returns:
+            bool: False if the worker no longer holds the job.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def complete(self, job_id: str, worker_id: str, result: Any) -> bool:
+        """
+        Store the result of a job.
+        Args:
+            job_id (str): Job id.
+            worker_id (str): Id of the worker holding the job.
+            result (Any): JSON-serializable result.
+        Returns:
+            bool: False if the worker no longer holds the job.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def fail(self, job_id: str, worker_id: str, error: str, retry: bool = True) -> bool:
+        """
+        Record a failed attempt, queueing a retry while attempts remain.
+        Args:
+            job_id (str): Job id.
+            worker_id (str): Id of the worker holding the job.
+            error (str): Error message shown to clients.
+            retry (bool): False for permanent failures.
+        Returns:
+            bool: False if the worker no longer holds the job.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def purge(self, result_ttl: float = JOB_RESULT_TTL) -> int:
+        """
+        Expire overdue queued jobs and delete finished jobs older than result_ttl.
+        Args:
+            result_ttl (float): Seconds finished jobs are kept.
+        Returns:
+            int: Number of deleted jobs.
+        """
+        raise NotImplementedError
+
+
+class SqliteBroker(JobBroker):
+    """
+    Job queue in a SQLite file. Safe to share between threads and between processes using the same
+    file; claims run in an immediate transaction so two workers never take the same job.
+    """
+    _columns = "id, kind, status, payload, result, error, attempts, max_attempts, created, updated"
+
+    def __init__(self, path: str = JOB_DB_PATH):
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self._pid = None
+        conn = self._conn
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS jobs ("
+            "id TEXT PRIMARY KEY, kind TEXT NOT NULL, status TEXT NOT NULL, "
+            "payload TEXT NOT NULL, data BLOB, result TEXT, error TEXT, "
+            "attempts INTEGER NOT NULL DEFAULT 0, max_attempts INTEGER NOT NULL, "
+            "created REAL NOT NULL, updated REAL NOT NULL, available_at REAL NOT NULL, "
+            "expires_at REAL NOT NULL, lease_until REAL, worker TEXT)"
+        )
+        conn.execute("CREATE INDEX IF NOT EXISTS jobs_runnable ON jobs (status, available_at)")
+
+    @property
+    def _conn(self) -> sqlite3.Connection:
+        """Connection of the current process; a connection inherited through fork is never reused."""
+        if self._pid != os.getpid():
+            self._connection = sqlite3.connect(self.path, timeout=30, check_same_thread=False, isolation_level=None)
+            self._pid = os.getpid()
+        return self._connection
+
+    @staticmethod
+    def _to_job(row, data: Optional[bytes] = None) -> Job:
+        job_id, kind, job_status, payload, result, error, attempts, max_attempts, created, updated = row
+        return Job(
+            id=job_id, kind=kind, status=job_status, payload=json.loads(payload),
+            result=json.loads(result) if result is not None else None, error=error,
+            attempts=attempts, max_attempts=max_attempts, created=created, updated=updated, data=data,
+        )
+
+    def submit(self, kind: str, payload: Dict[str, Any], data: Optional[bytes] = None,
+               max_attempts: int = JOB_MAX_ATTEMPTS, ttl: float = JOB_TTL) -> Job:
+        now = time.time()
+        job = Job(
+            id=uuid.uuid4().hex, kind=kind, status=QUEUED, payload=payload, result=None, error=None,
+            attempts=0, max_attempts=max(max_attempts, 1), created=now, updated=now,
+        )
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO jobs (id, kind, status, payload, data, attempts, max_attempts, "
+                "created, updated, available_at, expires_at) VALUES (?, ?, ?, ?, ?, 0, ?, ?, ?, ?, ?)",
+                (job.id, kind, QUEUED, json.dumps(payload), sqlite3.Binary(data) if data is not None else None,
+                 job.max_attempts, now, now, now, now + ttl)
+            )
+        return job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        with self._lock:
+            row = self._conn.execute(
+                f"SELECT {self._columns}, expires_at FROM jobs WHERE id = ?", (job_id,)
+            ).fetchone()
+        if row is None:
+            return None
+        job = self._to_job(row[:10])
+        if job.status == QUEUED and row[10] <= time.time():
+            # Not yet marked by a purge
+            job = job._replace(status=EXPIRED, error="Job expired before a worker picked it up")
+        return job
+
+    def claim(self, worker_id: str, kinds: List[str], lease: float = JOB_LEASE) -> Optional[Job]:
+        placeholders = ", ".join("?" * len(kinds))
+        with self._lock:
+            conn = self._conn
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                while True:
+                    now = time.time()
+                    row = conn.execute(
+                        f"SELECT {self._columns}, data FROM jobs WHERE kind IN ({placeholders}) AND "
+                        "((status = ? AND available_at <= ? AND expires_at > ?) OR (status = ? AND lease_until < ?)) "
+                        "ORDER BY available_at LIMIT 1",
+                        (*kinds, QUEUED, now, now, RUNNING, now)
+                    ).fetchone()
+                    if row is None:
+                        conn.execute("COMMIT")
+                        return None
+                    job_id, job_status, attempts, max_attempts = row[0], row[2], row[6], row[7]
+                    if job_status == RUNNING and attempts >= max_attempts:
+                        # The worker holding the last attempt died or stalled
+                        conn.execute(
+                            "UPDATE jobs SET status = ?, error = ?, data = NULL, updated = ? WHERE id = ?",
+                            (FAILED, "Worker stopped responding", now, job_id)
+                        )
+                        continue
+                    if job_status == RUNNING:
+                        logger.warning(f"Job {job_id} lease expired, taking it over")
+                    conn.execute(
+                        "UPDATE jobs SET status = ?, attempts = attempts + 1, worker = ?, lease_until = ?, "
+                        "updated = ? WHERE id = ?",
+                        (RUNNING, worker_id, now + lease, now, job_id)
+                    )
+                    conn.execute("COMMIT")
+                    job = self._to_job(row[:10], bytes(row[10]) if row[10] is not None else None)
+                    return job._replace(status=RUNNING, attempts=attempts + 1, updated=now)
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+
+    def renew(self, job_id: str, worker_id: str, lease: float = JOB_LEASE) -> bool:
+        with self._lock:
+            cursor = self._conn.execute(
+                "UPDATE jobs SET lease_until = ? WHERE id = ? AND worker = ? AND status = ?",
+                (time.time() + lease, job_id, worker_id, RUNNING)
+            )
+            return cursor.rowcount > 0
+
+    def complete(self, job_id: str, worker_id: str, result: Any) -> bool:
+        with self._lock:
+            cursor = self._conn.execute(
+                "UPDATE jobs SET status = ?, result = ?, error = NULL, data = NULL, updated = ? "
+                "WHERE id = ? AND worker = ? AND status = ?",
+                (SUCCEEDED, json.dumps(result), time.time(), job_id, worker_id, RUNNING)
+            )
+            return cursor.rowcount > 0
+
+    def fail(self, job_id: str, worker_id: str, error: str, retry: bool = True) -> bool:
+        with self._lock:
+            conn = self._conn
+            row = conn.execute(
+                "SELECT attempts, max_attempts FROM jobs WHERE id = ? AND worker = ? AND status = ?",
+                (job_id, worker_id, RUNNING)
+            ).fetchone()
+            if row is None:
+                return False
+            attempts, max_attempts = row
+            now = time.time()
+            if retry and attempts < max_attempts:
+                delay = JOB_RETRY_DELAY * 2 ** (attempts - 1)
+                conn.execute(
+                    "UPDATE jobs SET status = ?, error = ?, available_at = ?, expires_at = MAX(expires_at, ?), "
+                    "lease_until = NULL, updated = ? WHERE id = ?",
+                    (QUEUED, error, now + delay, now + delay + JOB_TTL, now, job_id)
+                )
+                logger.info(f"Job {job_id} failed attempt {attempts}, retrying in {delay:.0f}s")
+            else:
+                conn.execute(
+                    "UPDATE jobs SET status = ?, error = ?, data = NULL, lease_until = NULL, updated = ? WHERE id = ?",
+                    (FAILED, error, now, job_id)
+                )
+            return True
+
+    def purge(self, result_ttl: float = JOB_RESULT_TTL) -> int:
+        now = time.time()
+        with self._lock:
+            expired = self._conn.execute(
+                "UPDATE jobs SET status = ?, error = ?, data = NULL, updated = ? WHERE status = ? AND expires_at <= ?",
+                (EXPIRED, "Job expired before a worker picked it up", now, QUEUED, now)
+            ).rowcount
+            if expired:
+                logger.info(f"Expired {expired} queued jobs")
+            return self._conn.execute(
+                "DELETE FROM jobs WHERE status IN (?, ?, ?) AND updated < ?",
+                (SUCCEEDED, FAILED, EXPIRED, now - result_ttl)
+            ).rowcount
+
+
+BROKERS: Dict[str, Callable[[], JobBroker]] = {
+    "sqlite": SqliteBroker,
+}
+
+
+def create_broker(name: str = JOB_BROKER) -> JobBroker:
+    """
+    Create the configured job broker.
+    Args:
+        name (str): Broker name, a key of BROKERS.
+    Returns:
+        JobBroker: The broker.
+    """
+    if name not in BROKERS:
+        raise ValueError(f"Unknown job broker '{name}', expected one of {', '.join(BROKERS)}")
+    return BROKERS[name]()
+
+
+_broker: Optional[JobBroker] = None
+_broker_lock = threading.Lock()
+
+
+def get_broker() -> JobBroker:
+    """
+    Get the broker shared by the API handlers, creating it (and its queue file) on first use.
+    Returns:
+        JobBroker: The configured broker.
+    """
+    global _broker
+    if _broker is None:
+        with _broker_lock:
+            if _broker is None:
+                _broker = create_broker()
+    return _broker
@@ -1,10 +1,11 @@
-from langchain_google_genai import ChatGoogleGenerativeAI
-from langchain.prompts import PromptTemplate
-from langchain_core.output_parsers import StrOutputParser
 import os
 from dotenv import load_dotenv
 import logging
-from typing import Optional
+from functools import lru_cache
+import json
+from typing import Any, Dict, Optional
+
+from llm import get_llm, get_output_parser, get_text_chain
 
 # Load your Google API key from environment variables
 load_dotenv()
@@ -12,16 +13,7 @@ GOOGLE_API_KEY = os.getenv("GEMINI_API_KEY")
 
 logger = logging.getLogger(__name__)
 
-llm = ChatGoogleGenerativeAI(
-    model="gemini-1.0-pro",
-    temperature=0.7,
-    google_api_key=GOOGLE_API_KEY
-)
-output_parser = StrOutputParser()
-
-resume_prompt = PromptTemplate(
-    input_variables=["raw_resume", "job_description"],
-    template="""
+RESUME_PROMPT_TEMPLATE = """
 You are an expert resume enhancer AI. Improve the following resume by aligning it with the given job description.
 
 Resume:
@@ -32,7 +24,19 @@ Job Description:
 
 Return the enhanced resume only in clean bullet-point format. Make it concise, modern, and highly relevant to the job.
 """
-)
+
+@lru_cache(maxsize=None)
+def get_resume_prompt():
+    """
+    Build the resume enhancement prompt on first use.
+    Returns:
+        PromptTemplate: Prompt taking raw_resume and job_description.
+    """
+    from langchain.prompts import PromptTemplate
+    return PromptTemplate(
+        input_variables=["raw_resume", "job_description"],
+        template=RESUME_PROMPT_TEMPLATE
+    )
 
 def enhance_resume(raw_resume: str, job_description: str) -> str:
     """
@@ -44,7 +48,7 @@ def enhance_resume(raw_resume: str, job_description: str) -> str:
         str: The enhanced resume text.
     """
     try:
-        chain = resume_prompt | llm | output_parser
+        chain = get_resume_prompt() | get_llm(0.7) | get_output_parser()
         enhanced_text = chain.invoke({
             "raw_resume": raw_resume,
             "job_description": job_description
@@ -53,3 +57,46 @@ def enhance_resume(raw_resume: str, job_description: str) -> str:
     except Exception as e:
         logger.error(f"Error enhancing resume: {str(e)}")
         return ""
+
+def enhance_text(text: str, context: str = "professional resume") -> Dict[str, Any]:
+    """
+    Enhance a piece of resume text with Gemini and list the improvements made.
+    Args:
+        text (str): Text to enhance.
+        context (str): What the text is for, e.g. "professional resume".
+    Returns:
+        Dict[str, Any]: enhancedText, originalText and improvements.
+    """
+    prompt = (
+        f"You are a professional resume writer. Enhance the following text to make it more impactful, "
+        f"professional, and effective for a {context}. Use strong action verbs, quantify achievements "
+        f"where possible, and maintain a professional tone. Keep the same general information but make it more compelling.\n\n"
+        f"Text to enhance: {text}\n\n"
+        f"Enhanced version:"
+    )
+
+    chain = get_text_chain(0.7)
+    enhanced_text = chain.invoke(prompt)
+
+    # Generate improvements list
+    improvements_prompt = (
+        f"Based on the original text and your enhanced version, list 3-5 specific improvements you made. "
+        f"Format as a JSON array of strings.\n\n"
+        f"Original: {text}\n\n"
+        f"Enhanced: {enhanced_text}\n\n"
+        f"Improvements:"
+    )
+
+    improvements_chain = get_text_chain(0.7)
+    improvements_text = improvements_chain.invoke(improvements_prompt)
+
+    try:
+        improvements = json.loads(improvements_text)
+    except:
+        improvements = ["Improved professional language", "Added impact statements", "Enhanced clarity"]
+
+    return {
+        "enhancedText": enhanced_text,
+        "originalText": text,
+        "improvements": improvements
+    }
@@ -0,0 +1,52 @@
+"""
+Shared Gemini chat model factory.
+LangChain and the Google client are imported and configured on first use, and one client is
+shared per temperature, so importing the service stays cheap and no module builds its own client.
+"""
+import os
+from functools import lru_cache
+from dotenv import load_dotenv
+
+load_dotenv()
+
+GEMINI_API_KEY = os.getenv('GEMINI_API_KEY')
+GEMINI_MODEL = os.getenv('GEMINI_MODEL', 'gemini-1.0-pro')
+
+
+@lru_cache(maxsize=None)
+def get_llm(temperature: float = 0.7):
+    """
+    Get the shared Gemini chat model for a sampling temperature.
+    Args:
+        temperature (float): Sampling temperature.
+    Returns:
+        ChatGoogleGenerativeAI: The chat model.
+    """
+    from langchain_google_genai import ChatGoogleGenerativeAI
+    return ChatGoogleGenerativeAI(
+        model=GEMINI_MODEL,
+        temperature=temperature,
+        google_api_key=GEMINI_API_KEY
+    )
+
+
+@lru_cache(maxsize=None)
+def get_output_parser():
+    """
+    Get the shared string output parser.
+    Returns:
+        StrOutputParser: Parser returning the model output as text.
+    """
+    from langchain_core.output_parsers import StrOutputParser
+    return StrOutputParser()
+
+
+def get_text_chain(temperature: float = 0.7):
+    """
+    Get a chain that sends a prompt to Gemini and returns the response text.
+    Args:
+        temperature (float): Sampling temperature.
+    Returns:
+        Runnable: The model piped into the string output parser.
+    """
+    return get_llm(temperature) | get_output_parser()
@@ -2,25 +2,15 @@
 LLM-based structured resume extraction using Gemini via LangChain.
 Extracts all key fields from raw resume text in a single prompt.
 """
-import os
 import json
 import logging
 from typing import Dict
 from dotenv import load_dotenv
-from langchain_google_genai import ChatGoogleGenerativeAI
-from langchain_core.output_parsers import StrOutputParser
+from llm import get_text_chain
 
 logger = logging.getLogger(__name__)
 load_dotenv()
 
-GEMINI_API_KEY = os.getenv('GEMINI_API_KEY')
-llm = ChatGoogleGenerativeAI(
-    model="gemini-1.0-pro",
-    temperature=0.3,
-    google_api_key=GEMINI_API_KEY
-)
-output_parser = StrOutputParser()
-
 def extract_structured_resume(raw_resume_text: str) -> Dict:
     """
     Extract structured resume data from raw text using Gemini LLM.
@@ -38,7 +28,7 @@ def extract_structured_resume(raw_resume_text: str) -> Dict:
         "Return only the JSON object, no extra text."
     )
     try:
-        chain = llm | output_parser
+        chain = get_text_chain(0.3)
         response = chain.invoke(prompt)
         data = json.loads(response)
         return data
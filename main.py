@@ -3,26 +3,45 @@ FastAPI Resume Processing Microservice
 Handles AI-powered resume enhancement, content extraction, and ATS scoring.
 """
 
+import time
+IMPORT_STARTED = time.perf_counter()
+
 from fastapi import FastAPI, File, UploadFile, HTTPException, Body, status
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse, StreamingResponse
 from fastapi.exceptions import RequestValidationError
+from starlette.concurrency import run_in_threadpool
 from starlette.requests import Request
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, ValidationError
 from typing import List, Optional, Dict, Any
+import asyncio
+import json
 import logging
 import os
+import zipfile
 from dotenv import load_dotenv
 import uvicorn
 
-from langchain_enhancer import enhance_resume
-from extractor import ResumeExtractor
-from ats_score import ATSScorer
+from langchain_enhancer import enhance_resume, enhance_text
+from ats_report import build_ats_report
+from extraction_pool import ExtractionPool, ExtractionTimeoutError
+from extraction_service import ExtractionService, OcrExtractionError, create_extraction_cache
+from uploads import (
+    DocumentSource, MAX_BATCH_FILES, MAX_BATCH_UPLOAD_SIZE, MAX_FILE_SIZE, UploadRejected, ZipMemberReader,
+    list_zip_resumes, spool_upload,
+)
+from ats_score import ATSScorer, resume_to_text
+from ats_batch import BatchATSScorer
 from gemini_client import GeminiClient
 from models import ResumeData, PersonalInfo, Experience, Education, ATSScore, ATSFeedback, EnhancedResume
-from llm_extractor import extract_structured_resume
-from langchain_google_genai import ChatGoogleGenerativeAI
-from langchain_core.output_parsers import StrOutputParser
+from warmup import Readiness, prepare_service
+from jobs import get_broker
+from taxonomy import get_taxonomy, reload_taxonomy
+from jd_profile import jd_profile_cache_stats
+from resume_index import get_resume_store
+from posting_index import get_posting_index
+from tfidf_model import update_model
 
 # Load environment variables
 load_dotenv()
@@ -53,17 +72,20 @@ app.add_middleware(
 )
 
 # Initialize services
-resume_extractor = ResumeExtractor()
+extraction_pool = ExtractionPool()
+extraction_cache = create_extraction_cache()
+extraction_service = ExtractionService(extraction_pool, extraction_cache)
+# Resumes of one /extract/batch request extracted at the same time.
+EXTRACT_BATCH_CONCURRENCY = int(os.getenv("EXTRACT_BATCH_CONCURRENCY", "4"))
+# Job descriptions accepted by one /ats-score/multi request.
+MAX_MULTI_JOB_DESCRIPTIONS = int(os.getenv("MAX_MULTI_JOB_DESCRIPTIONS", "100"))
+# Resumes returned by one /rank request.
+MAX_RANK_RESULTS = int(os.getenv("MAX_RANK_RESULTS", "200"))
 ats_scorer = ATSScorer()
+batch_ats_scorer = BatchATSScorer(ats_scorer)
 gemini_client = GeminiClient()
-
-# LLM setup for new endpoints
-llm = ChatGoogleGenerativeAI(
-    model="gemini-1.0-pro",
-    temperature=0.7,
-    google_api_key=os.getenv("GEMINI_API_KEY")
-)
-output_parser = StrOutputParser()
+readiness = Readiness()
+_startup_tasks = set()
 
 class EnhanceRequest(BaseModel):
     """Request model for resume enhancement."""
@@ -75,15 +97,127 @@ class ATSRequest(BaseModel):
     resume_data: dict
     job_description: str
 
+class ATSMultiRequest(BaseModel):
+    """Request model for scoring one resume against many job descriptions."""
+    resume_data: dict
+    job_descriptions: List[str] = Field(..., min_length=1, max_length=MAX_MULTI_JOB_DESCRIPTIONS)
+
+class StoreResumeRequest(BaseModel):
+    """Request model for adding a resume to the searchable corpus."""
+    resume_data: dict
+    resume_id: Optional[str] = None
+
+class RankRequest(BaseModel):
+    """Request model for ranking stored resumes against a job description."""
+    job_description: str
+    k: int = Field(50, ge=1, le=MAX_RANK_RESULTS)
+
+class NearestPostingsRequest(BaseModel):
+    """Request model for finding the job postings closest to a resume."""
+    resume_data: dict
+    k: int = Field(10, ge=1, le=MAX_RANK_RESULTS)
+
 class OCRRequest(BaseModel):
     """Request model for OCR extraction."""
     image_url: str
 
+class UploadSizeLimitMiddleware:
+    """
+    Reject oversized uploads to the extraction endpoints from the Content-Length header before the body is read.
+    A plain ASGI middleware rather than @app.middleware("http"), which wraps every response and
+    keeps uvicorn's request counter (used for worker recycling) from advancing.
+    """
+    limits = {"/extract": MAX_FILE_SIZE, "/extract/batch": MAX_BATCH_UPLOAD_SIZE, "/jobs/extract": MAX_FILE_SIZE}
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        limit = self.limits.get(scope["path"]) if scope["type"] == "http" else None
+        if limit is not None:
+            content_length = dict(scope["headers"]).get(b"content-length", b"")
+            # Allow some room for the multipart envelope around the file
+            if content_length.isdigit() and int(content_length) > limit + 64 * 1024:
+                response = JSONResponse(
+                    status_code=413,
+                    content={"error": f"Upload exceeds the maximum size of {limit} bytes", "status_code": 413}
+                )
+                await response(scope, receive, send)
+                return
+        await self.app(scope, receive, send)
+
+app.add_middleware(UploadSizeLimitMiddleware)
+
+@app.on_event("startup")
+async def start_extraction_pool() -> None:
+    """Start the extraction worker processes and load models in the background."""
+    readiness.record("import", IMPORT_STARTED)
+    extraction_pool.start()
+    task = asyncio.create_task(prepare_service(extraction_pool, ats_scorer, readiness))
+    _startup_tasks.add(task)
+    task.add_done_callback(_startup_tasks.discard)
+
+@app.on_event("shutdown")
+async def stop_extraction_pool() -> None:
+    """Stop the extraction worker processes and save the recorded TF-IDF documents."""
+    extraction_pool.shutdown()
+    await run_in_threadpool(update_model)
+
 @app.get("/health")
 async def health_check() -> Dict[str, str]:
     """Health check endpoint."""
     return {"status": "healthy", "service": "Resume Processing AI Service"}
 
+@app.get("/ready")
+async def readiness_check() -> JSONResponse:
+    """Readiness check: 200 once models are loaded (and warm-up has run, if enabled), 503 before."""
+    return JSONResponse(status_code=200 if readiness.ready else 503, content=readiness.status())
+
+def get_file_extension(filename: Optional[str]) -> str:
+    """
+    Validate a resume filename and return its extension.
+    Args:
+        filename (Optional[str]): Uploaded filename.
+    Returns:
+        str: Lower-case extension (pdf, docx or doc).
+    """
+    if not filename:
+        raise HTTPException(status_code=400, detail="No filename provided")
+    file_extension = filename.lower().split('.')[-1]
+    if file_extension not in ['pdf', 'docx', 'doc']:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unsupported file type: {file_extension}. Only PDF and DOCX files are supported."
+        )
+    return file_extension
+
+async def extract_uploaded_resume(file, file_extension: str, filename: str) -> Any:
+    """
+    Spool an uploaded resume and extract its content, serving repeated files from the cache.
+    Args:
+        file: Uploaded file with an async `read(size)` method (UploadFile or ZipMemberReader).
+        file_extension (str): Validated file extension.
+        filename (str): Original filename.
+    Returns:
+        Any: Structured resume data (ResumeData, or a dict from the cache or the OCR fallback).
+    """
+    try:
+        upload = await spool_upload(file, file_extension)
+    except UploadRejected as e:
+        raise HTTPException(status_code=e.status_code, detail=e.detail)
+    
+    try:
+        # Identical uploads are served from the cache keyed by the file's SHA-256
+        return await extraction_service.extract(
+            upload.source, upload.sha256, file_extension, filename, upload.page_count
+        )
+    except ExtractionTimeoutError as e:
+        raise HTTPException(status_code=422, detail=f"Resume could not be processed in time: {str(e)}")
+    except OcrExtractionError as e:
+        raise HTTPException(status_code=500, detail=str(e))
+    finally:
+        upload.close()
+
 @app.post("/extract")
 async def extract_resume(file: UploadFile = File(...)) -> dict:
     """
@@ -95,81 +229,101 @@ async def extract_resume(file: UploadFile = File(...)) -> dict:
     """
     try:
         logger.info(f"Processing file upload: {file.filename}")
-        if not file.filename:
-            raise HTTPException(status_code=400, detail="No filename provided")
-        file_extension = file.filename.lower().split('.')[-1]
-        if file_extension not in ['pdf', 'docx', 'doc']:
-            raise HTTPException(
-                status_code=400,
-                detail=f"Unsupported file type: {file_extension}. Only PDF and DOCX files are supported."
-            )
-        file_content = await file.read()
-        
-        try:
-            # Try normal extraction first
-            extracted_data = await resume_extractor.extract_content(file_content, file_extension, file.filename)
-            logger.info(f"Successfully extracted content from {file.filename}")
-            return extracted_data
-        except Exception as e:
-            logger.warning(f"Standard extraction failed: {str(e)}. Falling back to OCR...")
-            # Fall back to OCR if standard extraction fails
-            return await ocr_extract(file_content, file_extension, file.filename)
+        file_extension = get_file_extension(file.filename)
+        return await extract_uploaded_resume(file, file_extension, file.filename)
     except HTTPException:
         raise
     except Exception as e:
         logger.error(f"Error extracting resume content: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Failed to extract resume content: {str(e)}")
 
+@app.post("/extract/batch")
+async def extract_resume_batch(files: List[UploadFile] = File(...)) -> StreamingResponse:
+    """
+    Extract content from many resumes, given as several files and/or ZIP archives of files.
+    Resumes are extracted concurrently, at most EXTRACT_BATCH_CONCURRENCY at a time, and one
+    NDJSON line is streamed per resume as soon as it finishes, in completion order. A failed
+    resume produces an error line instead of failing the batch.
+    Args:
+        files (List[UploadFile]): Resume files (PDF, DOCX) and ZIP archives.
+    Returns:
+        StreamingResponse: application/x-ndjson lines with index, filename, status and either
+            data or error and statusCode.
+    """
+    archives = []
+    items = []  # (filename, UploadFile or (archive, ZipInfo))
+    try:
+        for file in files:
+            filename = file.filename or ""
+            if filename.lower().endswith(".zip"):
+                try:
+                    archive = await run_in_threadpool(zipfile.ZipFile, file.file)
+                except zipfile.BadZipFile:
+                    raise HTTPException(status_code=400, detail=f"{filename} is not a valid ZIP archive")
+                archives.append(archive)
+                items.extend((info.filename, (archive, info)) for info in list_zip_resumes(archive))
+            else:
+                items.append((filename, file))
+        if len(items) > MAX_BATCH_FILES:
+            raise HTTPException(status_code=413, detail=f"Batch has {len(items)} files; the maximum is {MAX_BATCH_FILES}")
+    except Exception:
+        for archive in archives:
+            archive.close()
+        raise
+    logger.info(f"Processing batch of {len(items)} resumes")
+    semaphore = asyncio.Semaphore(EXTRACT_BATCH_CONCURRENCY)
+
+    async def process(index: int, filename: str, source) -> Dict[str, Any]:
+        async with semaphore:
+            line = {"index": index, "filename": filename}
+            reader = None
+            try:
+                file_extension = get_file_extension(filename)
+                reader = ZipMemberReader(*source) if isinstance(source, tuple) else source
+                data = await extract_uploaded_resume(reader, file_extension, filename)
+                line.update(status="ok", data=jsonable_encoder(data))
+            except HTTPException as e:
+                line.update(status="error", error=e.detail, statusCode=e.status_code)
+            except Exception as e:
+                logger.error(f"Error extracting {filename} in batch: {str(e)}")
+                line.update(status="error", error=f"Failed to extract resume content: {str(e)}", statusCode=500)
+            finally:
+                if reader is not None:
+                    await reader.close()
+            return line
+
+    async def stream_results():
+        tasks = [asyncio.create_task(process(i, filename, source)) for i, (filename, source) in enumerate(items)]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield json.dumps(await next_done) + "\n"
+        finally:
+            # Stops outstanding work if the client disconnects
+            for task in tasks:
+                task.cancel()
+            for archive in archives:
+                archive.close()
+
+    return StreamingResponse(stream_results(), media_type="application/x-ndjson")
+
 @app.post("/ocr-extract")
-async def ocr_extract(file_content: bytes, file_extension: str, filename: str) -> dict:
+async def ocr_extract(file_content: DocumentSource, file_extension: str, filename: str) -> dict:
     """
     Extract content from resume using OCR when standard extraction fails.
     Args:
-        file_content (bytes): File content as bytes.
+        file_content (DocumentSource): File content as bytes, or the path of a spooled upload.
         file_extension (str): File extension.
         filename (str): Original filename.
     Returns:
         dict: Structured resume data.
     """
     try:
-        logger.info(f"Using OCR extraction for {filename}")
-        # Use PyMuPDF (fitz) for PDF extraction with OCR fallback
-        import fitz
-        import pytesseract
-        from PIL import Image
-        import io
-        
-        text_content = ""
-        
-        if file_extension == 'pdf':
-            with fitz.open(stream=file_content, filetype="pdf") as doc:
-                for page_num in range(len(doc)):
-                    page = doc.load_page(page_num)
-                    
-                    # Try to get text directly first
-                    text = page.get_text("text")
-                    if text.strip():
-                        text_content += text + "\n"
-                    else:
-                        # If no text, use OCR on the page image
-                        pix = page.get_pixmap()
-                        img = Image.frombytes("RGB", [pix.width, pix.height], pix.samples)
-                        text_content += pytesseract.image_to_string(img) + "\n"
-        else:
-            # For non-PDF files, convert to image and use OCR
-            img = Image.open(io.BytesIO(file_content))
-            text_content = pytesseract.image_to_string(img)
-        
-        # Use LLM to extract structured data from OCR text
-        structured_data = extract_structured_resume(text_content)
-        logger.info(f"Successfully extracted content using OCR from {filename}")
-        return structured_data
-    except Exception as e:
-        logger.error(f"OCR extraction failed: {str(e)}")
-        raise HTTPException(status_code=500, detail=f"OCR extraction failed: {str(e)}")
+        return await extraction_service.ocr_extract(file_content, file_extension, filename)
+    except OcrExtractionError as e:
+        raise HTTPException(status_code=500, detail=str(e))
 
 @app.post("/enhance")
-async def enhance_text(request: EnhanceRequest) -> Dict[str, str]:
+async def enhance_text_endpoint(request: EnhanceRequest) -> Dict[str, str]:
     """
     Enhance text content using Gemini AI.
     Args:
@@ -179,41 +333,9 @@ async def enhance_text(request: EnhanceRequest) -> Dict[str, str]:
     """
     try:
         logger.info("Processing text enhancement request")
-        prompt = (
-            f"You are a professional resume writer. Enhance the following text to make it more impactful, "
-            f"professional, and effective for a {request.context}. Use strong action verbs, quantify achievements "
-            f"where possible, and maintain a professional tone. Keep the same general information but make it more compelling.\n\n"
-            f"Text to enhance: {request.text}\n\n"
-            f"Enhanced version:"
-        )
-        
-        chain = llm | output_parser
-        enhanced_text = chain.invoke(prompt)
-        
-        # Generate improvements list
-        improvements_prompt = (
-            f"Based on the original text and your enhanced version, list 3-5 specific improvements you made. "
-            f"Format as a JSON array of strings.\n\n"
-            f"Original: {request.text}\n\n"
-            f"Enhanced: {enhanced_text}\n\n"
-            f"Improvements:"
-        )
-        
-        improvements_chain = llm | output_parser
-        improvements_text = improvements_chain.invoke(improvements_prompt)
-        
-        try:
-            import json
-            improvements = json.loads(improvements_text)
-        except:
-            improvements = ["Improved professional language", "Added impact statements", "Enhanced clarity"]
-        
+        result = await run_in_threadpool(enhance_text, request.text, request.context)
         logger.info("Successfully enhanced text content")
-        return {
-            "enhancedText": enhanced_text,
-            "originalText": request.text,
-            "improvements": improvements
-        }
+        return result
     except Exception as e:
         logger.error(f"Error enhancing text: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Failed to enhance text: {str(e)}")
@@ -231,130 +353,192 @@ async def calculate_ats_score(request: ATSRequest) -> Dict[str, Any]:
         logger.info("Processing ATS score calculation request")
         
         # Convert dict to ResumeData
-        from models import ResumeData
         resume_data = ResumeData(**request.resume_data)
+        response = await build_ats_report(ats_scorer, resume_data, request.job_description)
         
-        ats_result = await ats_scorer.calculate_score(resume_data, request.job_description)
-        
-        # Extract missing skills from job description
-        missing_skills = []
-        if request.job_description:
-            from sklearn.feature_extraction.text import CountVectorizer
-            import re
-            
-            # Extract skills from job description
-            job_skills = set()
-            skill_patterns = [
-                r'proficient in ([\w\s,]+)',
-                r'experience with ([\w\s,]+)',
-                r'knowledge of ([\w\s,]+)',
-                r'skills:? ([\w\s,]+)',
-                r'requirements:? ([\w\s,]+)'
-            ]
-            
-            for pattern in skill_patterns:
-                matches = re.findall(pattern, request.job_description.lower())
-                for match in matches:
-                    skills = [s.strip() for s in re.split(r'[,;]', match)]
-                    job_skills.update(skills)
-            
-            # Compare with resume skills
-            resume_skills = set([s.lower() for s in resume_data.skills])
-            missing_skills = list(job_skills - resume_skills)
-            missing_skills = [s for s in missing_skills if len(s) > 3][:10]  # Limit to 10 meaningful skills
-        
-        # Format issues
-        format_issues = []
-        if not resume_data.summary or len(resume_data.summary) < 50:
-            format_issues.append("Professional summary is too short or missing")
-        if len(resume_data.skills) < 5:
-            format_issues.append("Not enough skills listed (aim for 8-12 relevant skills)")
-        if not resume_data.experience or len(resume_data.experience) == 0:
-            format_issues.append("Work experience section is missing")
-        for exp in resume_data.experience:
-            if not exp.description or len(exp.description) < 50:
-                format_issues.append("Some job descriptions are too brief")
-                break
-        
-        # Calculate keyword density
-        keyword_density = {}
-        if request.job_description:
-            from sklearn.feature_extraction.text import CountVectorizer
-            import numpy as np
-            
-            # Extract keywords from job description
-            vectorizer = CountVectorizer(stop_words='english', max_features=20)
-            job_desc_matrix = vectorizer.fit_transform([request.job_description])
-            feature_names = vectorizer.get_feature_names_out()
-            
-            # Get resume text
-            resume_text = ""
-            if resume_data.summary:
-                resume_text += resume_data.summary + " "
-            for skill in resume_data.skills:
-                resume_text += skill + " "
-            for exp in resume_data.experience:
-                if exp.description:
-                    resume_text += exp.description + " "
-            
-            # Calculate density
-            resume_matrix = vectorizer.transform([resume_text])
-            resume_counts = np.asarray(resume_matrix.sum(axis=0)).flatten()
-            total_words = sum(resume_counts)
-            
-            if total_words > 0:
-                for i, word in enumerate(feature_names):
-                    density = (resume_counts[i] / total_words) * 100
-                    if density > 0:
-                        keyword_density[word] = round(density, 1)
-        
-        # Generate recommendations
-        recommendations = {
-            "skills": [],
-            "experience": [],
-            "education": [],
-            "formatting": []
-        }
-        
-        # Skills recommendations
-        if missing_skills:
-            recommendations["skills"].append(f"Add these missing skills that appear in the job description: {', '.join(missing_skills[:5])}")
-        if len(resume_data.skills) < 8:
-            recommendations["skills"].append("Expand your skills section to include 8-12 relevant technical and soft skills")
-        
-        # Experience recommendations
-        has_metrics = False
-        for exp in resume_data.experience:
-            if exp.description and re.search(r'\d+%|\$\d+|\d+\+|increased|decreased|improved|reduced', exp.description, re.IGNORECASE):
-                has_metrics = True
-                break
-        
-        if not has_metrics:
-            recommendations["experience"].append("Add quantifiable achievements with metrics (%, $, numbers) to your experience")
-        
-        recommendations["experience"].append("Start each bullet point with strong action verbs (e.g., Implemented, Developed, Led)")
-        
-        # Formatting recommendations
-        recommendations["formatting"].append("Use consistent date formats throughout your resume")
-        recommendations["formatting"].append("Ensure proper spacing and alignment for better readability")
-        recommendations["formatting"].append("Use a clean, ATS-friendly template without tables or complex formatting")
-        
-        response = {
-            "atsScore": ats_result.score,
-            "missingSkills": missing_skills,
-            "suggestions": ats_result.suggestions,
-            "formatIssues": format_issues,
-            "matchPercentage": ats_result.score,
-            "keywordDensity": keyword_density,
-            "recommendations": recommendations
-        }
-        
-        logger.info(f"ATS score calculated: {ats_result.score}")
+        logger.info(f"ATS score calculated: {response['atsScore']}")
         return response
     except Exception as e:
         logger.error(f"Error calculating ATS score: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Failed to calculate ATS score: {str(e)}")
 
+@app.post("/ats-score/multi")
+async def calculate_ats_scores(request: ATSMultiRequest) -> Dict[str, Any]:
+    """
+    Calculate the ATS compatibility score of one resume against many job descriptions at once.
+    Args:
+        request (ATSMultiRequest): Resume data and job descriptions.
+    Returns:
+        Dict[str, Any]: Score, feedback and suggestions per job description in request order, and the
+        job description indices ranked from best to worst fit.
+    """
+    try:
+        logger.info(f"Processing ATS score calculation against {len(request.job_descriptions)} job descriptions")
+        resume_data = ResumeData(**request.resume_data)
+        scores = await ats_scorer.calculate_scores(resume_data, request.job_descriptions)
+        results = [
+            {"index": i, "atsScore": score.score, "feedback": score.feedback, "suggestions": score.suggestions}
+            for i, score in enumerate(scores)
+        ]
+        ranking = sorted(range(len(scores)), key=lambda i: -scores[i].score)
+        return {"results": results, "ranking": ranking}
+    except Exception as e:
+        logger.error(f"Error calculating ATS scores: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Failed to calculate ATS scores: {str(e)}")
+
+@app.post("/jobs/extract", status_code=202)
+async def submit_extract_job(file: UploadFile = File(...)) -> Dict[str, Any]:
+    """
+    Queue extraction of a resume file for a job worker.
+    Args:
+        file (UploadFile): The uploaded resume file.
+    Returns:
+        Dict[str, Any]: The queued job; poll GET /jobs/{jobId} for the result.
+    """
+    filename = file.filename or "resume"
+    file_extension = get_file_extension(file.filename)
+    try:
+        upload = await spool_upload(file, file_extension)
+    except UploadRejected as e:
+        raise HTTPException(status_code=e.status_code, detail=e.detail)
+    try:
+        content = await run_in_threadpool(upload.read_bytes)
+        job = await run_in_threadpool(
+            get_broker().submit, "extract",
+            {"filename": filename, "fileExtension": file_extension, "sha256": upload.sha256,
+             "pageCount": upload.page_count}, content
+        )
+    finally:
+        upload.close()
+    logger.info(f"Queued extraction job {job.id} for {filename}")
+    return job.to_response()
+
+@app.post("/jobs/ats-score", status_code=202)
+async def submit_ats_score_job(request: ATSRequest) -> Dict[str, Any]:
+    """
+    Queue an ATS score calculation for a job worker.
+    Args:
+        request (ATSRequest): Resume data and job description.
+    Returns:
+        Dict[str, Any]: The queued job; poll GET /jobs/{jobId} for the result.
+    """
+    job = await run_in_threadpool(get_broker().submit, "ats-score", request.model_dump())
+    logger.info(f"Queued ATS score job {job.id}")
+    return job.to_response()
+
+@app.post("/jobs/enhance", status_code=202)
+async def submit_enhance_job(request: EnhanceRequest) -> Dict[str, Any]:
+    """
+    Queue a text enhancement for a job worker.
+    Args:
+        request (EnhanceRequest): Text to enhance and context.
+    Returns:
+        Dict[str, Any]: The queued job; poll GET /jobs/{jobId} for the result.
+    """
+    job = await run_in_threadpool(get_broker().submit, "enhance", request.model_dump())
+    logger.info(f"Queued enhancement job {job.id}")
+    return job.to_response()
+
+@app.get("/jobs/{job_id}")
+async def get_job(job_id: str) -> Dict[str, Any]:
+    """
+    Get the status of a job, with its result once it succeeded or its error once it failed.
+    Args:
+        job_id (str): Job id returned on submission.
+    Returns:
+        Dict[str, Any]: Job status (queued, running, succeeded, failed or expired).
+    """
+    job = await run_in_threadpool(get_broker().get, job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Job {job_id} not found")
+    return job.to_response()
+
+@app.post("/resumes", status_code=201)
+async def store_resume(request: StoreResumeRequest) -> Dict[str, Any]:
+    """
+    Add a resume to the searchable corpus, replacing a stored resume with the same id.
+    Args:
+        request (StoreResumeRequest): Resume data and optional id.
+    Returns:
+        Dict[str, Any]: Id of the stored resume.
+    """
+    try:
+        resume_data = ResumeData(**request.resume_data)
+    except ValidationError as e:
+        raise HTTPException(status_code=422, detail=f"Invalid resume data: {str(e)}")
+    resume_id = await run_in_threadpool(get_resume_store().add, resume_data, request.resume_id)
+    return {"resumeId": resume_id}
+
+@app.delete("/resumes/{resume_id}")
+async def delete_resume(resume_id: str) -> Dict[str, Any]:
+    """
+    Remove a resume from the searchable corpus.
+    Args:
+        resume_id (str): Resume id.
+    Returns:
+        Dict[str, Any]: Id of the deleted resume.
+    """
+    if not await run_in_threadpool(get_resume_store().delete, resume_id):
+        raise HTTPException(status_code=404, detail=f"Resume {resume_id} not found")
+    return {"resumeId": resume_id, "deleted": True}
+
+@app.post("/rank")
+async def rank_resumes(request: RankRequest) -> Dict[str, Any]:
+    """
+    Find the stored resumes that fit a job description best.
+    Resumes are ranked by BM25 over the inverted index; only the top k are then scored by the ATS scorer.
+    Args:
+        request (RankRequest): Job description and number of resumes.
+    Returns:
+        Dict[str, Any]: Top resumes with their search score and ATS score, best first.
+    """
+    try:
+        resume_store = get_resume_store()
+        started = time.perf_counter()
+        hits = await run_in_threadpool(resume_store.search, request.job_description, request.k)
+        search_ms = (time.perf_counter() - started) * 1000
+        resumes = await run_in_threadpool(resume_store.get, [hit.resume_id for hit in hits])
+        hits = [hit for hit in hits if hit.resume_id in resumes]  # deleted since the search
+        shortlist = [resumes[hit.resume_id] for hit in hits]
+        # The whole shortlist is scored in one call, off the event loop
+        ats_scores = await run_in_threadpool(batch_ats_scorer.score, shortlist, request.job_description)
+        results = [
+            {
+                "resumeId": hit.resume_id,
+                "fullName": resume_data.personalInfo.fullName,
+                "score": hit.score,
+                "atsScore": int(ats_score),
+            }
+            for hit, resume_data, ats_score in zip(hits, shortlist, ats_scores.overall)
+        ]
+        logger.info(f"Ranked {len(resume_store.index)} resumes in {search_ms:.1f} ms")
+        return {"results": results, "searched": len(resume_store.index), "searchMs": round(search_ms, 1)}
+    except Exception as e:
+        logger.error(f"Error ranking resumes: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Failed to rank resumes: {str(e)}")
+
+@app.post("/postings/nearest")
+async def nearest_postings(request: NearestPostingsRequest) -> Dict[str, Any]:
+    """
+    Find the job postings of the posting library closest to a resume.
+    Args:
+        request (NearestPostingsRequest): Resume data and number of postings.
+    Returns:
+        Dict[str, Any]: Closest postings with their cosine similarity, best first.
+    """
+    index = get_posting_index()
+    if index is None:
+        raise HTTPException(status_code=503, detail="Job posting index has not been built")
+    try:
+        resume_data = ResumeData(**request.resume_data)
+    except ValidationError as e:
+        raise HTTPException(status_code=422, detail=f"Invalid resume data: {str(e)}")
+    matches = await run_in_threadpool(index.search, resume_to_text(resume_data), request.k)
+    return {
+        "postings": [{"postingId": m.posting_id, "title": m.title, "score": m.score} for m in matches],
+        "searched": len(index)
+    }
+
 @app.post("/feedback")
 async def feedback_endpoint(resume_data: dict = Body(...)) -> Dict[str, Any]:
     """
@@ -397,6 +581,31 @@ async def feedback_endpoint(resume_data: dict = Body(...)) -> Dict[str, Any]:
         logger.error(f"Error in feedback_endpoint: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Failed to generate feedback: {str(e)}")
 
+@app.get("/cache/stats")
+async def cache_stats() -> Dict[str, Any]:
+    """Get hit/miss counters and sizes of the result caches."""
+    return {"extraction": extraction_cache.stats(), "jobDescriptionProfiles": jd_profile_cache_stats()}
+
+@app.get("/taxonomy")
+async def taxonomy_stats() -> Dict[str, Any]:
+    """Get the version and size of the loaded skill and job title taxonomy."""
+    return get_taxonomy().stats()
+
+@app.post("/taxonomy/reload")
+async def reload_taxonomy_endpoint() -> Dict[str, Any]:
+    """
+    Reload the skill and job title taxonomy from its data file without a restart.
+    Other workers pick up the file change on their next periodic check.
+    Returns:
+        Dict[str, Any]: Version and size of the reloaded taxonomy.
+    """
+    try:
+        taxonomy = await run_in_threadpool(reload_taxonomy)
+    except ValueError as e:
+        raise HTTPException(status_code=500, detail=str(e))
+    logger.info(f"Reloaded taxonomy {taxonomy.version}")
+    return taxonomy.stats()
+
 @app.get("/info")
 async def get_service_info() -> Dict[str, Any]:
     """Get service information and available endpoints."""
@@ -405,11 +614,24 @@ async def get_service_info() -> Dict[str, Any]:
         "version": "1.0.0",
         "endpoints": {
             "/extract": "Extract content from resume files (PDF/DOCX)",
+            "/extract/batch": "Extract many resumes or a ZIP archive, streaming NDJSON results",
             "/ocr-extract": "Extract content using OCR for unreadable files",
             "/enhance": "Enhance resume content using AI",
             "/ats-score": "Calculate ATS compatibility score",
+            "/ats-score/multi": "Score one resume against many job descriptions and rank them",
             "/feedback": "Get real-time feedback during editing",
+            "/resumes": "Add a resume to the searchable corpus (DELETE /resumes/{resume_id} removes it)",
+            "/rank": "Rank stored resumes against a job description",
+            "/postings/nearest": "Find the job postings of the posting library closest to a resume",
+            "/jobs/extract": "Queue a resume extraction job",
+            "/jobs/ats-score": "Queue an ATS score job",
+            "/jobs/enhance": "Queue a text enhancement job",
+            "/jobs/{job_id}": "Poll a job for its status and result",
+            "/cache/stats": "Result and job description profile cache hit/miss statistics",
+            "/taxonomy": "Version and size of the skill and job title taxonomy",
+            "/taxonomy/reload": "Reload the skill and job title taxonomy from its data file",
             "/health": "Health check endpoint",
+            "/ready": "Readiness check, 503 until models are loaded",
             "/docs": "API documentation"
         },
         "supported_formats": ["PDF", "DOCX"],
@@ -452,7 +674,7 @@ async def general_exception_handler(request, exc):
     )
 
 if __name__ == "__main__":
-    # Run the application
+    # Run the development server; use server.py to run preforked production workers
     uvicorn.run(
         "main:app",
         host="0.0.0.0",
@@ -5,6 +5,8 @@ Defines the data structures used throughout the resume processing application.
 from pydantic import BaseModel, Field, EmailStr, ValidationError, validator, model_validator
 from typing import List, Optional
 
+from date_ranges import PRESENT, is_present
+
 class PersonalInfo(BaseModel):
     """Model for personal information in a resume."""
     fullName: str = Field(..., description="Full name of the person")
@@ -33,17 +35,11 @@ class Experience(BaseModel):
 
     @model_validator(mode='after')
     def check_dates(self):
-        start = self.startDate
-        end = self.endDate
-        if start and end:
-            try:
-                from datetime import datetime
-                s = datetime.strptime(start, '%Y-%m-%d')
-                e = datetime.strptime(end, '%Y-%m-%d')
-                if e < s:
-                    raise ValueError('End date must be after start date')
-            except Exception:
-                pass  # Ignore if format is not YYYY-MM-DD
+        # Not a rejection: /feedback validates resumes on every edit, when a date may be half changed.
+        # An open-ended end date ("to date", "now") is written as Present.
+        if self.endDate and is_present(self.endDate):
+            self.endDate = PRESENT
+            self.current = True
         return self
 
 class Education(BaseModel):
@@ -58,17 +54,9 @@ class Education(BaseModel):
 
     @model_validator(mode='after')
     def check_edu_dates(self):
-        start = self.startDate
-        end = self.endDate
-        if start and end:
-            try:
-                from datetime import datetime
-                s = datetime.strptime(start, '%Y-%m-%d')
-                e = datetime.strptime(end, '%Y-%m-%d')
-                if e < s:
-                    raise ValueError('Education end date must be after start date')
-            except Exception:
-                pass
+        # Like Experience.check_dates, dates out of order are accepted
+        if self.endDate and is_present(self.endDate):
+            self.endDate = PRESENT
         return self
 
 class ResumeData(BaseModel):
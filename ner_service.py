@@ -0,0 +1,222 @@
+"""
+NER sidecar service
+Holds the only copy of the spaCy pipeline and serves named-entity recognition to every web and
+extraction worker over a Unix socket. Requests arriving concurrently from different workers are
+merged into micro-batches for `nlp.pipe`, which raises throughput when many small resumes are
+extracted at once. Messages are length-prefixed JSON.
+
+Usage: python ner_service.py [socket_path]
+"""
+
+import asyncio
+import json
+import logging
+import os
+import socket
+import struct
+import sys
+import threading
+from typing import List, Optional, Tuple
+
+from document import Entity
+
+logger = logging.getLogger(__name__)
+
+NER_SOCKET = os.getenv("NER_SOCKET", "/tmp/resume-ner.sock")
+# Seconds a client waits for the sidecar before giving up.
+NER_TIMEOUT = float(os.getenv("NER_TIMEOUT", "30"))
+# Upper bound on the number of texts merged into one nlp.pipe call.
+NER_MAX_BATCH = int(os.getenv("NER_MAX_BATCH", "64"))
+# How long the first request of a batch waits for others to join it.
+NER_BATCH_WAIT_MS = float(os.getenv("NER_BATCH_WAIT_MS", "5"))
+
+_HEADER = struct.Struct("!I")
+
+
+class NerServiceError(Exception):
+    """Raised when the NER sidecar cannot be reached or reports an error."""
+
+
+def encode_message(message: dict) -> bytes:
+    """
+    Frame a message as a 4-byte big-endian length followed by JSON.
+    Args:
+        message (dict): Message to send.
+    Returns:
+        bytes: Framed message.
+    """
+    payload = json.dumps(message, separators=(",", ":")).encode("utf-8")
+    return _HEADER.pack(len(payload)) + payload
+
+
+class NerService:
+    """Unix-socket server that micro-batches NER requests into nlp.pipe."""
+    def __init__(self, socket_path: str = NER_SOCKET, max_batch: int = NER_MAX_BATCH,
+                 batch_wait_ms: float = NER_BATCH_WAIT_MS):
+        self.socket_path = socket_path
+        self.max_batch = max_batch
+        self.batch_wait = batch_wait_ms / 1000
+        self._queue: Optional[asyncio.Queue] = None
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                (length,) = _HEADER.unpack(await reader.readexactly(_HEADER.size))
+                request = json.loads(await reader.readexactly(length))
+                future = asyncio.get_running_loop().create_future()
+                await self._queue.put((request["texts"], future))
+                try:
+                    response = {"entities": await future}
+                except Exception as e:
+                    response = {"error": str(e)}
+                writer.write(encode_message(response))
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        except Exception as e:
+            logger.error(f"NER connection failed: {str(e)}")
+        finally:
+            writer.close()
+
+    async def _next_batch(self) -> List[Tuple[List[str], asyncio.Future]]:
+        loop = asyncio.get_running_loop()
+        batch = [await self._queue.get()]
+        size = len(batch[0][0])
+        deadline = loop.time() + self.batch_wait
+        while size < self.max_batch:
+            try:
+                item = self._queue.get_nowait()
+            except asyncio.QueueEmpty:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    item = await asyncio.wait_for(self._queue.get(), remaining)
+                except asyncio.TimeoutError:
+                    break
+            batch.append(item)
+            size += len(item[0])
+        return batch
+
+    async def _run_batches(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = await self._next_batch()
+            texts = [text for item_texts, _ in batch for text in item_texts]
+            try:
+                # spaCy runs on the default executor so the loop keeps accepting requests meanwhile
+                results = await loop.run_in_executor(None, recognize_locally, texts)
+            except Exception as e:
+                logger.error(f"NER batch of {len(texts)} texts failed: {str(e)}")
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+            logger.debug(f"NER batch: {len(batch)} requests, {len(texts)} texts")
+            offset = 0
+            for item_texts, future in batch:
+                if not future.done():
+                    future.set_result(results[offset:offset + len(item_texts)])
+                offset += len(item_texts)
+
+    async def serve(self) -> None:
+        """Load the model, bind the socket and serve until cancelled."""
+        from extractor import get_nlp
+        get_nlp()
+        self._queue = asyncio.Queue()
+        if os.path.exists(self.socket_path):
+            os.unlink(self.socket_path)
+        server = await asyncio.start_unix_server(self._handle_connection, path=self.socket_path)
+        batcher = asyncio.create_task(self._run_batches())
+        logger.info(f"NER service listening on {self.socket_path}")
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            batcher.cancel()
+            if os.path.exists(self.socket_path):
+                os.unlink(self.socket_path)
+
+
+def recognize_locally(texts: List[str]) -> List[List[Entity]]:
+    """
+    Run the in-process spaCy pipeline over texts in one nlp.pipe call.
+    Args:
+        texts (List[str]): Texts to annotate.
+    Returns:
+        List[List[Entity]]: Entities of each text, in order.
+    """
+    from extractor import get_nlp, NER_BATCH_SIZE
+    return [
+        [Entity(ent.start_char, ent.end_char, ent.label_, ent.text) for ent in doc.ents]
+        for doc in get_nlp().pipe(texts, batch_size=NER_BATCH_SIZE)
+    ]
+
+
+class NerClient:
+    """
+    Client of the NER sidecar. Each thread of each process keeps its own connection, so
+    concurrent callers reach the sidecar in parallel and can share a micro-batch.
+    """
+    def __init__(self, socket_path: str = NER_SOCKET, timeout: float = NER_TIMEOUT):
+        self.socket_path = socket_path
+        self.timeout = timeout
+        self._local = threading.local()
+
+    def _connection(self) -> socket.socket:
+        sock = getattr(self._local, "sock", None)
+        if sock is None or self._local.pid != os.getpid():
+            sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            sock.settimeout(self.timeout)
+            sock.connect(self.socket_path)
+            self._local.sock, self._local.pid = sock, os.getpid()
+        return sock
+
+    def close(self) -> None:
+        """Close the connection of the calling thread."""
+        sock = getattr(self._local, "sock", None)
+        if sock is not None and self._local.pid == os.getpid():
+            sock.close()
+        self._local.sock = None
+
+    def _receive(self, sock: socket.socket, size: int) -> bytes:
+        buffer = bytearray()
+        while len(buffer) < size:
+            chunk = sock.recv(size - len(buffer))
+            if not chunk:
+                raise ConnectionError("NER service closed the connection")
+            buffer.extend(chunk)
+        return bytes(buffer)
+
+    def recognize(self, texts: List[str]) -> List[List[Entity]]:
+        """
+        Recognize entities in texts using the sidecar.
+        Args:
+            texts (List[str]): Texts to annotate.
+        Returns:
+            List[List[Entity]]: Entities of each text, in order.
+        """
+        request = encode_message({"texts": texts})
+        for attempt in range(2):
+            try:
+                sock = self._connection()
+                sock.sendall(request)
+                (length,) = _HEADER.unpack(self._receive(sock, _HEADER.size))
+                response = json.loads(self._receive(sock, length))
+                break
+            except OSError as e:
+                # A connection left over from a restarted sidecar fails once; retry on a new one
+                self.close()
+                if attempt:
+                    raise NerServiceError(f"NER service unavailable at {self.socket_path}: {str(e)}")
+        if "error" in response:
+            raise NerServiceError(response["error"])
+        return [[Entity(*entity) for entity in entities] for entities in response["entities"]]
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+    try:
+        asyncio.run(NerService(sys.argv[1] if len(sys.argv) > 1 else NER_SOCKET).serve())
+    except KeyboardInterrupt:
+        pass
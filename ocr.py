@@ -0,0 +1,265 @@
+"""
+OCR text extraction module
+Recovers text from scanned or image-only resumes. Only pages without a text layer are rendered,
+at a configurable resolution in grayscale, optionally downsampled and binarized with NumPy,
+and recognized in groups by the process's long-lived OCR backend. Recognized text is cached by the
+hash of the rendered page image, so a re-uploaded file only runs OCR on pages that changed.
+Each page reports its render and recognition time.
+"""
+
+import hashlib
+import io
+import logging
+import math
+import os
+import time
+from typing import List, NamedTuple, Sequence, Tuple
+
+import numpy as np
+from PIL import Image
+
+from cache import TieredCache
+from ocr_backends import OCR_LANG, get_ocr_backend
+from uploads import DocumentSource, MAX_PDF_PAGES, open_pdf
+
+logger = logging.getLogger(__name__)
+
+# Rendering resolution for OCR; Tesseract is most accurate around 300 DPI.
+OCR_DPI = int(os.getenv("OCR_DPI", "300"))
+OCR_GRAYSCALE = os.getenv("OCR_GRAYSCALE", "true").lower() == "true"
+# Downsample rendered pages wider than this many pixels; 0 keeps the full resolution.
+OCR_MAX_WIDTH = int(os.getenv("OCR_MAX_WIDTH", "0"))
+# Binarize pages with Otsu's threshold before recognition.
+OCR_BINARIZE = os.getenv("OCR_BINARIZE", "false").lower() == "true"
+# Pages rendered and handed to the OCR backend together; bounds the memory held by rendered images.
+OCR_BATCH_PAGES = int(os.getenv("OCR_BATCH_PAGES", "8"))
+# Page OCR cache: memory tier per worker, optional SQLite tier shared by workers and kept across restarts.
+OCR_CACHE_MEMORY_MB = int(os.getenv("OCR_CACHE_MEMORY_MB", "16"))
+OCR_CACHE_PATH = os.getenv("OCR_CACHE_PATH", "")
+OCR_CACHE_DISK_MB = int(os.getenv("OCR_CACHE_DISK_MB", "256"))
+# Bump when preprocessing or recognition changes in a way that alters OCR output.
+OCR_CACHE_VERSION = f"1:{OCR_LANG}"
+
+
+class PageOcrResult(NamedTuple):
+    """OCR output and timings for one page."""
+    page_number: int
+    text: str
+    render_ms: float
+    ocr_ms: float
+    cached: bool = False
+
+
+_page_cache = None
+_page_cache_pid = None
+
+
+def get_page_cache() -> TieredCache:
+    """
+    Get the page OCR cache of the current process.
+    SQLite connections must not cross a fork, so each worker opens its own.
+    Returns:
+        TieredCache: Cache of recognized text keyed by page image hash.
+    """
+    global _page_cache, _page_cache_pid
+    if _page_cache is None or _page_cache_pid != os.getpid():
+        _page_cache = TieredCache(
+            namespace="ocr-page",
+            version=OCR_CACHE_VERSION,
+            memory_bytes=OCR_CACHE_MEMORY_MB * 1024 * 1024,
+            disk_path=OCR_CACHE_PATH,
+            disk_bytes=OCR_CACHE_DISK_MB * 1024 * 1024,
+        )
+        _page_cache_pid = os.getpid()
+    return _page_cache
+
+
+def page_image_key(image: Image.Image) -> str:
+    """
+    Exact content hash of a rendered page image.
+    Args:
+        image (Image.Image): Rendered and preprocessed page.
+    Returns:
+        str: Hex digest covering mode, size and pixels.
+    """
+    digest = hashlib.sha256(f"{image.mode}:{image.width}x{image.height}:".encode("ascii"))
+    digest.update(image.tobytes())
+    return digest.hexdigest()
+
+
+def scan_text_layer(file_content: DocumentSource, max_pages: int = MAX_PDF_PAGES) -> Tuple[List[str], List[int]]:
+    """
+    Read the text layer of each PDF page and find the pages that need OCR.
+    Args:
+        file_content (DocumentSource): PDF file content or path.
+        max_pages (int): Maximum number of pages to read.
+    Returns:
+        Tuple[List[str], List[int]]: Text of each page, and the numbers of pages without text.
+    """
+    with open_pdf(file_content) as doc:
+        page_texts = [doc.load_page(i).get_text("text") for i in range(min(doc.page_count, max_pages))]
+    ocr_pages = [i for i, text in enumerate(page_texts) if not text.strip()]
+    return page_texts, ocr_pages
+
+
+def render_page(page, dpi: int = OCR_DPI, grayscale: bool = OCR_GRAYSCALE) -> Image.Image:
+    """
+    Render a PDF page to an image for OCR.
+    Args:
+        page (fitz.Page): Page to render.
+        dpi (int): Rendering resolution.
+        grayscale (bool): Render a single gray channel instead of RGB.
+    Returns:
+        Image.Image: Rendered page.
+    """
+    import fitz  # PyMuPDF
+    pix = page.get_pixmap(dpi=dpi, colorspace=fitz.csGRAY if grayscale else fitz.csRGB, alpha=False)
+    return Image.frombytes("L" if grayscale else "RGB", [pix.width, pix.height], pix.samples)
+
+
+def otsu_threshold(pixels: np.ndarray) -> int:
+    """
+    Compute Otsu's binarization threshold of a grayscale image.
+    Args:
+        pixels (np.ndarray): 2-D uint8 array.
+    Returns:
+        int: Threshold maximizing the between-class variance.
+    """
+    histogram = np.bincount(pixels.ravel(), minlength=256).astype(np.float64)
+    weights = np.cumsum(histogram)
+    means = np.cumsum(histogram * np.arange(256))
+    total_weight, total_mean = weights[-1], means[-1]
+    background = weights
+    foreground = total_weight - weights
+    with np.errstate(divide='ignore', invalid='ignore'):
+        variance = (total_mean * background - means * total_weight) ** 2 / (background * foreground)
+    return int(np.nanargmax(variance))
+
+
+def preprocess_image(image: Image.Image, max_width: int = OCR_MAX_WIDTH, binarize: bool = OCR_BINARIZE) -> Image.Image:
+    """
+    Downsample and binarize a rendered page with NumPy.
+    Args:
+        image (Image.Image): Rendered page.
+        max_width (int): Downsample by an integer factor until the width fits; 0 disables.
+        binarize (bool): Apply Otsu's threshold (converts to grayscale).
+    Returns:
+        Image.Image: Preprocessed page.
+    """
+    if not (max_width and image.width > max_width) and not binarize:
+        return image
+    if binarize and image.mode != "L":
+        image = image.convert("L")
+    pixels = np.asarray(image)
+    if max_width and image.width > max_width:
+        factor = math.ceil(image.width / max_width)
+        height, width = (pixels.shape[0] // factor) * factor, (pixels.shape[1] // factor) * factor
+        blocks = pixels[:height, :width].reshape(height // factor, factor, width // factor, factor, *pixels.shape[2:])
+        pixels = blocks.mean(axis=(1, 3)).astype(np.uint8)
+    if binarize:
+        pixels = np.where(pixels > otsu_threshold(pixels), 255, 0).astype(np.uint8)
+    return Image.fromarray(pixels)
+
+
+def ocr_pdf_pages(file_content: DocumentSource, page_numbers: Sequence[int], dpi: int = OCR_DPI) -> List[PageOcrResult]:
+    """
+    Render selected PDF pages and recognize those not found in the page cache, in groups of
+    OCR_BATCH_PAGES. Recognition time is measured per group and split evenly across its pages.
+    Args:
+        file_content (DocumentSource): PDF file content or path.
+        page_numbers (Sequence[int]): Pages to OCR.
+        dpi (int): Rendering resolution.
+    Returns:
+        List[PageOcrResult]: OCR output and timings per page.
+    """
+    cache = get_page_cache()
+    results = []
+    pending = []  # (page_number, image, cache_key, render_ms) awaiting recognition
+    with open_pdf(file_content) as doc:
+        for page_number in page_numbers:
+            started = time.perf_counter()
+            image = preprocess_image(render_page(doc.load_page(page_number), dpi))
+            key = page_image_key(image)
+            render_ms = (time.perf_counter() - started) * 1000
+            cached = cache.get(key)
+            if cached is not None:
+                results.append(PageOcrResult(page_number, cached.decode("utf-8"), render_ms, 0.0, True))
+                continue
+            pending.append((page_number, image, key, render_ms))
+            if len(pending) >= OCR_BATCH_PAGES:
+                results.extend(_recognize_pending(pending, cache))
+                pending = []
+    if pending:
+        results.extend(_recognize_pending(pending, cache))
+    return results
+
+
+def _recognize_pending(pending: List[tuple], cache: TieredCache) -> List[PageOcrResult]:
+    started = time.perf_counter()
+    texts = get_ocr_backend().recognize([image for _, image, _, _ in pending])
+    ocr_ms = (time.perf_counter() - started) * 1000 / len(pending)
+    results = []
+    for (page_number, _, key, render_ms), text in zip(pending, texts):
+        cache.set(key, text.encode("utf-8"))
+        results.append(PageOcrResult(page_number, text, render_ms, ocr_ms))
+    return results
+
+
+def ocr_image(file_content: DocumentSource) -> str:
+    """
+    Recognize text in a single image file.
+    Args:
+        file_content (DocumentSource): Image content or path.
+    Returns:
+        str: Extracted text.
+    """
+    img = Image.open(file_content if isinstance(file_content, str) else io.BytesIO(file_content))
+    return get_ocr_backend().recognize([preprocess_image(img)])[0]
+
+
+def merge_page_texts(page_texts: List[str], results: List[PageOcrResult]) -> str:
+    """
+    Combine text-layer pages with OCR output into the document text.
+    Args:
+        page_texts (List[str]): Text layer of each page.
+        results (List[PageOcrResult]): OCR output for pages without a text layer.
+    Returns:
+        str: Document text.
+    """
+    page_texts = list(page_texts)
+    for result in results:
+        page_texts[result.page_number] = result.text
+    return ''.join(text + "\n" for text in page_texts)
+
+
+def log_page_timings(results: List[PageOcrResult]) -> None:
+    """
+    Log render and recognition time for each OCR'd page.
+    Args:
+        results (List[PageOcrResult]): OCR output per page.
+    """
+    for result in sorted(results, key=lambda r: r.page_number):
+        logger.info(
+            f"OCR page {result.page_number + 1}: render {result.render_ms:.0f} ms, "
+            f"{'cached' if result.cached else f'recognize {result.ocr_ms:.0f} ms'}, {len(result.text)} characters"
+        )
+
+
+def ocr_text(file_content: DocumentSource, file_extension: str) -> str:
+    """
+    Extract text from a resume file using OCR where no text layer is available, in the calling process.
+    Args:
+        file_content (DocumentSource): File content as bytes, or the path of a spooled upload.
+        file_extension (str): File extension.
+    Returns:
+        str: Extracted text.
+    """
+    if file_extension != 'pdf':
+        # For non-PDF files, treat the upload as an image
+        return ocr_image(file_content)
+    page_texts, ocr_pages = scan_text_layer(file_content)
+    results = ocr_pdf_pages(file_content, ocr_pages)
+    log_page_timings(results)
+    text_content = merge_page_texts(page_texts, results)
+    logger.info(f"Extracted {len(text_content)} characters using OCR on {len(ocr_pages)} of {len(page_texts)} pages")
+    return text_content
@@ -0,0 +1,150 @@
+"""
+OCR engine backends
+Keeps one long-lived Tesseract engine per process instead of starting a `tesseract` subprocess
+for every page: an in-process tesserocr API when available, otherwise a single batched
+`tesseract` invocation per group of pages, with per-page pytesseract calls as the fallback.
+"""
+
+import logging
+import os
+import tempfile
+from typing import List, Optional
+
+import pytesseract
+from PIL import Image
+
+logger = logging.getLogger(__name__)
+
+# auto, tesserocr, batch or pytesseract
+OCR_BACKEND = os.getenv("OCR_BACKEND", "auto").lower()
+OCR_LANG = os.getenv("OCR_LANG", "eng")
+
+# Tesseract ends every page of a multi-page run with a form feed.
+PAGE_SEPARATOR = "\f"
+
+
+class OcrBackend:
+    """Base class of OCR engines: recognizes a list of page images in order."""
+    name = "base"
+
+    def recognize(self, images: List[Image.Image]) -> List[str]:
+        """
+        Recognize the text of each image.
+        Args:
+            images (List[Image.Image]): Page images.
+        Returns:
+            List[str]: Text of each image, in the same order.
+        """
+        raise NotImplementedError
+
+    def close(self) -> None:
+        """Release the engine."""
+
+
+class PytesseractBackend(OcrBackend):
+    """One `tesseract` subprocess per image via pytesseract."""
+    name = "pytesseract"
+
+    def __init__(self, lang: str = OCR_LANG):
+        self.lang = lang
+
+    def recognize(self, images: List[Image.Image]) -> List[str]:
+        try:
+            return [pytesseract.image_to_string(image, lang=self.lang) for image in images]
+        except (pytesseract.TesseractNotFoundError, pytesseract.TesseractError) as e:
+            # pytesseract's exceptions cannot be unpickled, which would break the process pool
+            raise RuntimeError(f"Tesseract failed: {str(e)}") from None
+
+
+class TesserocrBackend(OcrBackend):
+    """In-process Tesseract API; language data is loaded once and reused for every page."""
+    name = "tesserocr"
+
+    def __init__(self, lang: str = OCR_LANG):
+        import tesserocr
+        self._api = tesserocr.PyTessBaseAPI(lang=lang)
+
+    def recognize(self, images: List[Image.Image]) -> List[str]:
+        texts = []
+        for image in images:
+            self._api.SetImage(image)
+            texts.append(self._api.GetUTF8Text())
+        return texts
+
+    def close(self) -> None:
+        self._api.End()
+
+
+class TesseractBatchBackend(OcrBackend):
+    """
+    One `tesseract` invocation for a whole group of pages, fed through an image list file,
+    so process startup and language loading are paid once per group instead of once per page.
+    """
+    name = "batch"
+
+    def __init__(self, lang: str = OCR_LANG):
+        self.lang = lang
+        self._fallback = PytesseractBackend(lang)
+
+    def recognize(self, images: List[Image.Image]) -> List[str]:
+        if len(images) <= 1:
+            return self._fallback.recognize(images)
+        with tempfile.TemporaryDirectory(prefix="ocr-") as temp_dir:
+            paths = []
+            for i, image in enumerate(images):
+                path = os.path.join(temp_dir, f"page-{i:04d}.png")
+                image.save(path)
+                paths.append(path)
+            list_path = os.path.join(temp_dir, "pages.txt")
+            with open(list_path, "w") as list_file:
+                list_file.write("\n".join(paths) + "\n")
+            try:
+                output = pytesseract.image_to_string(list_path, lang=self.lang)
+            except Exception as e:
+                logger.warning(f"Batched tesseract run failed: {str(e)}. Recognizing pages one by one.")
+                return self._fallback.recognize(images)
+        texts = output.split(PAGE_SEPARATOR)[:len(images)]
+        if len(texts) != len(images):
+            logger.warning("Batched tesseract output has fewer pages than expected, recognizing pages one by one")
+            return self._fallback.recognize(images)
+        return texts
+
+
+_backend: Optional[OcrBackend] = None
+_backend_pid: Optional[int] = None
+
+
+def create_ocr_backend(name: str = OCR_BACKEND) -> OcrBackend:
+    """
+    Create an OCR backend by name, falling back to pytesseract if it cannot be loaded.
+    Args:
+        name (str): auto, tesserocr, batch or pytesseract.
+    Returns:
+        OcrBackend: The engine.
+    """
+    if name in ("auto", "tesserocr"):
+        try:
+            return TesserocrBackend()
+        except Exception as e:
+            if name == "tesserocr":
+                logger.warning(f"tesserocr unavailable ({str(e)}), falling back to pytesseract")
+                return PytesseractBackend()
+    if name in ("auto", "batch"):
+        return TesseractBatchBackend()
+    return PytesseractBackend()
+
+
+def get_ocr_backend() -> OcrBackend:
+    """
+    Get the long-lived OCR backend of the current process, creating it on first use.
+    A backend inherited from a parent through fork is not reused, since native engine state
+    is not safe to share between processes.
+    Returns:
+        OcrBackend: The engine.
+    """
+    global _backend, _backend_pid
+    if _backend is None or _backend_pid != os.getpid():
+        _backend = create_ocr_backend()
+        _backend_pid = os.getpid()
+        logger.info(f"Using OCR backend '{_backend.name}'")
+    return _backend
@@ -0,0 +1,341 @@
+"""
+Job posting library index
+Finds the job postings closest to a resume in a library of about 100k postings without comparing
+the resume with every posting. Postings are embedded with LSA (a truncated SVD of their TF-IDF
+vectors, with the term hashing and weighting of tfidf_model that the ATS scorer uses) and grouped
+into inverted lists by spherical k-means (IVF). A query compares the resume with the list
+centroids and then only with the postings of the nearest lists.
+
+The index is built offline from a directory of postings and saved as .npy files, which services
+memory-map, so worker processes share one copy of the vectors through the page cache. It is
+reloaded when a rebuild replaces the directory.
+
+Usage: python posting_index.py POSTINGS [POSTINGS ...] [--output DIR] [--dims N] [--lists N]
+    POSTINGS is a .txt/.md file (one posting, its path relative to the argument is the id), a .jsonl
+    file (one {"id": ..., "title": ..., "text": ...} posting per line) or a directory of them.
+"""
+
+import argparse
+import json
+import logging
+import os
+import shutil
+import threading
+import time
+from typing import Iterator, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+
+from tfidf_model import TfidfModel, get_tfidf_model
+
+logger = logging.getLogger(__name__)
+
+POSTING_INDEX_DIR = os.getenv(
+    "POSTING_INDEX_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "posting_index")
+)
+# Inverted lists searched per query; more lists find more of the exact nearest postings but take longer.
+POSTING_INDEX_NPROBE = int(os.getenv("POSTING_INDEX_NPROBE", "8"))
+# Seconds between checks of the index directory for a rebuild.
+POSTING_INDEX_CHECK_INTERVAL = float(os.getenv("POSTING_INDEX_CHECK_INTERVAL", "30"))
+
+# Build defaults: LSA dimensions, hashed term columns kept (most frequent first) and k-means settings.
+DEFAULT_DIMS = 256
+DEFAULT_MAX_TERMS = 50000
+KMEANS_ITERATIONS = 20
+KMEANS_TRAINING_POINTS_PER_LIST = 256
+
+_POSTING_EXTENSIONS = (".txt", ".md")
+
+
+class PostingMatch(NamedTuple):
+    """A job posting close to a query."""
+    posting_id: str
+    title: str
+    score: float
+
+
+def iter_postings(paths: List[str]) -> Iterator[Tuple[str, str, str]]:
+    """
+    Read job postings.
+    Args:
+        paths (List[str]): Files and directories.
+    Returns:
+        Iterator[Tuple[str, str, str]]: Id, title and text of each posting.
+    """
+    for path in paths:
+        if os.path.isdir(path):
+            for directory, _, filenames in sorted(os.walk(path)):
+                for filename in sorted(filenames):
+                    file_path = os.path.join(directory, filename)
+                    if filename.endswith(".jsonl"):
+                        yield from iter_postings([file_path])
+                    elif filename.endswith(_POSTING_EXTENSIONS):
+                        for _, title, text in iter_postings([file_path]):
+                            yield os.path.relpath(file_path, path), title, text
+        elif path.endswith(".jsonl"):
+            with open(path, encoding="utf-8") as f:
+                for line_number, line in enumerate(f, 1):
+                    if line.strip():
+                        posting = json.loads(line)
+                        text = posting.get("text", "")
+                        yield (str(posting.get("id", f"{path}:{line_number}")),
+                               posting.get("title") or _first_line(text), text)
+        else:
+            with open(path, encoding="utf-8", errors="replace") as f:
+                text = f.read()
+            yield os.path.basename(path), _first_line(text), text
+
+
+def _first_line(text: str) -> str:
+    return next((line.strip() for line in text.splitlines() if line.strip()), "")[:200]
+
+
+def _normalize_rows(vectors: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return vectors / norms
+
+
+def spherical_kmeans(vectors: np.ndarray, n_lists: int, iterations: int = KMEANS_ITERATIONS,
+                     seed: int = 0) -> np.ndarray:
+    """
+    Cluster unit vectors by cosine similarity, training on a sample of them.
+    Args:
+        vectors (np.ndarray): Unit row vectors.
+        n_lists (int): Number of clusters.
+        iterations (int): Lloyd iterations.
+        seed (int): Random seed.
+    Returns:
+        np.ndarray: Unit centroid vectors, one row per cluster.
+    """
+    rng = np.random.default_rng(seed)
+    sample_size = min(len(vectors), n_lists * KMEANS_TRAINING_POINTS_PER_LIST)
+    training = np.asarray(vectors[np.sort(rng.choice(len(vectors), sample_size, replace=False))], dtype=np.float32)
+    centroids = training[rng.choice(len(training), n_lists, replace=False)].copy()
+    for _ in range(iterations):
+        assignment = np.argmax(training @ centroids.T, axis=1)
+        order = np.argsort(assignment, kind="stable")
+        lists, starts = np.unique(assignment[order], return_index=True)
+        sums = np.add.reduceat(training[order], starts, axis=0)
+        updated = centroids.copy()
+        updated[lists] = sums
+        # Lists that lost all their points restart from random training points
+        empty = np.setdiff1d(np.arange(n_lists), lists)
+        if len(empty):
+            updated[empty] = training[rng.choice(len(training), len(empty), replace=False)]
+        centroids = _normalize_rows(updated).astype(np.float32)
+    return centroids
+
+
+def build_posting_index(paths: List[str], output: str = POSTING_INDEX_DIR, dims: int = DEFAULT_DIMS,
+                        n_lists: Optional[int] = None, max_terms: int = DEFAULT_MAX_TERMS,
+                        tfidf_model: Optional[TfidfModel] = None) -> int:
+    """
+    Build the index from job postings and save it, replacing the previous index in one rename.
+    Args:
+        paths (List[str]): Posting files and directories.
+        output (str): Index directory.
+        dims (int): LSA dimensions.
+        n_lists (Optional[int]): Inverted lists; about the square root of the number of postings if omitted.
+        max_terms (int): Most frequent hashed term columns kept for the LSA.
+        tfidf_model (Optional[TfidfModel]): Term weighting; the service's model if omitted.
+    Returns:
+        int: Number of postings indexed.
+    """
+    from scipy.sparse import vstack
+    from sklearn.decomposition import TruncatedSVD
+
+    tfidf_model = tfidf_model or get_tfidf_model()
+    ids, titles, batches, batch = [], [], [], []
+    for posting_id, title, text in iter_postings(paths):
+        ids.append(posting_id)
+        titles.append(title)
+        batch.append(text)
+        if len(batch) >= 5000:
+            batches.append(tfidf_model.hasher.transform(batch))
+            batch = []
+    if batch:
+        batches.append(tfidf_model.hasher.transform(batch))
+    if not ids:
+        raise ValueError("No job postings found")
+    counts = vstack(batches, format="csr")
+
+    # Keep the columns of the most frequent terms; the rest barely move the LSA vectors
+    document_frequency = np.bincount(counts.indices, minlength=counts.shape[1])
+    columns = np.flatnonzero(document_frequency)
+    if len(columns) > max_terms:
+        columns = np.sort(columns[np.argsort(-document_frequency[columns], kind="stable")[:max_terms]])
+    idf = tfidf_model.idf[columns].astype(np.float32)
+    weighted = counts[:, columns].astype(np.float32)
+    weighted.data *= idf[weighted.indices]
+
+    dims = max(1, min(dims, len(columns) - 1, len(ids) - 1))
+    svd = TruncatedSVD(n_components=dims, algorithm="randomized", random_state=0)
+    vectors = _normalize_rows(svd.fit_transform(weighted)).astype(np.float32)
+    components = svd.components_.astype(np.float32)
+
+    n_lists = max(1, min(n_lists or int(np.sqrt(len(ids))), len(ids)))
+    centroids = spherical_kmeans(vectors, n_lists)
+    assignment = np.concatenate([
+        np.argmax(vectors[start:start + 10000] @ centroids.T, axis=1)
+        for start in range(0, len(vectors), 10000)
+    ])
+    # Postings of one list are stored contiguously; offsets[i]:offsets[i + 1] is list i
+    order = np.argsort(assignment, kind="stable")
+    offsets = np.searchsorted(assignment[order], np.arange(n_lists + 1)).astype(np.int64)
+
+    building = f"{output}.building"
+    shutil.rmtree(building, ignore_errors=True)
+    os.makedirs(building)
+    np.save(os.path.join(building, "vectors.npy"), vectors[order])
+    np.save(os.path.join(building, "centroids.npy"), centroids)
+    np.save(os.path.join(building, "offsets.npy"), offsets)
+    np.save(os.path.join(building, "components.npy"), components)
+    np.save(os.path.join(building, "columns.npy"), columns.astype(np.int64))
+    np.save(os.path.join(building, "idf.npy"), idf)
+    with open(os.path.join(building, "postings.json"), "w", encoding="utf-8") as f:
+        json.dump({"ids": [ids[i] for i in order], "titles": [titles[i] for i in order]}, f)
+    with open(os.path.join(building, "meta.json"), "w", encoding="utf-8") as f:
+        json.dump({"postings": len(ids), "dims": dims, "lists": n_lists, "terms": len(columns),
+                   "features": tfidf_model.n_features, "built": time.time()}, f)
+    # Swap the directories; services keep reading their memory-mapped files of the old index until they reload
+    previous = f"{output}.previous"
+    shutil.rmtree(previous, ignore_errors=True)
+    if os.path.exists(output):
+        os.rename(output, previous)
+    os.rename(building, output)
+    shutil.rmtree(previous, ignore_errors=True)
+    return len(ids)
+
+
+class PostingIndex:
+    """Memory-mapped LSA + IVF index of job postings."""
+    def __init__(self, path: str):
+        self.path = path
+        with open(os.path.join(path, "meta.json"), encoding="utf-8") as f:
+            self.meta = json.load(f)
+        with open(os.path.join(path, "postings.json"), encoding="utf-8") as f:
+            postings = json.load(f)
+        self.ids: List[str] = postings["ids"]
+        self.titles: List[str] = postings["titles"]
+        self.vectors = np.load(os.path.join(path, "vectors.npy"), mmap_mode="r")
+        self.components = np.load(os.path.join(path, "components.npy"), mmap_mode="r")
+        self.centroids = np.load(os.path.join(path, "centroids.npy"))
+        self.offsets = np.load(os.path.join(path, "offsets.npy"))
+        self.columns = np.load(os.path.join(path, "columns.npy"))
+        self.idf = np.load(os.path.join(path, "idf.npy"))
+        self._hasher_model = TfidfModel(n_features=int(self.meta["features"]))
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def embed(self, text: str) -> Optional[np.ndarray]:
+        """
+        Embed a text with the index's term weights and LSA projection.
+        Args:
+            text (str): Resume text.
+        Returns:
+            Optional[np.ndarray]: Unit vector, or None if the text has none of the indexed terms.
+        """
+        counts = self._hasher_model.hasher.transform([text])
+        # Positions of the text's term columns among the indexed columns
+        positions = np.searchsorted(self.columns, counts.indices)
+        positions[positions >= len(self.columns)] = 0
+        found = self.columns[positions] == counts.indices
+        if not found.any():
+            return None
+        weights = counts.data[found].astype(np.float32) * self.idf[positions[found]]
+        vector = weights @ self.components[:, positions[found]].T
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else None
+
+    def search(self, text: str, k: int = 10, nprobe: int = POSTING_INDEX_NPROBE) -> List[PostingMatch]:
+        """
+        Find the postings closest to a text.
+        Args:
+            text (str): Resume text.
+            k (int): Number of postings to return.
+            nprobe (int): Inverted lists to search.
+        Returns:
+            List[PostingMatch]: Closest postings by cosine similarity, best first.
+        """
+        query = self.embed(text)
+        if query is None or k <= 0:
+            return []
+        centroid_scores = self.centroids @ query
+        nprobe = min(nprobe, len(centroid_scores))
+        lists = np.sort(np.argpartition(-centroid_scores, nprobe - 1)[:nprobe])
+        # Each list is a contiguous slice of the memory-mapped vectors
+        ranges = [(self.offsets[i], self.offsets[i + 1]) for i in lists if self.offsets[i] < self.offsets[i + 1]]
+        if not ranges:
+            return []
+        rows = np.concatenate([np.arange(start, end) for start, end in ranges])
+        scores = np.concatenate([self.vectors[start:end] @ query for start, end in ranges])
+        if len(scores) > k:
+            best = np.argpartition(-scores, k - 1)[:k]
+        else:
+            best = np.arange(len(scores))
+        best = best[np.argsort(-scores[best], kind="stable")]
+        return [PostingMatch(self.ids[rows[i]], self.titles[rows[i]], round(float(scores[i]), 4)) for i in best]
+
+    def stats(self) -> dict:
+        """
+        Size of the index.
+        Returns:
+            dict: Build metadata (postings, dimensions, lists, terms, build time).
+        """
+        return dict(self.meta)
+
+
+_index: Optional[PostingIndex] = None
+_index_mtime: Optional[float] = None
+_last_check = 0.0
+_lock = threading.Lock()
+
+
+def get_posting_index(path: str = POSTING_INDEX_DIR) -> Optional[PostingIndex]:
+    """
+    Get the posting index, loading it on first use and reloading it after a rebuild.
+    Args:
+        path (str): Index directory.
+    Returns:
+        Optional[PostingIndex]: Current index, or None if none has been built.
+    """
+    global _index, _index_mtime, _last_check
+    now = time.monotonic()
+    if now - _last_check < POSTING_INDEX_CHECK_INTERVAL and _last_check:
+        return _index
+    with _lock:
+        if now - _last_check >= POSTING_INDEX_CHECK_INTERVAL or not _last_check:
+            _last_check = now
+            try:
+                mtime = os.stat(os.path.join(path, "meta.json")).st_mtime
+            except OSError:
+                mtime = None
+            if mtime is not None and mtime != _index_mtime:
+                try:
+                    _index = PostingIndex(path)
+                    _index_mtime = mtime
+                    logger.info(f"Loaded posting index with {len(_index)} postings")
+                except (OSError, ValueError, KeyError) as e:
+                    logger.error(f"Failed to load posting index from {path}: {str(e)}")
+    return _index
+
+
+def main() -> None:
+    """Build the posting index from the command line."""
+    parser = argparse.ArgumentParser(description="Build the nearest job posting index.")
+    parser.add_argument("postings", nargs="+", help="posting text or .jsonl files, or directories of them")
+    parser.add_argument("--output", default=POSTING_INDEX_DIR, help="index directory (default: POSTING_INDEX_DIR)")
+    parser.add_argument("--dims", type=int, default=DEFAULT_DIMS, help="LSA dimensions")
+    parser.add_argument("--lists", type=int, default=None, help="inverted lists (default: sqrt of postings)")
+    parser.add_argument("--max-terms", type=int, default=DEFAULT_MAX_TERMS, help="term columns kept for the LSA")
+    args = parser.parse_args()
+    started = time.perf_counter()
+    count = build_posting_index(args.postings, args.output, args.dims, args.lists, args.max_terms)
+    logger.info(f"Indexed {count} postings into {args.output} in {time.perf_counter() - started:.1f} s")
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+    main()
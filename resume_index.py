@@ -0,0 +1,363 @@
+"""
+Resume search index
+Stored resumes are ranked against a job description with BM25 over an in-memory inverted index,
+so the best candidates out of tens of thousands are found without scoring every resume.
+
+Resumes are kept in a SQLite file (ResumeStore) with a change sequence number per row. Every
+process holds its own ResumeIndex and, before each search, applies the rows changed since it last
+looked, so a resume added or deleted through any worker is searchable from all of them. Postings
+are NumPy arrays per term; deletes only clear a live flag, and the arrays are compacted once
+enough deleted slots pile up.
+"""
+
+import json
+import logging
+import math
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from collections import Counter
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+
+from ats_score import resume_to_text
+from jd_profile import keyword_analyzer
+from models import ResumeData
+from tfidf_model import document_key, record_documents
+
+logger = logging.getLogger(__name__)
+
+RESUME_DB_PATH = os.getenv("RESUME_DB_PATH", "data/resumes.db")
+# BM25 term frequency saturation and document length normalization.
+BM25_K1 = float(os.getenv("BM25_K1", "1.2"))
+BM25_B = float(os.getenv("BM25_B", "0.75"))
+# Share of deleted slots that triggers compaction of the postings.
+INDEX_COMPACT_RATIO = 0.25
+
+
+class SearchHit(NamedTuple):
+    """A resume found for a query."""
+    resume_id: str
+    score: float
+
+
+class _Postings:
+    """Documents containing a term and the term's frequency in each, appended to in place."""
+    __slots__ = ("docs", "tfs", "_pending_docs", "_pending_tfs")
+
+    def __init__(self):
+        self.docs = np.zeros(0, dtype=np.int32)
+        self.tfs = np.zeros(0, dtype=np.float32)
+        self._pending_docs: List[int] = []
+        self._pending_tfs: List[int] = []
+
+    def add(self, slot: int, tf: int) -> None:
+        self._pending_docs.append(slot)
+        self._pending_tfs.append(tf)
+
+    def arrays(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Document slots and term frequencies, including documents added since the last call."""
+        if self._pending_docs:
+            self.docs = np.concatenate([self.docs, np.asarray(self._pending_docs, dtype=np.int32)])
+            self.tfs = np.concatenate([self.tfs, np.asarray(self._pending_tfs, dtype=np.float32)])
+            self._pending_docs, self._pending_tfs = [], []
+        return self.docs, self.tfs
+
+
+def resume_terms(resume_data: ResumeData) -> Dict[str, int]:
+    """
+    Term frequencies of a resume, with the tokenization of the job description keywords.
+    Args:
+        resume_data (ResumeData): Resume to index.
+    Returns:
+        Dict[str, int]: Count per term.
+    """
+    return dict(Counter(keyword_analyzer()(resume_to_text(resume_data))))
+
+
+class ResumeIndex:
+    """In-memory BM25 inverted index over resume term frequencies."""
+    def __init__(self, k1: float = BM25_K1, b: float = BM25_B):
+        self.k1 = k1
+        self.b = b
+        self.postings: Dict[str, _Postings] = {}
+        self.slot_ids: List[Optional[str]] = []
+        self.slots: Dict[str, int] = {}
+        self.lengths = np.zeros(1024, dtype=np.float32)
+        self.alive = np.zeros(1024, dtype=bool)
+        self.total_length = 0.0
+        self._lock = threading.RLock()
+
+    def __len__(self) -> int:
+        return len(self.slots)
+
+    def add(self, resume_id: str, terms: Dict[str, int]) -> None:
+        """
+        Index a resume, replacing an indexed resume with the same id.
+        Args:
+            resume_id (str): Resume id.
+            terms (Dict[str, int]): Term frequencies of the resume.
+        """
+        with self._lock:
+            self.remove(resume_id)
+            slot = len(self.slot_ids)
+            if slot >= len(self.alive):
+                self.lengths = np.concatenate([self.lengths, np.zeros_like(self.lengths)])
+                self.alive = np.concatenate([self.alive, np.zeros_like(self.alive)])
+            self.slot_ids.append(resume_id)
+            self.slots[resume_id] = slot
+            length = sum(terms.values())
+            self.lengths[slot] = length
+            self.alive[slot] = True
+            self.total_length += length
+            for term, tf in terms.items():
+                postings = self.postings.get(term)
+                if postings is None:
+                    postings = self.postings[term] = _Postings()
+                postings.add(slot, tf)
+
+    def remove(self, resume_id: str) -> bool:
+        """
+        Remove a resume from the index.
+        Args:
+            resume_id (str): Resume id.
+        Returns:
+            bool: True if the resume was indexed.
+        """
+        with self._lock:
+            slot = self.slots.pop(resume_id, None)
+            if slot is None:
+                return False
+            self.alive[slot] = False
+            self.slot_ids[slot] = None
+            self.total_length -= float(self.lengths[slot])
+            if len(self.slot_ids) - len(self.slots) > max(1024, len(self.slot_ids) * INDEX_COMPACT_RATIO):
+                self._compact()
+            return True
+
+    def _compact(self) -> None:
+        """Drop deleted slots from the postings and renumber the live ones."""
+        live = np.flatnonzero(self.alive[:len(self.slot_ids)])
+        renumber = np.full(len(self.slot_ids), -1, dtype=np.int32)
+        renumber[live] = np.arange(len(live), dtype=np.int32)
+        for term in list(self.postings):
+            docs, tfs = self.postings[term].arrays()
+            keep = renumber[docs] >= 0
+            if not keep.any():
+                del self.postings[term]
+                continue
+            postings = self.postings[term]
+            postings.docs, postings.tfs = renumber[docs[keep]], tfs[keep]
+        capacity = max(1024, len(live) * 2)
+        lengths = np.zeros(capacity, dtype=np.float32)
+        lengths[:len(live)] = self.lengths[live]
+        alive = np.zeros(capacity, dtype=bool)
+        alive[:len(live)] = True
+        self.lengths, self.alive = lengths, alive
+        self.slot_ids = [self.slot_ids[slot] for slot in live]
+        self.slots = {resume_id: slot for slot, resume_id in enumerate(self.slot_ids)}
+        logger.info(f"Compacted resume index to {len(live)} resumes")
+
+    def search(self, terms: List[str], k: int) -> List[SearchHit]:
+        """
+        Rank indexed resumes by BM25 for query terms.
+        Args:
+            terms (List[str]): Query terms; repeated terms count once.
+            k (int): Number of resumes to return.
+        Returns:
+            List[SearchHit]: Best matching resumes, highest score first; resumes sharing no term are left out.
+        """
+        with self._lock:
+            n_documents = len(self.slots)
+            if not n_documents or k <= 0:
+                return []
+            n_slots = len(self.slot_ids)
+            alive = self.alive[:n_slots]
+            average_length = self.total_length / n_documents or 1.0
+            length_norm = self.k1 * (1 - self.b + self.b * self.lengths[:n_slots] / average_length)
+            scores = np.zeros(n_slots, dtype=np.float32)
+            for term in set(terms):
+                postings = self.postings.get(term)
+                if postings is None:
+                    continue
+                docs, tfs = postings.arrays()
+                live = alive[docs]
+                docs, tfs = docs[live], tfs[live]
+                if not len(docs):
+                    continue
+                idf = math.log(1 + (n_documents - len(docs) + 0.5) / (len(docs) + 0.5))
+                scores[docs] += idf * tfs * (self.k1 + 1) / (tfs + length_norm[docs])
+            candidates = np.flatnonzero(scores > 0)
+            if len(candidates) > k:
+                candidates = candidates[np.argpartition(-scores[candidates], k - 1)[:k]]
+            best = candidates[np.argsort(-scores[candidates], kind="stable")]
+            return [SearchHit(self.slot_ids[slot], round(float(scores[slot]), 4)) for slot in best]
+
+
+class ResumeStore:
+    """
+    Resumes in a SQLite file with their term frequencies, plus an in-memory index kept in sync with it.
+    Safe to share between threads and between processes using the same file.
+    """
+    def __init__(self, path: str = RESUME_DB_PATH):
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self._pid = None
+        self.index = ResumeIndex()
+        self._synced_seq = 0
+        conn = self._conn
+        conn.execute("PRAGMA journal_mode=WAL")
+        # Deleted resumes stay as rows without data, so other processes see the delete when they sync
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS resumes ("
+            "id TEXT PRIMARY KEY, data TEXT, terms TEXT, seq INTEGER NOT NULL, updated REAL NOT NULL)"
+        )
+        conn.execute("CREATE INDEX IF NOT EXISTS resumes_seq ON resumes (seq)")
+
+    @property
+    def _conn(self) -> sqlite3.Connection:
+        """Connection of the current process; a connection and index inherited through fork are never reused."""
+        if self._pid != os.getpid():
+            self._connection = sqlite3.connect(self.path, timeout=30, check_same_thread=False, isolation_level=None)
+            if self._pid is not None:
+                self.index, self._synced_seq = ResumeIndex(), 0
+            self._pid = os.getpid()
+        return self._connection
+
+    def _write(self, resume_id: str, data: Optional[str], terms: Optional[str]) -> bool:
+        """Upsert or tombstone a row under the next sequence number; returns whether a live row existed."""
+        with self._lock:
+            conn = self._conn
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                existed = conn.execute(
+                    "SELECT 1 FROM resumes WHERE id = ? AND data IS NOT NULL", (resume_id,)
+                ).fetchone() is not None
+                if data is not None or existed:
+                    conn.execute(
+                        "INSERT INTO resumes (id, data, terms, seq, updated) "
+                        "VALUES (?, ?, ?, (SELECT COALESCE(MAX(seq), 0) + 1 FROM resumes), ?) "
+                        "ON CONFLICT(id) DO UPDATE SET data = excluded.data, terms = excluded.terms, "
+                        "seq = excluded.seq, updated = excluded.updated",
+                        (resume_id, data, terms, time.time())
+                    )
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+        return existed
+
+    def add(self, resume_data: ResumeData, resume_id: Optional[str] = None) -> str:
+        """
+        Store and index a resume, replacing a stored resume with the same id.
+        Args:
+            resume_data (ResumeData): Resume to store.
+            resume_id (Optional[str]): Resume id; a new one is generated if omitted.
+        Returns:
+            str: Resume id.
+        """
+        resume_id = resume_id or uuid.uuid4().hex
+        terms = resume_terms(resume_data)
+        self._write(resume_id, resume_data.model_dump_json(), json.dumps(terms))
+        self.sync()
+        # Keyed like ExtractionService, so an extracted resume that is then stored is counted once
+        key = document_key(resume_data.rawText) if resume_data.rawText else document_key(f"resume:{resume_id}")
+        record_documents([(key, resume_to_text(resume_data))])
+        return resume_id
+
+    def delete(self, resume_id: str) -> bool:
+        """
+        Delete a stored resume.
+        Args:
+            resume_id (str): Resume id.
+        Returns:
+            bool: True if the resume existed.
+        """
+        existed = self._write(resume_id, None, None)
+        self.sync()
+        return existed
+
+    def get(self, resume_ids: List[str]) -> Dict[str, ResumeData]:
+        """
+        Load stored resumes.
+        Args:
+            resume_ids (List[str]): Resume ids.
+        Returns:
+            Dict[str, ResumeData]: Resume per id found.
+        """
+        if not resume_ids:
+            return {}
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT id, data FROM resumes WHERE data IS NOT NULL AND id IN ({', '.join('?' * len(resume_ids))})",
+                resume_ids
+            ).fetchall()
+        return {resume_id: ResumeData.model_validate_json(data) for resume_id, data in rows}
+
+    def sync(self) -> int:
+        """
+        Apply the rows changed since the last sync to the in-memory index.
+        Returns:
+            int: Number of changes applied.
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT id, terms, seq FROM resumes WHERE seq > ? ORDER BY seq", (self._synced_seq,)
+            ).fetchall()
+        if not rows:
+            return 0
+        with self.index._lock:
+            for resume_id, terms, seq in rows:
+                # Several syncs may fetch the same rows at once; each change is applied once, in order
+                if seq <= self._synced_seq:
+                    continue
+                if terms is None:
+                    self.index.remove(resume_id)
+                else:
+                    self.index.add(resume_id, json.loads(terms))
+                self._synced_seq = seq
+        return len(rows)
+
+    def search(self, job_description: str, k: int) -> List[SearchHit]:
+        """
+        Find the stored resumes matching a job description best.
+        Args:
+            job_description (str): Job description text.
+            k (int): Number of resumes to return.
+        Returns:
+            List[SearchHit]: Best matching resumes, highest BM25 score first.
+        """
+        self.sync()
+        return self.index.search(keyword_analyzer()(job_description), k)
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Size of the index.
+        Returns:
+            Dict[str, int]: Indexed resumes, distinct terms and last applied change.
+        """
+        return {"resumes": len(self.index), "terms": len(self.index.postings), "seq": self._synced_seq}
+
+
+_store: Optional[ResumeStore] = None
+_store_lock = threading.Lock()
+
+
+def get_resume_store() -> ResumeStore:
+    """
+    Get the resume store shared by the API handlers, creating it (and its database file) on first use.
+    Returns:
+        ResumeStore: Store at RESUME_DB_PATH.
+    """
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = ResumeStore()
+    return _store
@@ -0,0 +1,269 @@
+"""
+Production launcher: preforking uvicorn workers that share preloaded models.
+The parent process imports the app, loads spaCy, scikit-learn, the LLM clients and the compiled
+regex tables, freezes the loaded objects out of the garbage collector and then forks the web
+workers, so the read-only model memory stays shared copy-on-write instead of being loaded once
+per worker. Workers serve a socket bound by the parent, are recycled gracefully after a number
+of requests and are respawned when they exit. Per-worker memory is logged periodically.
+
+Usage: python server.py
+"""
+
+import gc
+import logging
+import os
+import random
+import signal
+import socket
+import time
+from typing import Dict, List, Optional
+
+import uvicorn
+
+logger = logging.getLogger("server")
+
+HOST = os.getenv("FASTAPI_HOST", "0.0.0.0")
+PORT = int(os.getenv("FASTAPI_PORT", "8001"))
+WEB_WORKERS = int(os.getenv("WEB_WORKERS", "2"))
+# Recycle a worker after this many requests (0 disables); the jitter spreads recycling of workers apart.
+WORKER_MAX_REQUESTS = int(os.getenv("WORKER_MAX_REQUESTS", "0"))
+WORKER_MAX_REQUESTS_JITTER = int(os.getenv("WORKER_MAX_REQUESTS_JITTER", "0"))
+# Seconds a worker gets to finish in-flight requests when stopped or recycled.
+WORKER_GRACEFUL_TIMEOUT = int(os.getenv("WORKER_GRACEFUL_TIMEOUT", "30"))
+# Seconds between per-worker memory reports (0 disables).
+WORKER_MEMORY_REPORT_INTERVAL = int(os.getenv("WORKER_MEMORY_REPORT_INTERVAL", "60"))
+LOG_LEVEL = os.getenv("LOG_LEVEL", "info").lower()
+
+# Workers exiting sooner than this after starting are respawned with a delay, to avoid a crash loop.
+MIN_WORKER_LIFETIME = 5.0
+
+
+def bind_socket(host: str = HOST, port: int = PORT) -> socket.socket:
+    """
+    Bind the listening socket shared by all workers.
+    Args:
+        host (str): Interface to bind.
+        port (int): Port to bind.
+    Returns:
+        socket.socket: Listening socket.
+    """
+    family = socket.AF_INET6 if ":" in host else socket.AF_INET
+    sock = socket.socket(family, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.listen(2048)
+    sock.set_inheritable(True)
+    return sock
+
+
+def process_memory(pid: int) -> Optional[Dict[str, int]]:
+    """
+    Read the memory use of a process from /proc.
+    Args:
+        pid (int): Process id.
+    Returns:
+        Optional[Dict[str, int]]: rss, pss and shared in kB, or None if the process is gone.
+            pss and shared are 0 where smaps_rollup is unavailable.
+    """
+    fields = {"Rss": 0, "Pss": 0, "Shared_Clean": 0, "Shared_Dirty": 0}
+    try:
+        with open(f"/proc/{pid}/smaps_rollup") as f:
+            for line in f:
+                name, _, value = line.partition(":")
+                if name in fields:
+                    fields[name] = int(value.split()[0])
+    except FileNotFoundError:
+        try:
+            with open(f"/proc/{pid}/status") as f:
+                for line in f:
+                    if line.startswith("VmRSS:"):
+                        fields["Rss"] = int(line.split()[1])
+        except OSError:
+            return None
+    except OSError:
+        return None
+    return {"rss": fields["Rss"], "pss": fields["Pss"], "shared": fields["Shared_Clean"] + fields["Shared_Dirty"]}
+
+
+def child_pids(pid: int) -> List[int]:
+    """
+    List the direct children of a process, e.g. a web worker's extraction processes.
+    Args:
+        pid (int): Process id.
+    Returns:
+        List[int]: Child process ids; empty if the kernel does not expose them.
+    """
+    try:
+        with open(f"/proc/{pid}/task/{pid}/children") as f:
+            return [int(child) for child in f.read().split()]
+    except OSError:
+        return []
+
+
+class PreforkServer:
+    """Parent process that forks, supervises and recycles uvicorn workers."""
+    def __init__(self, app, workers: int = WEB_WORKERS, max_requests: int = WORKER_MAX_REQUESTS,
+                 max_requests_jitter: int = WORKER_MAX_REQUESTS_JITTER):
+        self.app = app
+        self.workers = max(workers, 1)
+        self.max_requests = max_requests
+        self.max_requests_jitter = max_requests_jitter
+        self.sock: Optional[socket.socket] = None
+        self.children: Dict[int, int] = {}  # pid -> worker slot
+        self.started: Dict[int, float] = {}  # pid -> start time
+        self.respawn_at: Dict[int, float] = {}  # worker slot -> time it may be spawned again
+        self.stopping = False
+
+    def spawn(self, slot: int) -> None:
+        """
+        Fork a worker for a slot.
+        Args:
+            slot (int): Worker slot number, used in logs.
+        """
+        limit = None
+        if self.max_requests > 0:
+            limit = self.max_requests + random.randint(0, max(self.max_requests_jitter, 0))
+        pid = os.fork()
+        if pid == 0:
+            self._run_worker(slot, limit)
+        self.children[pid] = slot
+        self.started[pid] = time.monotonic()
+        if self.stopping:
+            # SIGTERM arrived while forking, after _handle_stop signalled the existing workers
+            self._signal(pid, signal.SIGTERM)
+        logger.info(f"Started worker {slot} (pid {pid})" + (f", recycled after {limit} requests" if limit else ""))
+
+    def _run_worker(self, slot: int, limit: Optional[int]) -> None:
+        signal.signal(signal.SIGTERM, signal.SIG_DFL)
+        signal.signal(signal.SIGINT, signal.SIG_DFL)
+        signal.signal(signal.SIGHUP, signal.SIG_DFL)
+        random.seed()
+        exit_code = 0
+        try:
+            config = uvicorn.Config(
+                self.app,
+                limit_max_requests=limit,
+                timeout_graceful_shutdown=WORKER_GRACEFUL_TIMEOUT,
+                log_level=LOG_LEVEL,
+            )
+            uvicorn.Server(config).run(sockets=[self.sock])
+        except SystemExit as e:
+            exit_code = e.code if isinstance(e.code, int) else 1
+        except BaseException as e:
+            logger.error(f"Worker {slot} failed: {str(e)}")
+            exit_code = 1
+        finally:
+            os._exit(exit_code)
+
+    def _handle_stop(self, signum, frame) -> None:
+        self.stopping = True
+        for pid in list(self.children):
+            self._signal(pid, signal.SIGTERM)
+
+    def _handle_reload(self, signum, frame) -> None:
+        logger.info("Recycling all workers")
+        for pid in list(self.children):
+            self._signal(pid, signal.SIGTERM)
+
+    @staticmethod
+    def _signal(pid: int, signum: int) -> None:
+        try:
+            os.kill(pid, signum)
+        except ProcessLookupError:
+            pass
+
+    def report_memory(self) -> None:
+        """Log RSS, PSS and shared memory of every worker and of its extraction processes."""
+        for pid, slot in sorted(self.children.items(), key=lambda item: item[1]):
+            usage = process_memory(pid)
+            if usage is None:
+                continue
+            line = (f"Worker {slot} (pid {pid}): rss={usage['rss'] // 1024} MB "
+                    f"pss={usage['pss'] // 1024} MB shared={usage['shared'] // 1024} MB")
+            extraction = [u for u in (process_memory(child) for child in child_pids(pid)) if u is not None]
+            if extraction:
+                line += (f"; {len(extraction)} extraction processes: "
+                         f"rss={sum(u['rss'] for u in extraction) // 1024} MB "
+                         f"pss={sum(u['pss'] for u in extraction) // 1024} MB")
+            logger.info(line)
+
+    def reap(self) -> None:
+        """Collect exited workers and schedule their respawn unless the server is stopping."""
+        while self.children:
+            try:
+                pid, status = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                return
+            if pid == 0:
+                return
+            slot = self.children.pop(pid, None)
+            started = self.started.pop(pid, time.monotonic())
+            if slot is None:
+                continue
+            code = os.waitstatus_to_exitcode(status)
+            logger.info(f"Worker {slot} (pid {pid}) exited with code {code}")
+            if self.stopping:
+                continue
+            delay = 0.0
+            if code != 0 and time.monotonic() - started < MIN_WORKER_LIFETIME:
+                logger.error(f"Worker {slot} exited right after starting, respawning in {MIN_WORKER_LIFETIME:.0f}s")
+                delay = MIN_WORKER_LIFETIME
+            self.respawn_at[slot] = time.monotonic() + delay
+
+    def respawn(self) -> None:
+        """Spawn the workers whose respawn time has passed; a stopping server drops them instead."""
+        now = time.monotonic()
+        for slot, due in sorted(self.respawn_at.items()):
+            if self.stopping:
+                self.respawn_at.clear()
+                return
+            if due <= now:
+                del self.respawn_at[slot]
+                self.spawn(slot)
+
+    def run(self, host: str = HOST, port: int = PORT) -> None:
+        """
+        Bind the socket, fork the workers and supervise them until SIGTERM or SIGINT.
+        SIGHUP recycles all workers.
+        Args:
+            host (str): Interface to bind.
+            port (int): Port to bind.
+        """
+        self.sock = bind_socket(host, port)
+        logger.info(f"Listening on {host}:{port} with {self.workers} workers")
+        # Objects loaded so far are never freed; keeping them out of GC passes avoids writes
+        # to their headers that would copy the shared pages into each worker.
+        gc.collect()
+        gc.freeze()
+        signal.signal(signal.SIGTERM, self._handle_stop)
+        signal.signal(signal.SIGINT, self._handle_stop)
+        signal.signal(signal.SIGHUP, self._handle_reload)
+        for slot in range(self.workers):
+            if self.stopping:
+                break
+            self.spawn(slot)
+        last_report = time.monotonic()
+        # A crash-looping slot may have no process while it waits for its respawn time
+        while self.children or (self.respawn_at and not self.stopping):
+            self.reap()
+            self.respawn()
+            if WORKER_MEMORY_REPORT_INTERVAL > 0 and time.monotonic() - last_report >= WORKER_MEMORY_REPORT_INTERVAL:
+                self.report_memory()
+                last_report = time.monotonic()
+            time.sleep(0.5)
+        self.sock.close()
+        logger.info("All workers stopped")
+
+
+def main() -> None:
+    """Import the app, preload models in this process and serve it with forked workers."""
+    from main import app, ats_scorer
+    from warmup import preload_models
+    started = time.perf_counter()
+    preload_models(ats_scorer)
+    logger.info(f"Preloaded models in {(time.perf_counter() - started) * 1000:.0f} ms")
+    PreforkServer(app).run()
+
+
+if __name__ == "__main__":
+    main()
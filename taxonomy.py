@@ -0,0 +1,314 @@
+"""
+Skill and job title taxonomy
+Canonical skills and job titles with their aliases are loaded from a JSON data file and compiled
+into token tries, so every taxonomy entry mentioned anywhere in a resume or job description is
+found in a single left-to-right pass over the text (leftmost-longest match on whole tokens).
+The file is reloaded when its modification time changes, or on demand through reload_taxonomy().
+
+Each entry has a canonical "name" and optionally:
+    aliases: other spellings, matched case-insensitively in free text and for normalization.
+    exactAliases: ambiguous spellings (e.g. "pm", "db") used only to normalize a whole listed value.
+    caseSensitive: spellings matched in free text only with exactly this casing (e.g. "Go", "Excel").
+    category: skill category, e.g. "programming_language" or "soft_skill".
+
+The bundled data/skills_taxonomy.json is a seed of about 680 skills and 110 job titles, and the
+missing-skill detection of the ATS report only knows the skills in the loaded file. To use a larger
+taxonomy (e.g. one converted from ESCO, O*NET or a commercial skills library):
+    1. Write it in the format above: {"version": ..., "skills": [...], "titles": [...]}.
+    2. Either replace data/skills_taxonomy.json, or set TAXONOMY_PATH to the new file in every
+       process (an environment change needs a restart).
+    3. POST /taxonomy/reload to load it in the worker serving the request. Other workers reload it
+       within TAXONOMY_CHECK_INTERVAL seconds of the file's modification. The response reports the
+       version and entry counts, and the log warns about aliases that map to two entries.
+Tries grow linearly with the number of aliases, and matching cost depends only on the text length,
+so taxonomies with tens of thousands of entries need no other change.
+"""
+
+import json
+import logging
+import os
+import re
+import threading
+import time
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+from date_ranges import find_date_ranges
+
+logger = logging.getLogger(__name__)
+
+TAXONOMY_PATH = os.getenv(
+    "TAXONOMY_PATH", os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "skills_taxonomy.json")
+)
+# Seconds between checks of the data file for changes.
+TAXONOMY_CHECK_INTERVAL = float(os.getenv("TAXONOMY_CHECK_INTERVAL", "5"))
+
+# Words, with the inner punctuation of names like "node.js", "c++", "c#", ".net" and "r&d" kept.
+# Other punctuation ("-", "/", ",") separates tokens, so "CI/CD" and "ci cd" match alike.
+_TOKEN_PATTERN = re.compile(r'\.?[A-Za-z0-9][A-Za-z0-9+#&]*(?:\.[A-Za-z0-9][A-Za-z0-9+#&]*)*')
+
+_TERMINAL = ""
+
+
+class TaxonomyMatch(NamedTuple):
+    """A taxonomy entry found in a text."""
+    name: str
+    start: int
+    end: int
+    text: str
+
+
+def tokenize(text: str) -> List[Tuple[str, int, int]]:
+    """
+    Split text into taxonomy tokens.
+    Args:
+        text (str): Text to split.
+    Returns:
+        List[Tuple[str, int, int]]: Token text, start and end offset.
+    """
+    return [(m.group(), m.start(), m.end()) for m in _TOKEN_PATTERN.finditer(text)]
+
+
+def phrase_key(phrase: str) -> str:
+    """
+    Normalization key of a phrase: its lowercase tokens joined by single spaces.
+    Args:
+        phrase (str): Skill or title as written.
+    Returns:
+        str: Lookup key.
+    """
+    return " ".join(token for token, _, _ in tokenize(phrase.lower()))
+
+
+class TokenTrie:
+    """Trie over lowercase tokens of alias phrases, finding all non-overlapping longest matches in a text."""
+    def __init__(self):
+        self.root: Dict = {}
+        self.phrases = 0
+
+    def add(self, phrase: str, name: str, case_sensitive: bool = False) -> None:
+        """
+        Add an alias phrase.
+        Args:
+            phrase (str): Alias as written.
+            name (str): Canonical name it maps to.
+            case_sensitive (bool): Match only with the exact casing of the phrase.
+        """
+        tokens = [token for token, _, _ in tokenize(phrase)]
+        if not tokens:
+            return
+        node = self.root
+        for token in tokens:
+            node = node.setdefault(token.lower(), {})
+        node.setdefault(_TERMINAL, []).append((name, tokens if case_sensitive else None))
+        self.phrases += 1
+
+    def find(self, text: str) -> List[TaxonomyMatch]:
+        """
+        Find alias phrases in text, preferring the longest match at each position.
+        Args:
+            text (str): Text to scan.
+        Returns:
+            List[TaxonomyMatch]: Matches in text order.
+        """
+        tokens = tokenize(text)
+        lowered = [token.lower() for token, _, _ in tokens]
+        matches = []
+        i = 0
+        while i < len(tokens):
+            node = self.root
+            best: Optional[Tuple[str, int]] = None
+            j = i
+            while j < len(tokens):
+                node = node.get(lowered[j])
+                if node is None:
+                    break
+                j += 1
+                for name, exact_tokens in node.get(_TERMINAL, ()):
+                    if exact_tokens is None or exact_tokens == [token for token, _, _ in tokens[i:j]]:
+                        best = (name, j)
+                        break
+            if best is None:
+                i += 1
+                continue
+            name, j = best
+            start, end = tokens[i][1], tokens[j - 1][2]
+            matches.append(TaxonomyMatch(name, start, end, text[start:end]))
+            i = j
+        return matches
+
+
+class Taxonomy:
+    """Compiled skill and job title taxonomy."""
+    def __init__(self, data: Dict, source: str = ""):
+        self.version = str(data.get("version", ""))
+        self.source = source
+        self.skill_categories: Dict[str, str] = {}
+        self.skill_names, self.skill_trie = self._compile(data.get("skills", []), "skill")
+        self.title_names, self.title_trie = self._compile(data.get("titles", []), "title")
+        for entry in data.get("skills", []):
+            if entry.get("category"):
+                self.skill_categories[entry["name"]] = entry["category"]
+
+    @staticmethod
+    def _compile(entries: List[Dict], kind: str) -> Tuple[Dict[str, str], TokenTrie]:
+        names: Dict[str, str] = {}
+        trie = TokenTrie()
+        for entry in entries:
+            name = entry["name"]
+            case_sensitive = entry.get("caseSensitive", [])
+            exact = entry.get("exactAliases", [])
+            spotted = [name] + entry.get("aliases", []) if name not in case_sensitive else entry.get("aliases", [])
+            for alias in [name] + entry.get("aliases", []) + exact + case_sensitive:
+                key = phrase_key(alias)
+                if key and names.setdefault(key, name) != name:
+                    logger.warning(f"Taxonomy {kind} alias '{alias}' of {name} already maps to {names[key]}")
+            for alias in spotted:
+                trie.add(alias, name)
+            for alias in case_sensitive:
+                trie.add(alias, name, case_sensitive=True)
+        return names, trie
+
+    @classmethod
+    def from_file(cls, path: str) -> "Taxonomy":
+        """
+        Load and compile a taxonomy data file.
+        Args:
+            path (str): Path of the JSON file.
+        Returns:
+            Taxonomy: Compiled taxonomy.
+        """
+        with open(path, encoding="utf-8") as f:
+            return cls(json.load(f), source=path)
+
+    def normalize_skill(self, skill: str) -> str:
+        """
+        Map a listed skill to its canonical name.
+        Args:
+            skill (str): Skill as written.
+        Returns:
+            str: Canonical name, or the stripped input if it is not in the taxonomy.
+        """
+        return self.skill_names.get(phrase_key(skill), skill.strip())
+
+    def normalize_title(self, title: str) -> str:
+        """
+        Map a job title to its canonical name.
+        Args:
+            title (str): Job title as written.
+        Returns:
+            str: Canonical name, or the stripped input if it is not in the taxonomy.
+        """
+        return self.title_names.get(phrase_key(title), title.strip())
+
+    def find_skills(self, text: str) -> List[TaxonomyMatch]:
+        """
+        Find every skill mentioned in free text. Words that are part of a date or date range
+        (the "Spring" of "Spring 2020 - Summer 2020") are not skills.
+        Args:
+            text (str): Resume or job description text.
+        Returns:
+            List[TaxonomyMatch]: Skill mentions in text order, with canonical names.
+        """
+        matches = self.skill_trie.find(text)
+        if not matches:
+            return matches
+        dates = [(date.span_start, date.span_end) for date in find_date_ranges(text)]
+        if not dates:
+            return matches
+        return [match for match in matches
+                if not any(start <= match.start and match.end <= end for start, end in dates)]
+
+    def find_titles(self, text: str) -> List[TaxonomyMatch]:
+        """
+        Find every job title mentioned in free text.
+        Args:
+            text (str): Resume or job description text.
+        Returns:
+            List[TaxonomyMatch]: Title mentions in text order, with canonical names.
+        """
+        return self.title_trie.find(text)
+
+    def stats(self) -> Dict[str, object]:
+        """
+        Size of the taxonomy.
+        Returns:
+            Dict[str, object]: Version, source file and entry and alias counts.
+        """
+        return {
+            "version": self.version,
+            "source": self.source,
+            "skills": len(set(self.skill_names.values())),
+            "titles": len(set(self.title_names.values())),
+            "skillAliases": len(self.skill_names),
+            "titleAliases": len(self.title_names),
+        }
+
+
+_taxonomy: Optional[Taxonomy] = None
+_taxonomy_mtime: Optional[float] = None
+_last_check = 0.0
+_lock = threading.Lock()
+
+
+def _load(path: str) -> Optional[Taxonomy]:
+    """Load the taxonomy file, keeping the current taxonomy if it cannot be read."""
+    global _taxonomy, _taxonomy_mtime
+    mtime = None
+    try:
+        mtime = os.stat(path).st_mtime
+        taxonomy = Taxonomy.from_file(path)
+    except (OSError, ValueError, KeyError) as e:
+        logger.error(f"Failed to load taxonomy from {path}: {str(e)}")
+        if _taxonomy is None:
+            _taxonomy = Taxonomy({}, source=path)
+        # A broken file is not retried until it changes again
+        _taxonomy_mtime = mtime
+        return None
+    _taxonomy, _taxonomy_mtime = taxonomy, mtime
+    logger.info(f"Loaded taxonomy {taxonomy.version} with {len(taxonomy.skill_names)} skill "
+                f"and {len(taxonomy.title_names)} title aliases")
+    return taxonomy
+
+
+def get_taxonomy(path: str = TAXONOMY_PATH) -> Taxonomy:
+    """
+    Get the compiled taxonomy, loading it on first use and reloading it when the file changed.
+    Returns:
+        Taxonomy: Current taxonomy (empty if the file could never be read).
+    """
+    global _last_check
+    now = time.monotonic()
+    if _taxonomy is not None and now - _last_check < TAXONOMY_CHECK_INTERVAL:
+        return _taxonomy
+    with _lock:
+        if _taxonomy is None:
+            _load(path)
+        elif now - _last_check >= TAXONOMY_CHECK_INTERVAL:
+            try:
+                changed = os.stat(path).st_mtime != _taxonomy_mtime
+            except OSError:
+                changed = False
+            if changed:
+                _load(path)
+        _last_check = now
+    return _taxonomy
+
+
+def reload_taxonomy(path: str = TAXONOMY_PATH) -> Taxonomy:
+    """
+    Reload the taxonomy file now.
+    Other processes pick up the change on their next file check.
+    Args:
+        path (str): Path of the JSON file.
+    Returns:
+        Taxonomy: The reloaded taxonomy.
+    Raises:
+        ValueError: If the file cannot be loaded; the previous taxonomy stays in use.
+    """
+    global _last_check
+    with _lock:
+        taxonomy = _load(path)
+        _last_check = time.monotonic()
+    if taxonomy is None:
+        raise ValueError(f"Taxonomy file {path} could not be loaded")
+    return taxonomy
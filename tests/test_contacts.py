@@ -0,0 +1,51 @@
+import pytest
+
+from contacts import HEADER_LINES, scan_contacts
+
+FILLER = ["Built services and dashboards."] * HEADER_LINES
+
+
+@pytest.mark.parametrize("text, field, expected", [
+    ("Jane Doe\njane.doe@example.com | (555) 123-4567", "email", "jane.doe@example.com"),
+    ("Jane Doe\njane.doe@example.com | (555) 123-4567", "phone", "(555) 123-4567"),
+    ("Jane Doe\n+1 555 123 4567", "phone", "+1 555 123 4567"),
+    ("Jane Doe\nlinkedin.com/in/janedoe", "linkedin", "https://linkedin.com/in/janedoe"),
+    ("Jane Doe\nhttps://janedoe.dev", "website", "https://janedoe.dev"),
+    ("Jane Doe\nSpringfield, IL 62704", "address", "Springfield, IL 62704"),
+    ("Jane Doe\nAddress: 12 Main Street, Springfield", "address", "12 Main Street, Springfield"),
+])
+def test_fields(text, field, expected):
+    assert scan_contacts(text).value(field) == expected
+
+
+@pytest.mark.parametrize("text", [
+    "Engineer, Acme Corp 2016-2020",
+    "Released on 2019-03-15",
+    "Order 12345",
+])
+def test_years_and_short_numbers_are_not_phones(text):
+    assert scan_contacts(text).value("phone") is None
+
+
+@pytest.mark.parametrize("lines, expected", [
+    # A "+"-prefixed number in the body does not beat the phone in the header
+    (["Jane Doe", "(555) 123-4567", "Experience",
+      "Worked with the London office (+44 20 7946 0958) daily."], "(555) 123-4567"),
+    # Within the header, the earlier line wins over a more confident format
+    (["Jane Doe", "555 123 4567", "+1 555 987 6543"], "555 123 4567"),
+    # A phone in the header beats references at the end of a long resume
+    (["Jane Doe", "(555) 123-4567"] + FILLER + ["References", "John Roe +1 555 987 6543"], "(555) 123-4567"),
+    # Outside the header, the first number wins
+    (["Jane Doe"] + FILLER + ["Phone: 555 123 4567", "Reference: +1 555 987 6543"], "555 123 4567"),
+])
+def test_phone_ranking(lines, expected):
+    assert scan_contacts("\n".join(lines)).value("phone") == expected
+
+
+def test_candidates_record_line_and_header():
+    text = "\n".join(["Jane Doe", "jane@example.com"] + FILLER + ["Reference: john@example.com"])
+    emails = scan_contacts(text).candidates["email"]
+    assert [(c.value, c.line, c.in_header) for c in emails] == [
+        ("jane@example.com", 1, True),
+        ("john@example.com", HEADER_LINES + 2, False),
+    ]
@@ -0,0 +1,65 @@
+import pytest
+
+from date_ranges import find_date_ranges, is_present, month_ordinal
+
+
+@pytest.mark.parametrize("text, start, end, current", [
+    ("Jan 2020 – Present", "Jan 2020", "Present", True),
+    ("May 2019 to date", "May 2019", "Present", True),
+    ("Sept. 2019 till date", "Sept. 2019", "Present", True),
+    ("2018 - now", "2018", "Present", True),
+    ("03/2019-06/2021", "03/2019", "06/2021", False),
+    ("2019-03 to 2020-11", "2019-03", "2020-11", False),
+    ("Spring 2020 - Summer 2020", "Spring 2020", "Summer 2020", False),
+    ("Jan - Mar 2020", "Jan 2020", "Mar 2020", False),
+    ("Summer '18 - Fall '19", "Summer '18", "Fall '19", False),
+    ("Engineer, Acme Corp, 2016 - 2020", "2016", "2020", False),
+])
+def test_find_date_ranges(text, start, end, current):
+    ranges = find_date_ranges(text)
+    assert [(r.start, r.end, r.current) for r in ranges] == [(start, end, current)]
+    assert ranges[0].start_ordinal is not None
+
+
+@pytest.mark.parametrize("text, dates", [
+    ("Graduated 2017", [("2017", "")]),
+    ("Mar 2021 - Jan 2020", []),  # ends before it starts
+    ("Python, SQL, Docker", []),
+    ("Call 555-123-4567", []),
+])
+def test_single_dates_and_non_dates(text, dates):
+    assert [(r.start, r.end) for r in find_date_ranges(text)] == dates
+
+
+def test_short_range_start_takes_the_end_year():
+    (date_range,) = find_date_ranges("Jan - Mar 2020")
+    assert date_range.start_ordinal == month_ordinal("Jan 2020")
+    assert date_range.end_ordinal == month_ordinal("Mar 2020")
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("Present", True),
+    ("present.", True),
+    ("To Date", True),
+    ("currently", True),
+    ("ongoing", True),
+    ("2020", False),
+    ("Jan 2020", False),
+    ("presentation", False),
+])
+def test_is_present(text, expected):
+    assert is_present(text) is expected
+
+
+@pytest.mark.parametrize("text, end, expected", [
+    ("Jan 2020", False, 2020 * 12),
+    ("Fall 2019", False, 2019 * 12 + 8),
+    ("2019", False, 2019 * 12),
+    ("2019", True, 2019 * 12 + 11),
+    ("03/2019", False, 2019 * 12 + 2),
+    ("15/03/2019", False, 2019 * 12 + 2),
+    ("'98", False, None),
+    ("Present", True, None),
+])
+def test_month_ordinal(text, end, expected):
+    assert month_ordinal(text, end=end) == expected
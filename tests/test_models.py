@@ -0,0 +1,18 @@
+from models import Education, Experience
+
+
+def test_dates_out_of_order_are_accepted_while_editing():
+    experience = Experience(company="Acme", position="Engineer", startDate="2020-05", endDate="2019",
+                            description="Built services")
+    assert (experience.startDate, experience.endDate) == ("2020-05", "2019")
+    education = Education(institution="State University", degree="BSc", field="CS",
+                          startDate="2018", endDate="2016")
+    assert education.endDate == "2016"
+
+
+def test_open_ended_end_dates_are_normalized():
+    experience = Experience(company="Acme", position="Engineer", startDate="May 2019", endDate="to date",
+                            description="Built services")
+    assert (experience.endDate, experience.current) == ("Present", True)
+    education = Education(institution="State University", degree="BSc", field="CS", endDate="ongoing")
+    assert education.endDate == "Present"
@@ -0,0 +1,112 @@
+import pytest
+
+import tfidf_model
+from models import PersonalInfo, ResumeData
+from resume_index import INDEX_COMPACT_RATIO, ResumeIndex, ResumeStore
+
+
+@pytest.fixture(autouse=True)
+def no_tfidf_updates(monkeypatch):
+    monkeypatch.setattr(tfidf_model, "TFIDF_UPDATE_INTERVAL", 0)
+
+
+def make_resume(name, skills, summary=None):
+    return ResumeData(
+        personalInfo=PersonalInfo(fullName=name, email=f"{name.split()[0].lower()}@example.com"),
+        summary=summary,
+        skills=skills,
+    )
+
+
+def ids(hits):
+    return [hit.resume_id for hit in hits]
+
+
+def test_add_replace_delete_then_search(tmp_path):
+    store = ResumeStore(str(tmp_path / "resumes.db"))
+    store.add(make_resume("Ada Lovelace", ["Python", "Django", "PostgreSQL"]), "ada")
+    store.add(make_resume("Grace Hopper", ["Java", "Spring Boot", "Kafka"]), "grace")
+    store.add(make_resume("Linus Torvalds", ["C", "Linux", "Git"]), "linus")
+
+    assert ids(store.search("Python developer with Django", 5)) == ["ada"]
+    assert ids(store.search("Java Kafka engineer", 5)) == ["grace"]
+
+    # Replacing a resume drops its old terms from the index
+    store.add(make_resume("Ada Lovelace", ["Kafka", "Scala"]), "ada")
+    assert store.search("Python developer with Django", 5) == []
+    assert set(ids(store.search("Kafka", 5))) == {"ada", "grace"}
+    assert store.get(["ada"])["ada"].skills == ["Kafka", "Scala"]
+
+    assert store.delete("grace") is True
+    assert store.delete("grace") is False
+    assert ids(store.search("Kafka", 5)) == ["ada"]
+    assert store.get(["grace"]) == {}
+    assert store.stats()["resumes"] == 2
+
+
+def test_search_returns_at_most_k_best_first(tmp_path):
+    store = ResumeStore(str(tmp_path / "resumes.db"))
+    store.add(make_resume("Ada Lovelace", ["Python"]), "one")
+    store.add(make_resume("Alan Turing", ["Python", "SQL"], "Python and SQL analyst"), "two")
+    store.add(make_resume("Grace Hopper", ["SQL"]), "three")
+
+    hits = store.search("Python SQL", 2)
+    assert ids(hits) == ["two", hits[1].resume_id]
+    assert hits[0].score > hits[1].score > 0
+    assert store.search("Python SQL", 0) == []
+
+
+def test_compaction_keeps_ids_and_scores():
+    index = ResumeIndex()
+    reference = ResumeIndex()
+    n_resumes = 1600
+    for i in range(n_resumes):
+        terms = {"python": 1 + i % 3, f"skill{i % 7}": 2, f"unique{i}": 1}
+        if i % 2:
+            terms["sql"] = 1
+        index.add(f"r{i}", terms)
+        if i % 5 == 0:
+            reference.add(f"r{i}", terms)
+    # Delete enough resumes to cross the compaction threshold
+    for i in range(n_resumes):
+        if i % 5:
+            index.remove(f"r{i}")
+    assert n_resumes - len(index) > max(1024, n_resumes * INDEX_COMPACT_RATIO)
+    # Compacted at least once: deleted slots were dropped and the survivors renumbered
+    assert len(index.slot_ids) < n_resumes
+    assert len(index) == len(reference)
+    assert all(index.slot_ids[slot] == resume_id for resume_id, slot in index.slots.items())
+
+    for query in (["python"], ["sql", "skill3"], ["unique10", "python"], ["unique11"]):
+        hits = index.search(query, 50)
+        expected = reference.search(query, 50)
+        assert ids(hits) == ids(expected)
+        assert [hit.score for hit in hits] == pytest.approx([hit.score for hit in expected])
+
+    # The compacted index keeps accepting changes
+    index.add("new", {"python": 5})
+    index.remove("r0")
+    assert ids(index.search(["python"], 1)) == ["new"]
+    assert "r0" not in ids(index.search(["python"], 1000))
+
+
+def test_second_store_sees_changes(tmp_path):
+    path = str(tmp_path / "resumes.db")
+    writer = ResumeStore(path)
+    reader = ResumeStore(path)
+    assert reader.search("Python", 5) == []
+
+    writer.add(make_resume("Ada Lovelace", ["Python", "Django"]), "ada")
+    writer.add(make_resume("Grace Hopper", ["Java"]), "grace")
+    assert ids(reader.search("Python", 5)) == ["ada"]
+    assert reader.get(["grace"])["grace"].personalInfo.fullName == "Grace Hopper"
+
+    writer.add(make_resume("Ada Lovelace", ["Java"]), "ada")
+    writer.delete("grace")
+    assert ids(reader.search("Java", 5)) == ["ada"]
+    assert reader.search("Python", 5) == []
+    assert reader.stats()["seq"] == writer.stats()["seq"]
+
+    # Changes flow the other way too
+    reader.add(make_resume("Alan Turing", ["Python"]), "alan")
+    assert ids(writer.search("Python", 5)) == ["alan"]
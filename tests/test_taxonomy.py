@@ -0,0 +1,25 @@
+import pytest
+
+from taxonomy import Taxonomy
+
+TAXONOMY = Taxonomy({
+    "skills": [
+        {"name": "Spring", "aliases": ["spring framework"], "caseSensitive": ["Spring"]},
+        {"name": "Spring Boot"},
+        {"name": "Go", "aliases": ["golang"], "caseSensitive": ["Go"]},
+        {"name": "Java"},
+    ],
+})
+
+
+@pytest.mark.parametrize("text, skills", [
+    ("Intern, Acme Corp, Spring 2020 - Summer 2020", []),
+    ("Graduated Spring 2019", []),
+    ("Spring - Summer 2020, Java", ["Java"]),
+    ("Built APIs with Spring and Go", ["Spring", "Go"]),
+    ("Java Spring Boot services since 2019", ["Java", "Spring Boot"]),
+    ("spring cleaning, go home", []),  # case-sensitive aliases
+    ("Golang and the Spring Framework", ["Go", "Spring"]),
+])
+def test_find_skills(text, skills):
+    assert [match.name for match in TAXONOMY.find_skills(text)] == skills
@@ -0,0 +1,33 @@
+import tfidf_model
+from jd_profile import JobDescriptionProfileCache
+from tfidf_model import TfidfModel, document_key, record_documents, update_model
+
+
+def test_documents_are_counted_once_across_merges(tmp_path, monkeypatch):
+    path = str(tmp_path / "idf.npz")
+    monkeypatch.setattr(tfidf_model, "TFIDF_UPDATE_BATCH", 1000)
+    raw_text = "Jane Doe python developer kubernetes"
+    record_documents([(document_key(raw_text), raw_text)], path)
+    record_documents([(document_key("other"), "data analyst sql")], path)
+    assert update_model(path) == 2
+    # The same resume stored later, as a longer text under the same key
+    record_documents([(document_key(raw_text), raw_text + " skills python")], path)
+    assert update_model(path) == 0
+    model = TfidfModel.load(path)
+    assert model.n_documents == 2
+    assert len(model.document_keys) == 2
+
+
+def test_profiles_survive_a_model_reload(monkeypatch):
+    models = [TfidfModel(n_features=2 ** 12)]
+    monkeypatch.setattr("jd_profile.get_tfidf_model", lambda: models[-1])
+    cache = JobDescriptionProfileCache()
+    profile = cache.get("Backend engineer with Python and SQL")
+    models.append(TfidfModel(n_features=2 ** 12))
+    models[-1].partial_fit(["python python", "sql"])
+    refreshed = cache.get("Backend engineer with Python and SQL")
+    assert refreshed is not profile
+    assert refreshed.tfidf_model is models[-1] and profile.tfidf_model is models[0]
+    assert refreshed.keywords is profile.keywords and refreshed.skills is profile.skills
+    assert (refreshed.vector != profile.vector).nnz > 0
+    assert cache.get("Backend engineer with Python and SQL") is refreshed
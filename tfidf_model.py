@@ -0,0 +1,372 @@
+"""
+Corpus-level TF-IDF model
+Term frequencies are computed with a stateless hashing vectorizer (unigrams and bigrams hashed into
+a fixed number of columns, so memory does not grow with the vocabulary), and inverse document
+frequencies come from document-frequency counts saved to disk. Requests only transform text. The
+counts can be fitted offline on a corpus of resumes and job descriptions with the command below, and
+the service keeps them current: extracted and stored resumes are recorded with record_documents()
+and merged into the file every TFIDF_UPDATE_INTERVAL seconds under a file lock, so every process
+adds its documents to the same counts. The file also keeps a 64-bit key of every merged document,
+so a resume that is both extracted and stored is counted once. The file is reloaded when its modification time changes.
+
+Usage: python tfidf_model.py [--update] [--output PATH] CORPUS [CORPUS ...]
+    CORPUS is a .txt/.md file (one document), a .jsonl file (one {"text": ...} document per line)
+    or a directory searched recursively for both.
+"""
+
+import argparse
+import fcntl
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+TFIDF_MODEL_PATH = os.getenv(
+    "TFIDF_MODEL_PATH", os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "tfidf_idf.npz")
+)
+# Number of hashed term columns; a power of two keeps collisions between frequent terms rare.
+TFIDF_FEATURES = int(os.getenv("TFIDF_FEATURES", str(2 ** 20)))
+# Seconds between checks of the model file for changes.
+TFIDF_CHECK_INTERVAL = float(os.getenv("TFIDF_CHECK_INTERVAL", "30"))
+# Seconds between merges of recorded documents into the model file; 0 disables online updates.
+TFIDF_UPDATE_INTERVAL = float(os.getenv("TFIDF_UPDATE_INTERVAL", "300"))
+# Recorded documents that trigger a merge before the interval is up.
+TFIDF_UPDATE_BATCH = int(os.getenv("TFIDF_UPDATE_BATCH", "1000"))
+
+_CORPUS_EXTENSIONS = (".txt", ".md")
+
+
+class TfidfModel:
+    """Hashed term frequencies weighted by document frequencies counted over a corpus."""
+    def __init__(self, n_features: int = TFIDF_FEATURES, document_frequency: Optional[np.ndarray] = None,
+                 n_documents: int = 0, source: str = "", document_keys: Optional[np.ndarray] = None):
+        self.n_features = n_features
+        self.document_frequency = (document_frequency if document_frequency is not None
+                                   else np.zeros(n_features, dtype=np.int64))
+        self.n_documents = n_documents
+        # Sorted keys (see document_key) of the documents merged online
+        self.document_keys = document_keys if document_keys is not None else np.zeros(0, dtype=np.uint64)
+        self.source = source
+        self.idf = self._compute_idf(self.document_frequency, n_documents)
+        self._hasher = None
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _compute_idf(document_frequency: np.ndarray, n_documents: int) -> np.ndarray:
+        # Smoothed as in scikit-learn: an unseen term gets the highest weight, and without a corpus every weight is 1
+        return np.log((1.0 + n_documents) / (1.0 + document_frequency)) + 1.0
+
+    @property
+    def hasher(self):
+        """Stateless hashing vectorizer producing raw term counts, created on first use."""
+        if self._hasher is None:
+            from sklearn.feature_extraction.text import HashingVectorizer
+            self._hasher = HashingVectorizer(
+                n_features=self.n_features,
+                stop_words='english',
+                ngram_range=(1, 2),
+                lowercase=True,
+                alternate_sign=False,
+                norm=None
+            )
+        return self._hasher
+
+    def transform(self, texts: List[str]):
+        """
+        Convert texts to L2-normalized TF-IDF vectors.
+        Args:
+            texts (List[str]): Documents to transform.
+        Returns:
+            scipy.sparse.csr_matrix: One row per text.
+        """
+        from sklearn.preprocessing import normalize
+        matrix = self.hasher.transform(texts)
+        matrix.data *= self.idf[matrix.indices]
+        return normalize(matrix, copy=False)
+
+    def similarity(self, text: str, other: str) -> float:
+        """
+        Cosine similarity of two texts.
+        Args:
+            text (str): First text.
+            other (str): Second text.
+        Returns:
+            float: Similarity between 0 and 1.
+        """
+        matrix = self.transform([text, other])
+        return float(matrix[0].multiply(matrix[1]).sum())
+
+    def partial_fit(self, texts: Iterable[str], batch_size: int = 1000) -> int:
+        """
+        Add documents to the document-frequency counts.
+        Requests transforming text meanwhile keep using the previous weights until the update completes.
+        Args:
+            texts (Iterable[str]): New documents.
+            batch_size (int): Documents hashed at a time.
+        Returns:
+            int: Number of documents added.
+        """
+        added = 0
+        with self._lock:
+            document_frequency = self.document_frequency.copy()
+            batch = []
+            for text in texts:
+                batch.append(text)
+                if len(batch) >= batch_size:
+                    added += self._count(batch, document_frequency)
+                    batch = []
+            if batch:
+                added += self._count(batch, document_frequency)
+            n_documents = self.n_documents + added
+            idf = self._compute_idf(document_frequency, n_documents)
+            self.document_frequency, self.n_documents, self.idf = document_frequency, n_documents, idf
+        return added
+
+    def _count(self, texts: List[str], document_frequency: np.ndarray) -> int:
+        matrix = self.hasher.transform(texts)
+        document_frequency += np.bincount(matrix.indices, minlength=self.n_features)
+        return len(texts)
+
+    def save(self, path: str) -> None:
+        """
+        Write the document-frequency counts atomically, so running services never read a partial file.
+        Args:
+            path (str): Destination .npz file.
+        """
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".npz.tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                np.savez_compressed(
+                    f,
+                    document_frequency=self.document_frequency,
+                    n_documents=np.int64(self.n_documents),
+                    n_features=np.int64(self.n_features),
+                    document_keys=self.document_keys
+                )
+            os.chmod(tmp_path, 0o644)
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+    @classmethod
+    def load(cls, path: str) -> "TfidfModel":
+        """
+        Read a model saved with save().
+        Args:
+            path (str): Path of the .npz file.
+        Returns:
+            TfidfModel: Loaded model.
+        """
+        with np.load(path) as data:
+            return cls(
+                n_features=int(data["n_features"]),
+                document_frequency=data["document_frequency"].astype(np.int64),
+                n_documents=int(data["n_documents"]),
+                source=path,
+                document_keys=data["document_keys"] if "document_keys" in data else None
+            )
+
+
+_model: Optional[TfidfModel] = None
+_model_mtime: Optional[float] = None
+_last_check = 0.0
+_lock = threading.Lock()
+
+
+def _load(path: str) -> None:
+    """Load the model file, keeping the current model if it cannot be read."""
+    global _model, _model_mtime
+    mtime = None
+    try:
+        mtime = os.stat(path).st_mtime
+        model = TfidfModel.load(path)
+    except FileNotFoundError:
+        logger.info(f"No TF-IDF model at {path} yet, using uniform term weights until documents are recorded")
+        if _model is None:
+            _model = TfidfModel(source=path)
+        return
+    except (OSError, ValueError, KeyError) as e:
+        logger.warning(f"Failed to load TF-IDF model from {path}, using uniform term weights: {str(e)}")
+        if _model is None:
+            _model = TfidfModel(source=path)
+        _model_mtime = mtime
+        return
+    _model, _model_mtime = model, mtime
+    logger.info(f"Loaded TF-IDF model fitted on {model.n_documents} documents")
+
+
+def get_tfidf_model(path: str = TFIDF_MODEL_PATH) -> TfidfModel:
+    """
+    Get the TF-IDF model, loading it on first use and reloading it when the file changed.
+    Returns:
+        TfidfModel: Current model (with uniform weights if the file could never be read).
+    """
+    global _last_check
+    now = time.monotonic()
+    if _model is not None and now - _last_check < TFIDF_CHECK_INTERVAL:
+        return _model
+    with _lock:
+        if _model is None:
+            _load(path)
+        elif now - _last_check >= TFIDF_CHECK_INTERVAL:
+            try:
+                changed = os.stat(path).st_mtime != _model_mtime
+            except OSError:
+                changed = False
+            if changed:
+                _load(path)
+        _last_check = now
+    return _model
+
+
+@contextmanager
+def model_file_lock(path: str) -> Iterator[None]:
+    """
+    Hold an exclusive lock on a model file for a read-modify-write, across processes.
+    Args:
+        path (str): Model file; the lock is taken on a .lock file next to it.
+    """
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(f"{path}.lock", "a") as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        yield
+
+
+def document_key(identity: str) -> int:
+    """
+    Key under which a document is counted once.
+    Args:
+        identity (str): Stable identity of the document, e.g. a resume's raw extracted text.
+    Returns:
+        int: First 64 bits of its SHA-256.
+    """
+    return int.from_bytes(hashlib.sha256(identity.encode("utf-8")).digest()[:8], "big")
+
+
+_recorded: Dict[int, str] = {}
+_last_update = time.monotonic()
+_recorded_lock = threading.Lock()
+
+
+def record_documents(documents: Iterable[Tuple[int, str]], path: str = TFIDF_MODEL_PATH) -> None:
+    """
+    Record new documents for the online document-frequency update, merging them into the model
+    file once TFIDF_UPDATE_INTERVAL has passed or TFIDF_UPDATE_BATCH documents are waiting.
+    Documents whose key was recorded or merged before are not counted again.
+    Blocks while a merge runs, so call it from a worker thread.
+    Args:
+        documents (Iterable[Tuple[int, str]]): Key (from document_key) and text of each document.
+        path (str): Model file.
+    """
+    if TFIDF_UPDATE_INTERVAL <= 0:
+        return
+    with _recorded_lock:
+        for key, text in documents:
+            if text and text.strip():
+                _recorded.setdefault(key, text)
+        due = _recorded and (len(_recorded) >= TFIDF_UPDATE_BATCH
+                             or time.monotonic() - _last_update >= TFIDF_UPDATE_INTERVAL)
+    if due:
+        update_model(path)
+
+
+def update_model(path: str = TFIDF_MODEL_PATH) -> int:
+    """
+    Merge the recorded documents into the model file and switch this process to the result.
+    The file is re-read under an exclusive lock, so merges from several processes add up.
+    Args:
+        path (str): Model file, created if it does not exist.
+    Returns:
+        int: Number of documents merged.
+    """
+    global _last_update
+    with _recorded_lock:
+        documents = dict(_recorded)
+        _recorded.clear()
+        _last_update = time.monotonic()
+    if not documents:
+        return 0
+    keys = np.fromiter(documents, dtype=np.uint64, count=len(documents))
+    try:
+        with model_file_lock(path):
+            try:
+                model = TfidfModel.load(path)
+            except FileNotFoundError:
+                model = TfidfModel()
+            new = ~np.isin(keys, model.document_keys)
+            if not new.any():
+                return 0
+            added = model.partial_fit(text for text, is_new in zip(documents.values(), new) if is_new)
+            model.document_keys = np.union1d(model.document_keys, keys[new])
+            model.save(path)
+    except (OSError, ValueError, KeyError) as e:
+        logger.error(f"Failed to update TF-IDF model {path}: {str(e)}")
+        return 0
+    with _lock:
+        _load(path)
+    logger.info(f"Added {added} documents to the TF-IDF model, which now covers {model.n_documents}")
+    return added
+
+
+def iter_corpus(paths: List[str]) -> Iterator[str]:
+    """
+    Read corpus documents.
+    Args:
+        paths (List[str]): Files and directories.
+    Returns:
+        Iterator[str]: Document texts.
+    """
+    for path in paths:
+        if os.path.isdir(path):
+            for directory, _, filenames in sorted(os.walk(path)):
+                yield from iter_corpus([
+                    os.path.join(directory, filename) for filename in sorted(filenames)
+                    if filename.endswith(_CORPUS_EXTENSIONS + (".jsonl",))
+                ])
+        elif path.endswith(".jsonl"):
+            with open(path, encoding="utf-8") as f:
+                for line in f:
+                    if line.strip():
+                        yield json.loads(line).get("text", "")
+        else:
+            with open(path, encoding="utf-8", errors="replace") as f:
+                yield f.read()
+
+
+def main() -> None:
+    """Fit the model on a corpus, or update an existing one, and save it."""
+    parser = argparse.ArgumentParser(description="Fit the TF-IDF document frequencies on a corpus.")
+    parser.add_argument("corpus", nargs="+", help="text or .jsonl files, or directories of them")
+    parser.add_argument("--output", default=TFIDF_MODEL_PATH, help="model file (default: TFIDF_MODEL_PATH)")
+    parser.add_argument("--update", action="store_true", help="add the documents to the existing model")
+    parser.add_argument("--features", type=int, default=TFIDF_FEATURES,
+                        help="hashed term columns of a new model (default: TFIDF_FEATURES)")
+    args = parser.parse_args()
+    started = time.perf_counter()
+    # Locked like the service's online updates, so neither overwrites the other's documents
+    with model_file_lock(args.output):
+        if args.update and os.path.exists(args.output):
+            model = TfidfModel.load(args.output)
+        else:
+            model = TfidfModel(n_features=args.features)
+        added = model.partial_fit(iter_corpus(args.corpus))
+        model.save(args.output)
+    logger.info(f"Added {added} documents in {time.perf_counter() - started:.1f} s; "
+                f"{args.output} now covers {model.n_documents} documents")
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+    main()
@@ -0,0 +1,277 @@
+"""
+Streaming upload handling
+Spools uploaded resumes chunk by chunk into memory or a temporary file with a size cap,
+validates file type from magic bytes and PDF page count, and hands the buffer to the parsers
+without further copies.
+"""
+
+import asyncio
+import hashlib
+import io
+import logging
+import os
+import tempfile
+import zipfile
+from typing import List, Optional, Union
+
+logger = logging.getLogger(__name__)
+
+# Maximum upload size in bytes.
+MAX_FILE_SIZE = int(os.getenv("MAX_FILE_SIZE", str(10 * 1024 * 1024)))
+# Uploads larger than this are spooled to a temporary file instead of memory.
+UPLOAD_SPOOL_BYTES = int(os.getenv("UPLOAD_SPOOL_BYTES", str(1024 * 1024)))
+# Directory for spooled uploads (e.g. /dev/shm); empty uses the system temp directory.
+UPLOAD_SPOOL_DIR = os.getenv("UPLOAD_SPOOL_DIR") or None
+# Maximum number of pages accepted in a PDF upload.
+MAX_PDF_PAGES = int(os.getenv("MAX_PDF_PAGES", "50"))
+# Maximum number of resumes and total request size accepted by /extract/batch.
+MAX_BATCH_FILES = int(os.getenv("MAX_BATCH_FILES", "500"))
+MAX_BATCH_UPLOAD_SIZE = int(os.getenv("MAX_BATCH_UPLOAD_SIZE", str(200 * 1024 * 1024)))
+
+UPLOAD_CHUNK_SIZE = 64 * 1024
+
+# Leading bytes accepted for each extension. Legacy .doc uploads are often DOCX files
+# renamed, so both the OLE2 and the ZIP signature are accepted for them.
+MAGIC_BYTES = {
+    'pdf': (b'%PDF-',),
+    'docx': (b'PK\x03\x04',),
+    'doc': (b'\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1', b'PK\x03\x04'),
+}
+# Readers tolerate a short preamble before the PDF header.
+PDF_HEADER_WINDOW = 1024
+
+# A document source is either the file content in memory or the path of a spooled file.
+DocumentSource = Union[bytes, str]
+
+
+class UploadRejected(ValueError):
+    """Raised when an upload fails the size, type or page-count checks."""
+    def __init__(self, status_code: int, detail: str):
+        super().__init__(detail)
+        self.status_code = status_code
+        self.detail = detail
+
+
+def open_pdf(source: DocumentSource):
+    """
+    Open a PDF with PyMuPDF from memory or from a spooled file.
+    Args:
+        source (DocumentSource): File content or file path.
+    Returns:
+        fitz.Document: Opened document.
+    """
+    import fitz  # PyMuPDF
+    if isinstance(source, str):
+        return fitz.open(source, filetype="pdf")
+    return fitz.open(stream=source, filetype="pdf")
+
+
+def check_magic_bytes(head: bytes, file_extension: str) -> None:
+    """
+    Check that the first bytes of an upload match its extension.
+    Args:
+        head (bytes): Leading bytes of the upload.
+        file_extension (str): Declared file extension.
+    """
+    if file_extension == 'pdf':
+        valid = b'%PDF-' in head[:PDF_HEADER_WINDOW]
+    else:
+        valid = head.startswith(MAGIC_BYTES.get(file_extension, ()))
+    if not valid:
+        raise UploadRejected(400, f"File content does not match the .{file_extension} extension")
+
+
+class SpooledUpload:
+    """
+    Uploaded file held in memory up to a threshold and in a temporary file beyond it.
+    The SHA-256 digest is computed while streaming, so it costs no extra pass over the data.
+    """
+    def __init__(self, filename: str, file_extension: str, spool_bytes: int = UPLOAD_SPOOL_BYTES,
+                 spool_dir: Optional[str] = UPLOAD_SPOOL_DIR):
+        self.filename = filename
+        self.file_extension = file_extension
+        self.size = 0
+        self.path: Optional[str] = None
+        # Set by check_page_count for PDFs whose page count could be read
+        self.page_count: Optional[int] = None
+        self._spool_bytes = spool_bytes
+        self._spool_dir = spool_dir
+        self._memory: Optional[io.BytesIO] = io.BytesIO()
+        self._file = None
+        self._hash = hashlib.sha256()
+
+    @property
+    def sha256(self) -> str:
+        """Hex digest of the upload content."""
+        return self._hash.hexdigest()
+
+    @property
+    def source(self) -> DocumentSource:
+        """
+        The upload as a parser input: the spooled file path, or the in-memory content.
+        BytesIO.getvalue() hands out its internal buffer without copying it.
+        """
+        if self.path is not None:
+            return self.path
+        return self._memory.getvalue()
+
+    def read_bytes(self) -> bytes:
+        """Full upload content, read back from the spooled file if it rolled over."""
+        if self.path is not None:
+            with open(self.path, "rb") as f:
+                return f.read()
+        return self._memory.getvalue()
+
+    def writes_to_disk(self, chunk_size: int) -> bool:
+        """
+        Check whether appending a chunk touches the spooled file (a rollover or a disk write).
+        Args:
+            chunk_size (int): Size of the next chunk in bytes.
+        Returns:
+            bool: True if the write should run off the event loop.
+        """
+        return self._file is not None or self.size + chunk_size > self._spool_bytes
+
+    def write(self, chunk: bytes) -> None:
+        """
+        Append a chunk, rolling over to a temporary file when the spool threshold is exceeded.
+        Args:
+            chunk (bytes): Next chunk of the upload.
+        """
+        self._hash.update(chunk)
+        self.size += len(chunk)
+        if self._file is None and self.size > self._spool_bytes:
+            self._file = tempfile.NamedTemporaryFile(
+                delete=False, dir=self._spool_dir, suffix=f".{self.file_extension}"
+            )
+            self.path = self._file.name
+            self._file.write(self._memory.getbuffer())
+            self._memory = None
+        if self._file is not None:
+            self._file.write(chunk)
+        else:
+            self._memory.write(chunk)
+
+    def finish(self) -> None:
+        """Flush the spooled file so parsers can open it by path."""
+        if self._file is not None:
+            self._file.close()
+
+    def close(self) -> None:
+        """Release the buffer and delete the spooled file, if any."""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        if self.path is not None and os.path.exists(self.path):
+            os.unlink(self.path)
+        self.path = None
+        self._memory = None
+
+
+def spool_to_file(content: bytes, file_extension: str, spool_dir: Optional[str] = UPLOAD_SPOOL_DIR) -> str:
+    """
+    Write in-memory file content to a temporary file, so several jobs can open it by path.
+    Args:
+        content (bytes): File content.
+        file_extension (str): File extension, used as the file suffix.
+        spool_dir (Optional[str]): Directory of the file; None uses the system temp directory.
+    Returns:
+        str: Path of the file; the caller must delete it.
+    """
+    with tempfile.NamedTemporaryFile(delete=False, dir=spool_dir, suffix=f".{file_extension}") as f:
+        f.write(content)
+    return f.name
+
+
+def check_page_count(upload: SpooledUpload, max_pages: int = MAX_PDF_PAGES) -> None:
+    """
+    Reject PDFs with more pages than allowed and record the page count on the upload; only the
+    cross-reference table is read.
+    Args:
+        upload (SpooledUpload): Completed upload.
+        max_pages (int): Maximum number of pages.
+    """
+    try:
+        with open_pdf(upload.source) as doc:
+            page_count = doc.page_count
+    except Exception as e:
+        # Damaged files are left to the extractor and its OCR fallback.
+        logger.warning(f"Could not read page count of {upload.filename}: {str(e)}")
+        return
+    upload.page_count = page_count
+    if page_count > max_pages:
+        raise UploadRejected(413, f"PDF has {page_count} pages; the maximum is {max_pages}")
+
+
+async def spool_upload(file, file_extension: str, max_bytes: int = MAX_FILE_SIZE,
+                       max_pages: int = MAX_PDF_PAGES) -> SpooledUpload:
+    """
+    Stream an upload into a SpooledUpload, enforcing the size cap and file-type checks.
+    Args:
+        file: Uploaded file with an async `read(size)` method (e.g. UploadFile).
+        file_extension (str): Declared file extension.
+        max_bytes (int): Maximum upload size in bytes.
+        max_pages (int): Maximum number of pages for PDF uploads.
+    Returns:
+        SpooledUpload: The spooled upload; the caller must close() it.
+    """
+    upload = SpooledUpload(getattr(file, 'filename', '') or '', file_extension)
+    try:
+        while True:
+            chunk = await file.read(UPLOAD_CHUNK_SIZE)
+            if not chunk:
+                break
+            if upload.size == 0:
+                # The first chunk is larger than any signature window, so type checks happen
+                # before anything else is buffered.
+                check_magic_bytes(chunk, file_extension)
+            if upload.size + len(chunk) > max_bytes:
+                raise UploadRejected(413, f"File exceeds the maximum size of {max_bytes} bytes")
+            # Memory writes stay on the event loop; the rollover and disk writes run in a thread
+            if upload.writes_to_disk(len(chunk)):
+                await asyncio.to_thread(upload.write, chunk)
+            else:
+                upload.write(chunk)
+        if upload.size == 0:
+            raise UploadRejected(400, "Uploaded file is empty")
+        if upload.path is not None:
+            await asyncio.to_thread(upload.finish)
+        if file_extension == 'pdf':
+            await asyncio.to_thread(check_page_count, upload, max_pages)
+        return upload
+    except Exception:
+        upload.close()
+        raise
+
+
+class ZipMemberReader:
+    """
+    Async reader over one member of a ZIP archive, so archive entries can be spooled with
+    spool_upload like uploaded files. Decompression runs in a thread; the uncompressed size is
+    only known while reading, so spool_upload's size cap also guards against zip bombs.
+    """
+    def __init__(self, archive: zipfile.ZipFile, info: zipfile.ZipInfo):
+        self.filename = info.filename
+        self._stream = archive.open(info)
+
+    async def read(self, size: int = -1) -> bytes:
+        return await asyncio.to_thread(self._stream.read, size)
+
+    async def close(self) -> None:
+        self._stream.close()
+
+
+def list_zip_resumes(archive: zipfile.ZipFile) -> List[zipfile.ZipInfo]:
+    """
+    List the files of an archive that may be resumes, skipping directories and macOS metadata.
+    Args:
+        archive (zipfile.ZipFile): Opened archive.
+    Returns:
+        List[zipfile.ZipInfo]: Entries to extract, in archive order.
+    """
+    return [
+        info for info in archive.infolist()
+        if not info.is_dir()
+        and not info.filename.startswith("__MACOSX/")
+        and not os.path.basename(info.filename).startswith(".")
+    ]
@@ -0,0 +1,191 @@
+"""
+Service readiness and warm-up.
+The service answers liveness checks as soon as it is imported; spaCy, scikit-learn and the
+Gemini clients are loaded in the background after startup, and readiness is reported only once
+they are. With WARMUP=true a sample resume is also run through every stage (text extraction,
+NER, OCR and ATS scoring) so the first real request does not pay for lazy initialization.
+"""
+
+import logging
+import os
+import time
+from typing import Dict, Optional
+
+from starlette.concurrency import run_in_threadpool
+
+logger = logging.getLogger(__name__)
+
+WARMUP = os.getenv("WARMUP", "false").lower() == "true"
+
+SAMPLE_RESUME_TEXT = """Jane Doe
+jane.doe@example.com | (555) 123-4567 | linkedin.com/in/janedoe
+
+Summary
+Backend engineer with six years of experience building Python services on AWS.
+
+Experience
+Senior Software Engineer - Acme Corp
+Jan 2020 - Present
+Led the migration of billing services to FastAPI and reduced latency by 30%.
+
+Education
+Bachelor of Science in Computer Science - State University
+2012 - 2016
+
+Skills
+Python, FastAPI, PostgreSQL, Docker, Kubernetes, AWS
+"""
+
+SAMPLE_JOB_DESCRIPTION = (
+    "We are looking for a backend engineer proficient in Python, FastAPI and PostgreSQL, "
+    "with experience with Docker, Kubernetes and AWS."
+)
+
+
+class Readiness:
+    """Tracks which startup stages have completed and how long each took."""
+    def __init__(self):
+        self.ready = False
+        self.error: Optional[str] = None
+        self.stages: Dict[str, float] = {}
+
+    def record(self, stage: str, started: float) -> None:
+        """
+        Record a completed stage.
+        Args:
+            stage (str): Stage name.
+            started (float): time.perf_counter() value when the stage started.
+        """
+        self.stages[stage] = round((time.perf_counter() - started) * 1000, 1)
+        logger.info(f"Startup stage '{stage}' completed in {self.stages[stage]:.0f} ms")
+
+    def status(self) -> Dict:
+        """
+        Readiness report.
+        Returns:
+            Dict: Ready flag, stage timings in milliseconds and the error, if any.
+        """
+        return {"ready": self.ready, "stagesMs": dict(self.stages), "error": self.error}
+
+
+def build_sample_pdf(text: str = SAMPLE_RESUME_TEXT) -> bytes:
+    """
+    Build a one-page PDF with a text layer.
+    Args:
+        text (str): Page text.
+    Returns:
+        bytes: PDF file content.
+    """
+    import fitz  # PyMuPDF
+    doc = fitz.open()
+    page = doc.new_page()
+    page.insert_text((72, 72), text, fontsize=10)
+    content = doc.tobytes()
+    doc.close()
+    return content
+
+
+def render_sample_image(pdf_content: bytes) -> bytes:
+    """
+    Render the first page of a PDF to a PNG image, as a stand-in for a scanned resume.
+    Args:
+        pdf_content (bytes): PDF file content.
+    Returns:
+        bytes: PNG image content.
+    """
+    import fitz  # PyMuPDF
+    with fitz.open(stream=pdf_content, filetype="pdf") as doc:
+        return doc.load_page(0).get_pixmap(dpi=150).tobytes("png")
+
+
+def _load_scoring(ats_scorer) -> None:
+    ats_scorer.tfidf_model.transform([SAMPLE_JOB_DESCRIPTION])
+
+
+def _load_posting_index() -> None:
+    from posting_index import get_posting_index
+    get_posting_index()
+
+
+def _load_llm_clients() -> None:
+    from llm import get_text_chain
+    from langchain_enhancer import get_resume_prompt
+    get_text_chain(0.7)
+    get_text_chain(0.3)
+    get_resume_prompt()
+
+
+def preload_models(ats_scorer) -> None:
+    """
+    Load spaCy, the extractor's regex tables, scikit-learn and the LLM clients in the current process.
+    Used by the prefork launcher before forking, so workers share the loaded pages copy-on-write.
+    Args:
+        ats_scorer (ATSScorer): Scorer used by the API handlers.
+    """
+    from extraction_pool import load_worker_models
+    started = time.perf_counter()
+    load_worker_models()
+    logger.info(f"Preloaded extraction models in {(time.perf_counter() - started) * 1000:.0f} ms")
+    for stage, load, args in (("scoring", _load_scoring, (ats_scorer,)), ("posting_index", _load_posting_index, ()),
+                              ("llm_clients", _load_llm_clients, ())):
+        try:
+            load(*args)
+        except Exception as e:
+            logger.warning(f"Preloading '{stage}' failed: {str(e)}")
+
+
+async def prepare_service(extraction_pool, ats_scorer, readiness: Readiness, warm_up: bool = WARMUP) -> None:
+    """
+    Load heavy dependencies in the background and optionally run a sample resume through every stage.
+    Failures are logged; only a failure to load the extraction models leaves the service unready.
+    Args:
+        extraction_pool (ExtractionPool): Started extraction pool.
+        ats_scorer (ATSScorer): Scorer used by the API handlers.
+        readiness (Readiness): Readiness tracker to update.
+        warm_up (bool): Also run the sample resume through extraction, OCR and scoring.
+    """
+    started = time.perf_counter()
+    try:
+        await extraction_pool.load_models()
+    except Exception as e:
+        readiness.error = f"Failed to load extraction models: {str(e)}"
+        logger.error(readiness.error)
+        return
+    readiness.record("extraction_models", started)
+
+    for stage, load, args in (("scoring", _load_scoring, (ats_scorer,)), ("posting_index", _load_posting_index, ()),
+                              ("llm_clients", _load_llm_clients, ())):
+        started = time.perf_counter()
+        try:
+            await run_in_threadpool(load, *args)
+            readiness.record(stage, started)
+        except Exception as e:
+            logger.warning(f"Startup stage '{stage}' failed: {str(e)}")
+
+    if warm_up:
+        await _warm_up(extraction_pool, ats_scorer, readiness)
+    readiness.ready = True
+
+
+async def _warm_up(extraction_pool, ats_scorer, readiness: Readiness) -> None:
+    sample_pdf = build_sample_pdf()
+    resume_data = None
+    try:
+        started = time.perf_counter()
+        resume_data = await extraction_pool.extract(sample_pdf, 'pdf', 'warmup.pdf')
+        readiness.record("warmup_extraction", started)
+    except Exception as e:
+        logger.warning(f"Warm-up extraction failed: {str(e)}")
+    try:
+        started = time.perf_counter()
+        await extraction_pool.ocr(render_sample_image(sample_pdf), 'png')
+        readiness.record("warmup_ocr", started)
+    except Exception as e:
+        logger.warning(f"Warm-up OCR failed: {str(e)}")
+    if resume_data is not None:
+        try:
+            started = time.perf_counter()
+            await ats_scorer.calculate_score(resume_data, SAMPLE_JOB_DESCRIPTION)
+            readiness.record("warmup_ats_score", started)
+        except Exception as e:
+            logger.warning(f"Warm-up ATS scoring failed: {str(e)}")